@@ -28,38 +28,43 @@ def generate_dot_graph(content):
     return dot_graph
 
 
+# nodes are added in depth-first order using explicit stack - deeply nested code does not exceed recursion limit
 def add_node(dot_graph, node, parent=None):
-    if isinstance(node, ast.ImportFrom):
-        return
+    stack = [(node, parent)]
+    while stack:
+        node, parent = stack.pop()
 
-    if isinstance(parent, ast.FunctionDef):
-        if isinstance(node, ast.Constant):
-            # skip doc string
-            return
-        if isinstance(node, ast.arguments):
-            # skip arguments definition of function
-            return
+        if isinstance(node, ast.ImportFrom):
+            continue
 
-    if isinstance(node, ast.Expr):
-        # reduce Expr
-        add_node(dot_graph, node.value, parent)
-        return
+        if isinstance(parent, ast.FunctionDef):
+            if isinstance(node, ast.Constant):
+                # skip doc string
+                continue
+            if isinstance(node, ast.arguments):
+                # skip arguments definition of function
+                continue
 
-    node_name = str(node.__class__.__name__)
-    if hasattr(node, "id"):
-        node_name = f"{node_name}: {node.id}"
-    if hasattr(node, "name"):
-        node_name = f"{node_name}: {node.name}"
-    if hasattr(node, "attr"):
-        node_name = f"{node_name}: {node.attr}"
-    if hasattr(node, "value"):
-        if isinstance(node.value, str):
-            node_name = f"{node_name}: {node.value}"
-    if hasattr(node, "arg"):
-        node_name = f"{node_name}: {node.arg}"
+        if isinstance(node, ast.Expr):
+            # reduce Expr
+            stack.append((node.value, parent))
+            continue
 
-    dot_graph.node(str(id(node)), node_name)
-    if parent:
-        dot_graph.edge(str(id(parent)), str(id(node)))
-    for child in ast.iter_child_nodes(node):
-        add_node(dot_graph, child, node)
+        node_name = str(node.__class__.__name__)
+        if hasattr(node, "id"):
+            node_name = f"{node_name}: {node.id}"
+        if hasattr(node, "name"):
+            node_name = f"{node_name}: {node.name}"
+        if hasattr(node, "attr"):
+            node_name = f"{node_name}: {node.attr}"
+        if hasattr(node, "value"):
+            if isinstance(node.value, str):
+                node_name = f"{node_name}: {node.value}"
+        if hasattr(node, "arg"):
+            node_name = f"{node_name}: {node.arg}"
+
+        dot_graph.node(str(id(node)), node_name)
+        if parent:
+            dot_graph.edge(str(id(parent)), str(id(node)))
+        children = list(ast.iter_child_nodes(node))
+        stack.extend((child, node) for child in reversed(children))
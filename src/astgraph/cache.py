@@ -0,0 +1,349 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import pickle
+import hashlib
+import logging
+from typing import Dict, List, Set, Optional
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:
+    importlib_metadata = None
+
+import astroid
+
+from astgraph.treeparser import TreeParser, ItemContainer
+from astgraph.modpath import add_search_paths, get_import_name
+from astgraph.inference import INFERENCE_CACHE, INFERENCE_BUDGET, PROJECT_BOUNDARY
+from astgraph.summary import ItemKeys, DefSummary, ModuleSummary, SummaryRecorder, SummaryApplier
+from astgraph.summary import record_defs, apply_defs
+from astgraph.importgraph import get_imports
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# increase every time content of cache entries changes
+CACHE_FORMAT = 2
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024  # in bytes
+
+
+def get_astgraph_version():
+    if importlib_metadata is None:
+        return "unknown"
+    try:
+        return importlib_metadata.version("astgraph")
+    except importlib_metadata.PackageNotFoundError:
+        return "unknown"
+
+
+# returns options of analysis changing its results (inference budget and project boundary)
+def get_options_key() -> str:
+    timeout, max_inferred = INFERENCE_BUDGET.get_config()
+    return f"{timeout}:{max_inferred}:{PROJECT_BOUNDARY.is_enabled()}"
+
+
+# ============================================
+
+
+# analysis results of single file
+class CacheEntry:
+    def __init__(self, module_name: str, imports: List[str]):
+        self.module_name = module_name
+        self.imports = imports
+        self.deps: Dict[str, str] = {}  # analyzed modules reachable by imports and keys of their entries
+        self.defs: DefSummary = None
+        self.uses: ModuleSummary = None
+        self.returns: Dict = {}  # key of function defined in module -> key of returned type (see 'ReturnTable')
+
+
+# on-disk cache of analysis results
+#
+# Entries are keyed by content of file, versions of astgraph and astroid and options of analysis
+# changing its results (see 'get_options_key()'). Size of cache directory is limited - least recently
+# used entries are removed.
+class AnalysisCache:
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_MAX_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.version = f"{CACHE_FORMAT}:{get_astgraph_version()}:{astroid.__version__}"
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_key(self, file_path: str, content: bytes, options: str = "") -> str:
+        hasher = hashlib.sha256()
+        hasher.update(self.version.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(options.encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(os.path.abspath(file_path).encode("utf-8"))
+        hasher.update(b"\0")
+        hasher.update(content)
+        return hasher.hexdigest()
+
+    def load(self, key: str) -> Optional[CacheEntry]:
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                entry = pickle.load(entry_file)
+            # mark entry as recently used
+            os.utime(entry_path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception:  # pylint: disable=W0703
+            _LOGGER.warning("unable to load cache entry %s", entry_path)
+            self._remove(entry_path)
+            return None
+
+    def store(self, key: str, entry: CacheEntry):
+        entry_path = self._get_entry_path(key)
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as entry_file:
+            pickle.dump(entry, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, entry_path)
+
+    # remove least recently used entries exceeding size limit
+    def evict(self):
+        entries_list = []
+        total_size = 0
+        with os.scandir(self.cache_dir) as dir_iter:
+            for dir_entry in dir_iter:
+                if not dir_entry.name.endswith(".pickle"):
+                    continue
+                entry_stat = dir_entry.stat()
+                entries_list.append((entry_stat.st_mtime, entry_stat.st_size, dir_entry.path))
+                total_size += entry_stat.st_size
+        if total_size <= self.max_size:
+            return
+        entries_list.sort()
+        for _, entry_size, entry_path in entries_list:
+            if total_size <= self.max_size:
+                break
+            self._remove(entry_path)
+            total_size -= entry_size
+            self.evictions += 1
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pickle")
+
+    def _remove(self, entry_path):
+        try:
+            os.remove(entry_path)
+        except OSError:
+            pass
+
+
+# ============================================
+
+
+class CachedFile:
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.module_name: str = None
+        self.key: str = None
+        self.entry: CacheEntry = None  # entry loaded from cache or created by analysis
+        self.valid = False  # is loaded entry up to date
+        self.modified = False  # entry needs to be stored
+        self.deps: Dict[str, str] = {}
+        self.astroid_tree = None
+
+
+# analyze files reusing results stored in cache
+#
+# Entry of file is up to date if the file and all analyzed modules reachable by it's imports did not change.
+# Astroid is used only for outdated files and modules they import. Definitions of other modules are
+# restored from cache. Uses summaries of up to date files are applied after verification
+# (see 'astgraph.summary'), so the result is the same as analyzing all files.
+def analyze_cached(parser: TreeParser, files_list, cache: AnalysisCache):
+    files_list = list(files_list)
+    add_search_paths(files_list)
+
+    options = get_options_key()
+    cached_files: List[CachedFile] = []
+    reload_modules = False
+    for file_path in files_list:
+        cached_file = CachedFile(file_path)
+        with open(file_path, "rb") as src_file:
+            content = src_file.read()
+        cached_file.module_name = get_import_name(file_path)
+        cached_file.key = cache.get_key(file_path, content, options)
+        cached_file.entry = cache.load(cached_file.key)
+        if cached_file.entry is None:
+            imports = get_imports(content, cached_file.module_name, file_path)
+            cached_file.entry = CacheEntry(cached_file.module_name, imports)
+            cached_file.modified = True
+            if cached_file.module_name in astroid.MANAGER.astroid_cache:
+                # file could change since loaded - other modules can refer to outdated nodes
+                reload_modules = True
+        cached_files.append(cached_file)
+
+    if reload_modules:
+        _LOGGER.info("clearing astroid cache")
+        astroid.MANAGER.clear_cache()
+        INFERENCE_CACHE.clear()
+
+    modules_dict = {cached_file.module_name: cached_file for cached_file in cached_files}
+    for cached_file in cached_files:
+        cached_file.deps = get_dependencies(cached_file, modules_dict)
+        cached_file.valid = not cached_file.modified and cached_file.entry.deps == cached_file.deps
+        if cached_file.valid:
+            cache.hits += 1
+        else:
+            cache.misses += 1
+
+    # modules needed to analyze outdated files
+    astroid_modules: Set[str] = set()
+    for cached_file in cached_files:
+        if cached_file.valid:
+            continue
+        astroid_modules.add(cached_file.module_name)
+        astroid_modules.update(cached_file.deps.keys())
+
+    if not _analyze_files(parser, cached_files, astroid_modules):
+        _LOGGER.info("cache entries do not match, analyzing all files")
+        deadline = parser.items.deadline
+        parser.items = ItemContainer()
+        parser.items.deadline = deadline
+        astroid_modules = set(modules_dict.keys())
+        _analyze_files(parser, cached_files, astroid_modules)
+
+    for cached_file in cached_files:
+        if not cached_file.modified:
+            continue
+        cached_file.entry.deps = cached_file.deps
+        cache.store(cached_file.key, cached_file.entry)
+    cache.evict()
+
+    _LOGGER.info("cache stats: %s", cache.get_stats())
+
+
+# returns analyzed modules reachable by imports of given file
+def get_dependencies(cached_file: CachedFile, modules_dict: Dict[str, CachedFile]) -> Dict[str, str]:
+    deps = {}
+    visit_list = [cached_file]
+    while visit_list:
+        curr_file = visit_list.pop()
+        for import_name in curr_file.entry.imports:
+            name_parts = import_name.split(".")
+            for index in range(1, len(name_parts) + 1):
+                # importing submodule imports parent packages
+                dep_name = ".".join(name_parts[:index])
+                dep_file = modules_dict.get(dep_name)
+                if dep_file is None or dep_file is cached_file or dep_name in deps:
+                    continue
+                deps[dep_name] = dep_file.key
+                visit_list.append(dep_file)
+    return deps
+
+
+# returns False if definitions restored from cache do not match current state
+def _analyze_files(parser: TreeParser, cached_files: List[CachedFile], astroid_modules: Set[str]) -> bool:
+    items = parser.items
+    keys = ItemKeys(items)
+
+    for cached_file in cached_files:
+        cached_file.astroid_tree = None
+        if cached_file.module_name in astroid_modules:
+            cached_file.astroid_tree = parser.load_files([cached_file.file_path])[0]
+
+    for cached_file in cached_files:
+        if cached_file.astroid_tree is None:
+            if not apply_defs(keys, cached_file.entry.defs):
+                return False
+            continue
+        items_num = len(items.def_items)
+        parser.analyze_defs([cached_file.astroid_tree])
+        new_items = items.def_items[items_num:]
+        cached_file.entry.defs = record_defs(keys, cached_file.module_name, new_items)
+
+    for cached_file in cached_files:
+        if not cached_file.valid:
+            # returned types could change
+            cached_file.entry.returns = {}
+        elif cached_file.astroid_tree is not None:
+            _seed_returns(items, keys, cached_file.entry.returns)
+
+    recorder = SummaryRecorder(items, keys)
+    applier = SummaryApplier(items, keys)
+    for cached_file in cached_files:
+        if cached_file.valid:
+            if applier.apply(cached_file.entry.uses):
+                continue
+            if cached_file.astroid_tree is None:
+                return False
+            _LOGGER.info("cache entry of %s does not match, analyzing again", cached_file.file_path)
+        if items.is_deadline_exceeded():
+            # uses of file are not analyzed - entry can not be stored
+            cached_file.modified = False
+            continue
+        recorder.begin(cached_file.module_name)
+        items.recorder = recorder
+        exceeded = INFERENCE_BUDGET.exceeded
+        try:
+            parser.analyze_uses([cached_file.astroid_tree])
+        finally:
+            items.recorder = None
+        cached_file.entry.uses = recorder.end()
+        # do not store uses of file if analysis was interrupted by deadline
+        # or nodes were left unresolved by inference budget (timeout depends on load of machine)
+        cached_file.modified = not items.is_deadline_exceeded() and INFERENCE_BUDGET.exceeded == exceeded
+
+    _record_returns(items, keys, cached_files)
+    return True
+
+
+# restore types returned by functions of loaded module
+def _seed_returns(items: ItemContainer, keys: ItemKeys, returns_dict: Dict):
+    for func_key, type_key in returns_dict.items():
+        func_def = keys.find_item(func_key)
+        if func_def is None:
+            continue
+        type_node = None
+        if type_key is not None:
+            type_def = keys.find_item(type_key)
+            if type_def is None:
+                continue
+            type_node = items.astroid_node_dict.get(type_def.node_id)
+            if type_node is None:
+                continue
+        items.returns.seed(func_def, type_node)
+
+
+# store types returned by functions in entries of modules defining the functions
+# types outside of analyzed code are not stored
+def _record_returns(items: ItemContainer, keys: ItemKeys, cached_files: List[CachedFile]):
+    modules_dict = {cached_file.module_name: cached_file for cached_file in cached_files}
+    returns = items.returns
+    for func_def in returns.computed:
+        func_key = keys.get_key(func_def)
+        if func_key[0] != "node":
+            continue
+        cached_file = modules_dict.get(func_key[1])
+        if cached_file is None or not (cached_file.valid or cached_file.modified):
+            # entry of module is not stored
+            continue
+        type_node = returns.types_dict[func_def]
+        type_key = None
+        if type_node is not None:
+            type_key = keys.get_key(items.find_def_item(type_node))
+            if type_key is None or type_key[0] != "node":
+                continue
+        returns_dict = cached_file.entry.returns
+        if func_key in returns_dict and returns_dict[func_key] == type_key:
+            continue
+        returns_dict[func_key] = type_key
+        cached_file.modified = True
@@ -0,0 +1,108 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+from typing import Dict, Optional, Tuple, Any, Callable
+
+import astroid.nodes.scoped_nodes.scoped_nodes as astroid_nodes
+from astroid.nodes import node_classes, NodeNG
+
+from astgraph.inference import infer_type
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# marker of missing entry of cache (None is valid value)
+_MISSING = object()
+
+
+# returns True if name is bound only once in scope resolving the name (the same way as astroid lookup does),
+# so inferred value of name does not depend on position of name in scope
+def is_single_binding(name_node: NodeNG) -> bool:
+    name = name_node.name
+    start_scope = name_node.scope()
+    scope_node = start_scope
+    while scope_node:
+        # names of class scope are not visible in nested scopes
+        if scope_node is start_scope or not isinstance(scope_node, astroid_nodes.ClassDef):
+            bindings_list = scope_node.locals.get(name)
+            if bindings_list:
+                return len(bindings_list) == 1
+        parent_node = scope_node.parent
+        if parent_node is None:
+            # builtins or undefined name
+            return True
+        scope_node = parent_node.scope()
+    return True
+
+
+# returns key of chain of attributes (e.g. 'obj.attr.method()') identifying the chain in its scope
+# 'sub_key' - key of sub-chain (expression of attribute or called function)
+# returns None if inferred value of chain can depend on position of node (e.g. reassigned names,
+# calls with arguments, subscripts and targets of assignments)
+def get_chain_key(chain_node: NodeNG, sub_key: Optional[str]) -> Optional[str]:
+    if isinstance(chain_node, node_classes.Name):
+        if not is_single_binding(chain_node):
+            return None
+        return chain_node.name
+    if sub_key is None:
+        return None
+    if isinstance(chain_node, node_classes.Attribute):
+        return f"{sub_key}.{chain_node.attrname}"
+    if isinstance(chain_node, node_classes.Call):
+        if chain_node.args or chain_node.keywords:
+            return None
+        return f"{sub_key}()"
+    return None
+
+
+# cache of inferred types of chains of attributes used by 'UseParser'
+#
+# Types are stored per enclosing scope and key of chain prefix (see 'get_chain_key()'), so sibling
+# accesses (e.g. 'self.obj.attr' and 'self.obj.other()') infer common prefix once. Types of members
+# accessed on items without type hint are stored per (type item, member name). Cache contains astroid
+# nodes, so it has to be cleared when trees are replaced or released.
+class ChainCache:
+    def __init__(self):
+        self.prefix_dict: Dict[Tuple[NodeNG, str], Optional[NodeNG]] = {}
+        self.member_dict: Dict[Tuple[Any, str], Optional[NodeNG]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.prefix_dict.clear()
+        self.member_dict.clear()
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.prefix_dict) + len(self.member_dict)}
+
+    # returns inferred type of node of chain, 'chain_key' is None if type can not be reused
+    # 'infer_func' - function inferring type of node (e.g. using types returned by functions)
+    def infer_prefix(
+        self, scope_node: NodeNG, chain_key: Optional[str], chain_node: NodeNG, infer_func: Callable = infer_type
+    ) -> Optional[NodeNG]:
+        if chain_key is None:
+            return infer_func(chain_node)
+        return self._get(self.prefix_dict, (scope_node, chain_key), chain_node, infer_func)
+
+    # returns inferred type of member accessed by attribute node on object of type 'type_def'
+    def infer_member(self, type_def: Any, attr_node: NodeNG) -> Optional[NodeNG]:
+        if type_def is None or not isinstance(attr_node, node_classes.Attribute):
+            return infer_type(attr_node)
+        return self._get(self.member_dict, (type_def, attr_node.attrname), attr_node, infer_type)
+
+    def _get(self, cache_dict, key, astroid_node: NodeNG, infer_func: Callable) -> Optional[NodeNG]:
+        inferred = cache_dict.get(key, _MISSING)
+        if inferred is not _MISSING:
+            self.hits += 1
+            return inferred
+        self.misses += 1
+        inferred = infer_func(astroid_node)
+        cache_dict[key] = inferred
+        return inferred
@@ -0,0 +1,167 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import sys
+from enum import Enum
+from typing import List, Optional
+
+
+class DefItemType(Enum):
+    MODULE = "module"
+    CLASS = "class"
+    DEF_METHOD = "method"  # defined method
+    MEMBER = "member"  # free function, method or attribute
+
+
+# shared by items without children, list is created on first append
+_NO_ITEMS = ()
+
+
+# items are created for every definition and member of analyzed code, so they are slotted
+# and their names are interned to reduce memory footprint
+class DefItem:
+    __slots__ = ("node_id", "type", "parent", "name", "_items", "type_hint")
+
+    def __init__(self, name: str, item_type: DefItemType, astroid_node):
+        self.node_id = id(astroid_node)
+        self.type: DefItemType = item_type
+        self.parent = None
+        self.name = sys.intern(name)
+        self._items: List[DefItem] = _NO_ITEMS  # type: ignore
+        self.type_hint: Optional[DefItem] = None  # member type hint
+
+    @property
+    def info(self):
+        return (self.get_full_name(), self.type)
+
+    def is_module(self) -> bool:
+        return self.type == DefItemType.MODULE
+
+    def is_class(self) -> bool:
+        return self.type == DefItemType.CLASS
+
+    def is_method(self) -> bool:
+        return self.type == DefItemType.DEF_METHOD
+
+    def is_field(self) -> bool:
+        return self.type == DefItemType.MEMBER
+
+    def get_items(self) -> List["DefItem"]:
+        return self._items
+
+    def append(self, item):
+        if self._items is _NO_ITEMS:
+            self._items = []
+        self._items.append(item)
+        item.parent = self
+
+    def remove(self, item):
+        self._items.remove(item)
+        item.parent = None
+
+    def get_namespace(self):
+        if not self.parent:
+            return ""
+        return self.parent.get_full_name()
+
+    def get_name(self):
+        return self.name
+
+    def get_full_name(self):
+        full_name = self.get_name()
+        parent = self.parent
+        while parent:
+            par_name = parent.get_name()
+            full_name = f"{par_name}.{full_name}"
+            parent = parent.parent
+        return full_name
+
+    def get_filename(self):
+        if not self.parent:
+            return ""
+        return self.parent.get_filename()
+
+    def get_child(self, name) -> "DefItem":
+        return self.get_child_direct(name)
+
+    def get_child_direct(self, name) -> "DefItem":
+        for item in self._items:
+            if item.name == name:
+                return item
+        return None
+
+    def find_items(self, name) -> List["DefItem"]:
+        direct_child = self.get_child_direct(name)
+        if direct_child is not None:
+            return [direct_child]
+        return []
+
+    def to_string(self):
+        return f"({self.name}, {self.type})"
+
+    def __repr__(self):
+        full_name = self.get_full_name()
+        hex_id = f"0x{id(self):0x}"
+        return f"<{full_name}, {self.type} {hex_id}>"
+
+
+class ClassItem(DefItem):
+    __slots__ = ("bases", "explicit_ctor")
+
+    def __init__(self, name: str, astroid_node):
+        super().__init__(name, DefItemType.CLASS, astroid_node)
+        self.bases: List["ClassItem"] = []
+        self.explicit_ctor = False
+
+    def append_base(self, base: "ClassItem"):
+        self.bases.append(base)
+
+    def get_child(self, name) -> "DefItem":
+        direct_child = self.get_child_direct(name)
+        if direct_child is not None:
+            return direct_child
+        for base in self.bases:
+            base_child = base.get_child(name)
+            if base_child is not None:
+                return base_child
+        return None
+
+    def find_items(self, name) -> List["DefItem"]:
+        direct_child = self.get_child_direct(name)
+        if direct_child is not None:
+            return [direct_child]
+
+        ret_list = []
+        for base in self.bases:
+            base_children = base.find_items(name)
+            if base_children is not None:
+                ret_list.extend(base_children)
+        return ret_list
+
+    def find_in_bases(self, name) -> List["DefItem"]:
+        ret_list = []
+        for base in self.bases:
+            base_children = base.find_items(name)
+            if base_children is not None:
+                ret_list.extend(base_children)
+        return ret_list
+
+
+class ModuleItem(DefItem):
+    __slots__ = ("namespace", "filename")
+
+    def __init__(self, name: str, astroid_node, namespace=""):
+        super().__init__(name, DefItemType.MODULE, astroid_node)
+        self.namespace = namespace
+        self.filename = None
+
+    def get_namespace(self):
+        return self.namespace
+
+    def get_filename(self):
+        return self.filename
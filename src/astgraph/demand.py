@@ -0,0 +1,141 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+from typing import Dict, List
+
+import astroid.nodes.scoped_nodes.scoped_nodes as astroid_nodes
+from astroid.nodes import node_classes, NodeNG
+
+from astgraph.graphtheory import Filter
+from astgraph.treeparser import TreeParser, UseParser, DeclarationParser, DefItem
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# check if node is condition: __name__ == "__main__"
+def is_main_check(astroid_node: NodeNG) -> bool:
+    if not isinstance(astroid_node, node_classes.Compare):
+        return False
+    if len(astroid_node.ops) != 1:
+        return False
+    operator, right_node = astroid_node.ops[0]
+    if operator != "==":
+        return False
+    for name_node, value_node in [(astroid_node.left, right_node), (right_node, astroid_node.left)]:
+        if not isinstance(name_node, node_classes.Name) or name_node.name != "__name__":
+            continue
+        if isinstance(value_node, node_classes.Const) and value_node.value == "__main__":
+            return True
+    return False
+
+
+# returns True if module can be executed as program
+def is_entry_module(module_node: astroid_nodes.Module) -> bool:
+    if module_node.name.split(".")[-1] == "__main__":
+        return True
+    for child in module_node.body:
+        if isinstance(child, node_classes.If) and is_main_check(child.test):
+            return True
+    return False
+
+
+# ============================================
+
+
+# use parser analyzing body of single definition
+#
+# Bodies of nested classes and functions are skipped - they are analyzed separately when reached.
+class ScopeUseParser(UseParser):
+    VISIT_HANDLERS = [(astroid_nodes.ClassDef, "visit_classdef")] + UseParser.VISIT_HANDLERS
+
+    def analyze_scope(self, scope_node: NodeNG):
+        self._visit_children(scope_node)
+
+    def visit_classdef(self, astroid_node):
+        if self.items.find_def_item(astroid_node) is not None:
+            return
+        self._visit_children(astroid_node)
+
+    def visit_functiondef(self, astroid_node):
+        if self.items.find_def_item(astroid_node) is not None:
+            return
+        super().visit_functiondef(astroid_node)
+
+    def visit_assignattr(self, astroid_node):
+        if self.items.find_def_item(astroid_node) is not None:
+            # member already declared by declarations analysis (with use by declaring scope)
+            return
+        super().visit_assignattr(astroid_node)
+
+
+# analyze uses of items reachable from items matching filter
+#
+# Definitions and members declarations of all files are analyzed first. Then bodies of definitions
+# are analyzed in order of reaching them by uses, starting from items matching 'filter_obj'
+# ('is_matching()' receives DefItem). If filter is not given then analysis starts from
+# entry modules (executable modules containing condition 'if __name__ == "__main__"').
+#
+# Declarations are collected from all files before uses, so members declared by files placed
+# after the user are also found (sequential analysis does not see them).
+def analyze_demand(parser: TreeParser, files_list, filter_obj: Filter = None):
+    astroid_tree_list = parser.load_files(files_list)
+    parser.analyze_defs(astroid_tree_list)
+
+    items = parser.items
+    for astroid_tree in astroid_tree_list:
+        decl_parser = DeclarationParser(items)
+        decl_parser.analyze(astroid_tree)
+
+    seeds_list: List[DefItem] = []
+    if filter_obj is not None:
+        seeds_list = [def_item for def_item in items.def_items if filter_obj.is_matching(def_item)]
+    else:
+        for astroid_tree in astroid_tree_list:
+            if is_entry_module(astroid_tree):
+                seeds_list.append(items.find_def_item(astroid_tree))
+        _LOGGER.info("found entry modules: %s", [def_item.get_full_name() for def_item in seeds_list])
+
+    if not seeds_list:
+        _LOGGER.warning("no starting items found, analyzing all files")
+        parser.analyze_uses(astroid_tree_list)
+        return
+
+    use_parser = ScopeUseParser(items)
+    visited: Dict[DefItem, None] = dict.fromkeys(seeds_list)  # keeps order of reaching
+    visit_list: List[DefItem] = list(reversed(seeds_list))
+    analyzed_num = 0
+    while visit_list:
+        while visit_list:
+            if items.is_deadline_exceeded():
+                _LOGGER.warning("deadline exceeded, skipping usage analysis of %s items", len(visit_list))
+                visit_list.clear()
+                break
+            def_item = visit_list.pop()
+            scope_node = items.astroid_node_dict.get(def_item.node_id)
+            if isinstance(scope_node, (astroid_nodes.Module, astroid_nodes.ClassDef, astroid_nodes.FunctionDef)):
+                _LOGGER.debug("analyzing usage of %s", def_item.get_full_name())
+                use_parser.analyze_scope(scope_node)
+                analyzed_num += 1
+            _append_uses(items.use_dict.get(def_item, []), visited, visit_list)
+
+        # uses added to already analyzed items (e.g. by implicit constructors) and calls of overrides
+        parser._mark_override_use()  # pylint: disable=W0212
+        for user_item in list(visited):
+            _append_uses(items.use_dict.get(user_item, []), visited, visit_list)
+
+    _LOGGER.info("analyzed usage of %s items, all definitions: %s", analyzed_num, len(items.def_items))
+
+
+def _append_uses(uses_list: List[DefItem], visited: Dict[DefItem, None], visit_list: List[DefItem]):
+    for use_item in reversed(uses_list):
+        if use_item in visited:
+            continue
+        visited[use_item] = None
+        visit_list.append(use_item)
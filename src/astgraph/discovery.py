@@ -0,0 +1,192 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import re
+import fnmatch
+import logging
+from typing import Iterator, List, Tuple
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# directories not containing analyzed code (virtual environments, build outputs and tools data)
+DEFAULT_EXCLUDES = [".*", "__pycache__", "venv", "build", "dist", "*.egg-info", "node_modules"]
+
+
+# ============================================
+
+
+# rules of single '.gitignore' file
+#
+# Supports comments, negation ('!'), directory only patterns (trailing '/'), patterns anchored to
+# directory of file (containing '/') and '**' wildcards.
+class GitIgnore:
+    def __init__(self, base_dir: str = ""):
+        self.base_dir = base_dir  # directory of file relative to searched directory ("" for top)
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []  # (pattern, negate, directory only)
+
+    def load(self, file_path: str):
+        try:
+            with open(file_path, encoding="utf-8", errors="replace") as ignore_file:
+                for line in ignore_file:
+                    self.add_rule(line)
+        except OSError:
+            _LOGGER.warning("unable to read %s", file_path)
+
+    def add_rule(self, line: str):
+        line = line.rstrip("\n")
+        if not line.strip() or line.startswith("#"):
+            return
+        if not line.endswith("\\ "):
+            line = line.rstrip()
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return
+        anchored = "/" in line
+        line = line.lstrip("/")
+        regex = _translate(line)
+        if not anchored:
+            regex = f"(?:.*/)?{regex}"
+        self.rules.append((re.compile(f"{regex}$"), negate, dir_only))
+
+    # returns True if ignored, False if explicitly not ignored (negated rule), None if no rule matches
+    # 'rel_path' - path relative to searched directory with '/' separators
+    def match(self, rel_path: str, is_dir: bool):
+        if self.base_dir:
+            if not rel_path.startswith(self.base_dir + "/"):
+                return None
+            start = len(self.base_dir) + 1
+            rel_path = rel_path[start:]
+        for pattern, negate, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if pattern.match(rel_path):
+                return not negate
+        return None
+
+
+# translate gitignore pattern to regular expression
+def _translate(pattern: str) -> str:
+    ret_list = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith("**/", index):
+            ret_list.append("(?:.*/)?")
+            index += 3
+            continue
+        if pattern.startswith("/**", index) and index + 3 == len(pattern):
+            ret_list.append("/.*")
+            index += 3
+            continue
+        if pattern.startswith("**", index):
+            ret_list.append(".*")
+            index += 2
+            continue
+        if char == "*":
+            ret_list.append("[^/]*")
+        elif char == "?":
+            ret_list.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", index + 1)
+            if end < 0:
+                ret_list.append(re.escape(char))
+            else:
+                start = index + 1
+                group = pattern[start:end]
+                if group.startswith("!"):
+                    group = "^" + group[1:]
+                ret_list.append(f"[{group}]")
+                index = end
+        else:
+            ret_list.append(re.escape(char))
+        index += 1
+    return "".join(ret_list)
+
+
+# ============================================
+
+
+def is_matching(rel_path: str, name: str, patterns_list) -> bool:
+    for pattern in patterns_list:
+        if fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(rel_path, pattern):
+            return True
+    return False
+
+
+# yields files found in given directory (recursively)
+#
+# Files of directory are yielded before files of its subdirectories. Patterns are matched against
+# name of file (or directory) and against path relative to 'search_dir'.
+# 'include'   - patterns of files to yield
+# 'exclude'   - patterns of files and directories to skip (default 'DEFAULT_EXCLUDES')
+# 'gitignore' - skip files and directories ignored by '.gitignore' files found in searched directories
+def iter_files(search_dir, include=None, exclude=None, gitignore=True) -> Iterator[str]:
+    if not search_dir:
+        return
+    if include is None:
+        include = ["*.py"]
+    if exclude is None:
+        exclude = DEFAULT_EXCLUDES
+    visited = set()
+    # stack of (directory path, relative path, rules of '.gitignore' files)
+    dirs_stack = [(search_dir, "", [])]
+    while dirs_stack:
+        dir_path, rel_dir, ignore_list = dirs_stack.pop()
+        real_path = os.path.realpath(dir_path)
+        if real_path in visited:
+            # symbolic link loop
+            continue
+        visited.add(real_path)
+        try:
+            with os.scandir(dir_path) as dir_iter:
+                entries_list = list(dir_iter)
+        except OSError:
+            _LOGGER.warning("unable to read directory %s", dir_path)
+            continue
+
+        if gitignore and any(entry.name == ".gitignore" for entry in entries_list):
+            ignore_list = list(ignore_list)
+            rules = GitIgnore(rel_dir)
+            rules.load(os.path.join(dir_path, ".gitignore"))
+            ignore_list.append(rules)
+
+        subdirs_list = []
+        for entry in entries_list:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_matching(rel_path, entry.name, exclude):
+                continue
+            if _is_ignored(ignore_list, rel_path, is_dir):
+                continue
+            if is_dir:
+                subdirs_list.append((entry.path, rel_path, ignore_list))
+            elif is_matching(rel_path, entry.name, include):
+                yield entry.path
+        # keep order of directory entries
+        dirs_stack.extend(reversed(subdirs_list))
+
+
+def _is_ignored(ignore_list: List[GitIgnore], rel_path: str, is_dir: bool) -> bool:
+    # rules of nested directories take precedence
+    for rules in reversed(ignore_list):
+        matched = rules.match(rel_path, is_dir)
+        if matched is not None:
+            return matched
+    return False
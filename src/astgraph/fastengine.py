@@ -0,0 +1,805 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import ast
+import logging
+from typing import Dict, List, Set, Optional, Tuple
+
+import astroid
+import astroid.nodes.scoped_nodes.scoped_nodes as astroid_nodes
+from astroid.nodes import node_classes, NodeNG
+
+from astgraph.modpath import add_search_paths, get_import_name
+from astgraph.importgraph import get_package_name, get_from_name
+from astgraph.inference import infer_type
+from astgraph.treeparser import TreeParser, ItemContainer, DefItem, ClassItem, DefItemType
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# markers of type of expression (besides DefItem and tuples "expr", "annot", "package" and "super")
+FROM_DEF = "from_def"  # type is given by definition item of expression
+UNKNOWN = "unknown"  # type not deducible from items tree - astroid inference is required
+NO_TYPE = "no_type"  # type is not defined in analyzed code (e.g. builtins or not analyzed modules)
+
+# expressions of builtin types
+LITERAL_TYPES = (ast.Constant, ast.JoinedStr)
+# containers which items can be objects of analyzed classes
+DISPLAY_TYPES = (ast.List, ast.Tuple, ast.Set, ast.Dict)
+
+# astroid nodes which can be found by position of 'ast' node
+ASTROID_INDEXED_TYPES = (
+    node_classes.Name,
+    node_classes.AssignName,
+    node_classes.Attribute,
+    node_classes.AssignAttr,
+    node_classes.Call,
+    node_classes.Subscript,
+)
+
+
+def get_position(node):
+    return (node.lineno, node.col_offset, node.end_lineno, node.end_col_offset)
+
+
+def is_staticmethod(func_node) -> bool:
+    for decorator in func_node.decorator_list:
+        if isinstance(decorator, ast.Name) and decorator.id == "staticmethod":
+            return True
+    return False
+
+
+# ============================================
+
+
+# names bound in body of module, class or function
+#
+# Binding is tuple: ("def", DefItem), ("import", module name), ("from", module name, name),
+# ("value", assigned expression or None), ("annot", annotation expression), ("arg", default value or None),
+# ("derived", iterated expression or entered context) or ("self", ClassItem).
+class FastScope:
+    def __init__(self, def_item: DefItem, module: "FastModule", parent: "FastScope" = None):
+        self.item = def_item
+        self.module = module
+        self.parent = parent
+        self.names: Dict[str, tuple] = {}
+        self.rebound: Set[str] = set()  # names bound more than once
+        self.global_names: Set[str] = set()
+        self.nonlocal_names: Set[str] = set()
+        self.star_imports: List[str] = []  # modules imported by 'from ... import *'
+        self.returns: List[ast.expr] = []  # values returned by function
+
+    # first binding of name is used (the same way as 'ItemContainer.find_in_scope()' does)
+    def bind(self, name, binding):
+        if name in self.names:
+            self.rebound.add(name)
+            return
+        self.names[name] = binding
+
+
+class FastModule:
+    def __init__(self, file_path: str, module_name: str, tree: ast.Module):
+        self.file_path = file_path
+        self.module_name = module_name
+        self.package = get_package_name(module_name, file_path)
+        self.tree = tree
+        self.scope: FastScope = None
+        self._astroid_nodes: Dict[tuple, NodeNG] = None  # position to astroid node
+
+    def is_astroid_loaded(self) -> bool:
+        return self._astroid_nodes is not None
+
+    # returns astroid node placed in the same position as given 'ast' node
+    # astroid tree of module is loaded on first call
+    def get_astroid_node(self, ast_node) -> Optional[NodeNG]:
+        if self._astroid_nodes is None:
+            self._astroid_nodes = {}
+            astroid_tree = astroid.MANAGER.ast_from_file(self.file_path)
+            stack = [astroid_tree]
+            while stack:
+                astroid_node = stack.pop()
+                if isinstance(astroid_node, ASTROID_INDEXED_TYPES):
+                    self._astroid_nodes[get_position(astroid_node)] = astroid_node
+                stack.extend(astroid_node.get_children())
+        return self._astroid_nodes.get(get_position(ast_node))
+
+
+# ============================================
+
+
+# analysis of definitions and uses based on standard 'ast' module
+#
+# Definitions, imports and names bound in scopes are found without astroid. Chains of attributes are
+# resolved using items tree, bound names, constructor calls and annotations. Only elements which type
+# can not be deduced this way are inferred by astroid (see 'FastEngine.get_container()'), so astroid
+# trees are loaded only for modules containing such chains.
+class FastEngine:
+    def __init__(self, container: ItemContainer = None):
+        if container is None:
+            container = ItemContainer()
+        self.items = container
+        self.modules: Dict[str, FastModule] = {}  # module name to module
+        self.packages: Set[str] = set()  # parent packages of modules
+        self.scopes: Dict[int, FastScope] = {}  # id of scope node to scope of it's body
+        self.full_names: Dict[str, DefItem] = {}  # full name to definition (used to find inferred items)
+        self.def_nodes: Dict[DefItem, Tuple[ast.AST, FastScope]] = {}  # definition node and scope containing it
+        self.module_names: Dict[DefItem, str] = {}  # module item to module name
+        self.member_values: Dict[DefItem, Tuple[ast.expr, FastScope]] = {}  # value assigned to member
+        self.stats = {"tree": 0, "astroid": 0, "astroid_modules": 0}
+        self._resolving: Set = set()  # guard of cyclic references
+        self._inferred_names: Dict[Tuple[int, str], object] = {}  # (id of scope, name) to inferred type
+        self._classes: List[Tuple[ast.ClassDef, ClassItem, FastScope]] = []
+
+    # 'prefetcher' - reader of files in background (see 'astgraph.prefetch.SourcePrefetcher')
+    def load_files(self, files_list, prefetcher=None) -> List[FastModule]:
+        if prefetcher is not None:
+            sources_iter = prefetcher.iter_sources(files_list)
+        else:
+            sources_iter = ((file_path, None) for file_path in files_list)
+        module_list = []
+        for file_path, content in sources_iter:
+            if content is None:
+                with open(file_path, "rb") as src_file:
+                    content = src_file.read()
+            try:
+                tree = ast.parse(content, filename=file_path)
+            except (SyntaxError, ValueError):
+                _LOGGER.error("unable to parse file %s", file_path)
+                raise
+            module = FastModule(file_path, get_import_name(file_path), tree)
+            if module.module_name in self.modules:
+                continue
+            self.modules[module.module_name] = module
+            name_parts = module.module_name.split(".")
+            for index in range(1, len(name_parts)):
+                self.packages.add(".".join(name_parts[:index]))
+            module_list.append(module)
+        return module_list
+
+    def analyze_defs(self, module_list: List[FastModule]):
+        for module in module_list:
+            _LOGGER.info("=== analyzing fast definitions: %s", module.file_path)
+            self._add_defs(module)
+        # base classes can be defined in modules placed later on the list
+        for class_node, class_def, scope in self._classes:
+            for base_node in class_node.bases:
+                base_def = self.resolve_type(base_node, scope, infer=False)
+                if isinstance(base_def, ClassItem):
+                    class_def.append_base(base_def)
+        self._classes.clear()
+
+    def analyze_uses(self, module_list: List[FastModule]):
+        for index, module in enumerate(module_list):
+            if self.items.is_deadline_exceeded():
+                _LOGGER.warning("deadline exceeded, skipping usage analysis of %s files", len(module_list) - index)
+                return
+            _LOGGER.info("=== analyzing fast usage: %s", module.file_path)
+            use_parser = FastUseParser(self)
+            use_parser.analyze(module)
+
+    # ============================================
+
+    def _add_defs(self, module: FastModule):
+        mod_name = os.path.basename(module.module_name)
+        if mod_name.endswith(".py"):
+            mod_name = mod_name[:-3]
+        module_def = self.items.create_module_def(mod_name, None)
+        module_def.filename = module.file_path
+        self.items.append_def(module_def)
+        self.full_names.setdefault(module.module_name, module_def)
+        self.module_names[module_def] = module.module_name
+        module.scope = FastScope(module_def, module)
+        self.scopes[id(module.tree)] = module.scope
+
+        stack = [(iter(module.tree.body), module.scope)]
+        while stack:
+            nodes_iter, scope = stack[-1]
+            for node in nodes_iter:
+                child_nodes, child_scope = self._add_node_defs(node, scope)
+                if child_nodes:
+                    stack.append((iter(child_nodes), child_scope))
+                    break
+            else:
+                stack.pop()
+
+    # returns child nodes to visit and their scope
+    def _add_node_defs(self, node, scope: FastScope):
+        if isinstance(node, ast.ClassDef):
+            class_def: ClassItem = self.items.create_class_def(node.name, node)
+            class_scope = self._append_scope_def(node, class_def, scope)
+            self._classes.append((node, class_def, scope))
+            return node.body, class_scope
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            func_def = self.items.create_def(node.name, DefItemType.DEF_METHOD, node)
+            func_scope = self._append_scope_def(node, func_def, scope)
+            if node.name == "__init__" and isinstance(scope.item, ClassItem):
+                # explicit constructor definition
+                scope.item.explicit_ctor = True
+            self._bind_args(node, func_scope, scope)
+            return node.body, func_scope
+
+        if isinstance(node, ast.Lambda):
+            for arg in node.args.posonlyargs + node.args.args + node.args.kwonlyargs:
+                self._bind_name(scope, arg.arg, ("arg", None))
+            return [node.body], scope
+
+        if isinstance(node, (ast.For, ast.AsyncFor, ast.comprehension)):
+            for target_node in ast.walk(node.target):
+                if isinstance(target_node, ast.Name):
+                    self._bind_name(scope, target_node.id, ("derived", node.iter))
+            child_list = list(ast.iter_child_nodes(node))
+            child_list.remove(node.target)
+            return child_list, scope
+        if isinstance(node, ast.withitem) and isinstance(node.optional_vars, ast.Name):
+            self._bind_name(scope, node.optional_vars.id, ("derived", node.context_expr))
+            return [node.context_expr], scope
+
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    self._bind_name(scope, alias.asname, ("import", alias.name))
+                else:
+                    top_name = alias.name.split(".")[0]
+                    self._bind_name(scope, top_name, ("import", top_name))
+            return None, None
+
+        if isinstance(node, ast.ImportFrom):
+            from_name = get_from_name(node, scope.module.package)
+            for alias in node.names:
+                if alias.name == "*":
+                    scope.star_imports.append(from_name)
+                    continue
+                self._bind_name(scope, alias.asname or alias.name, ("from", from_name, alias.name))
+            return None, None
+
+        if isinstance(node, ast.Return) and node.value is not None:
+            scope.returns.append(node.value)
+            return [node.value], scope
+
+        if isinstance(node, ast.Global):
+            scope.global_names.update(node.names)
+            return None, None
+        if isinstance(node, ast.Nonlocal):
+            scope.nonlocal_names.update(node.names)
+            return None, None
+
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            self._bind_name(scope, node.targets[0].id, ("value", node.value))
+            return [node.value], scope
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            self._bind_name(scope, node.target.id, ("annot", node.annotation))
+            return [node.value] if node.value else None, scope
+
+        if isinstance(node, ast.Name):
+            if isinstance(node.ctx, ast.Store):
+                self._bind_name(scope, node.id, ("value", None))
+            return None, None
+
+        return list(ast.iter_child_nodes(node)), scope
+
+    def _append_scope_def(self, node, def_item: DefItem, scope: FastScope) -> FastScope:
+        self.items.append_def_parent(scope.item, def_item)
+        self.full_names.setdefault(def_item.get_full_name(), def_item)
+        self.def_nodes[def_item] = (node, scope)
+        self._bind_name(scope, node.name, ("def", def_item))
+        child_scope = FastScope(def_item, scope.module, scope)
+        self.scopes[id(node)] = child_scope
+        return child_scope
+
+    def _bind_name(self, scope: FastScope, name, binding):
+        if name in scope.nonlocal_names:
+            return
+        if name in scope.global_names:
+            scope = scope.module.scope
+        scope.bind(name, binding)
+
+    def _bind_args(self, func_node, func_scope: FastScope, scope: FastScope):
+        args = func_node.args
+        positional_list = args.posonlyargs + args.args
+        # default values are aligned to last arguments
+        defaults_list = [None] * (len(positional_list) - len(args.defaults)) + args.defaults
+        defaults_list += args.kw_defaults
+        for arg, default in zip(positional_list + args.kwonlyargs, defaults_list):
+            if arg.annotation is not None:
+                func_scope.bind(arg.arg, ("annot", arg.annotation))
+            else:
+                func_scope.bind(arg.arg, ("arg", default))
+        for arg in (args.vararg, args.kwarg):
+            if arg is not None:
+                # tuple and dict
+                func_scope.bind(arg.arg, ("arg", None))
+        if positional_list and isinstance(scope.item, ClassItem) and not is_staticmethod(func_node):
+            # 'self' or 'cls' argument
+            func_scope.names[positional_list[0].arg] = ("self", scope.item)
+
+    # ============================================
+
+    # returns definitions of elements of chain of attributes (None for elements without definition)
+    def resolve_chain(self, expr_node, scope: FastScope) -> List[Optional[DefItem]]:
+        def_list, _, _, _ = self._resolve(expr_node, scope, True)
+        return def_list
+
+    # returns DefItem describing type of expression or NO_TYPE if type is not defined in analyzed code
+    # if 'infer' is False then UNKNOWN is returned for types requiring astroid inference
+    def resolve_type(self, expr_node, scope: FastScope, infer=True):
+        _, last_def, last_type, last_node = self._resolve(expr_node, scope, infer)
+        return self.get_container(last_def, last_type, last_node, scope, infer)
+
+    # returns item containing attributes of expression described by 'expr_def' and 'expr_type'
+    def get_container(self, expr_def: DefItem, expr_type, expr_node, scope: FastScope, infer=True):
+        if expr_type is FROM_DEF:
+            expr_type = self._get_item_type(expr_def)
+        if isinstance(expr_type, tuple):
+            if expr_type[0] == "expr":
+                expr_type = self._get_expr_type(expr_type[1], expr_type[2])
+            elif expr_type[0] == "annot":
+                expr_type = self._get_annotation_type(expr_type[1], expr_type[2])
+            elif expr_type[0] == "derived":
+                expr_type = self._get_derived_type(expr_type[1], expr_type[2])
+        if expr_type is UNKNOWN:
+            if not infer:
+                return UNKNOWN
+            self.stats["astroid"] += 1
+            return self._infer(expr_node, scope.module)
+        self.stats["tree"] += 1
+        return expr_type
+
+    def _resolve(self, expr_node, scope: FastScope, infer):
+        steps_list = []
+        node = expr_node
+        while isinstance(node, (ast.Attribute, ast.Call, ast.Subscript)):
+            steps_list.append(node)
+            node = node.func if isinstance(node, ast.Call) else node.value
+        if not isinstance(node, ast.Name):
+            base_type = UNKNOWN
+            if isinstance(node, LITERAL_TYPES):
+                base_type = NO_TYPE
+            elif isinstance(node, DISPLAY_TYPES) and not getattr(node, "elts", getattr(node, "keys", None)):
+                # empty container
+                base_type = NO_TYPE
+            elif isinstance(node, ast.IfExp) and not steps_list:
+                body_type = self._get_expr_type(node.body, scope)
+                if body_type is NO_TYPE and self._get_expr_type(node.orelse, scope) is NO_TYPE:
+                    base_type = NO_TYPE
+            if steps_list:
+                return [], None, UNKNOWN, steps_list[0]
+            return [], None, base_type, node
+
+        last_def, last_type = self.resolve_name(node.id, scope)
+        def_list = [last_def]
+        prev_node = node
+        for step_node in reversed(steps_list):
+            if isinstance(step_node, ast.Attribute):
+                if prev_node is node:
+                    container = self._get_name_container(node, last_def, last_type, scope, infer)
+                else:
+                    container = self.get_container(last_def, last_type, prev_node, scope, infer)
+                last_def, last_type = self._get_attribute(container, step_node.attr)
+                def_list.append(last_def)
+            elif isinstance(step_node, ast.Call):
+                last_type = self._get_call_type(prev_node, last_def, last_type, scope)
+            elif self.get_container(last_def, last_type, prev_node, scope, infer=False) is NO_TYPE:
+                # item of container of builtin type (e.g. argument or result of external function)
+                last_type = NO_TYPE
+            else:
+                last_type = UNKNOWN
+            prev_node = step_node
+        return def_list, last_def, last_type, prev_node
+
+    # inferred types of names are stored, so each name of scope is inferred only once
+    def _get_name_container(self, name_node, name_def: DefItem, name_type, scope: FastScope, infer):
+        key = (id(scope), name_node.id)
+        container = self._inferred_names.get(key)
+        if container is not None:
+            return container
+        inferred_num = self.stats["astroid"]
+        container = self.get_container(name_def, name_type, name_node, scope, infer)
+        if self.stats["astroid"] != inferred_num:
+            self._inferred_names[key] = container
+        return container
+
+    def resolve_name(self, name, scope: FastScope):
+        lookup_scope = scope
+        while lookup_scope is not None:
+            # class scope is not visible from nested scopes
+            if lookup_scope is scope or not lookup_scope.item.is_class():
+                binding = lookup_scope.names.get(name)
+                if binding is not None:
+                    return self._resolve_binding(name, binding, lookup_scope)
+            lookup_scope = lookup_scope.parent
+        for module_name in scope.module.scope.star_imports:
+            found_def, found_type = self._get_module_attribute(module_name, name)
+            if found_def is not None:
+                return found_def, found_type
+        # builtins
+        return None, NO_TYPE
+
+    def _resolve_binding(self, name, binding, scope: FastScope):
+        kind = binding[0]
+        if kind == "def":
+            return binding[1], FROM_DEF
+        if kind == "self":
+            if name in scope.rebound:
+                # argument reassigned in method
+                return None, UNKNOWN
+            return None, binding[1]
+        if kind == "import":
+            return self._get_module(binding[1])
+        if kind == "from":
+            return self._get_module_attribute(binding[1], binding[2])
+        if kind == "annot":
+            return None, ("annot", binding[1], scope)
+        if kind == "arg" and binding[1] is None:
+            # astroid does not infer arguments without default values
+            return None, NO_TYPE
+        if kind == "derived":
+            return None, ("derived", binding[1], scope)
+        if binding[1] is None:
+            return None, UNKNOWN
+        return None, ("expr", binding[1], scope)
+
+    def _get_module(self, module_name):
+        module = self.modules.get(module_name)
+        if module is not None:
+            return module.scope.item, FROM_DEF
+        if module_name in self.packages:
+            return None, ("package", module_name)
+        return None, NO_TYPE
+
+    def _get_module_attribute(self, module_name, name):
+        module = self.modules.get(module_name)
+        if module is not None:
+            child = self.items.get_child(module.scope.item, name)
+            if child is not None:
+                return child, FROM_DEF
+            binding = module.scope.names.get(name)
+            key = (module_name, name)
+            if binding is not None and binding[0] in ("import", "from") and key not in self._resolving:
+                # name imported by module
+                self._resolving.add(key)
+                try:
+                    return self._resolve_binding(name, binding, module.scope)
+                finally:
+                    self._resolving.discard(key)
+        submodule_def, submodule_type = self._get_module(f"{module_name}.{name}")
+        if submodule_def is not None:
+            # submodule is not child item of package
+            return None, submodule_def
+        return None, submodule_type
+
+    def _get_attribute(self, container, name):
+        if isinstance(container, tuple):
+            if container[0] == "super":
+                found_list = container[1].find_in_bases(name)
+                if found_list:
+                    return found_list[0], FROM_DEF
+                return None, UNKNOWN
+            # package without analyzed module
+            return self._get_module_attribute(container[1], name)
+        if not isinstance(container, DefItem):
+            return None, container
+        if container.is_module():
+            return self._get_module_attribute(self.module_names[container], name)
+        child = self.items.get_child(container, name)
+        if child is not None:
+            return child, FROM_DEF
+        if container.is_class():
+            # e.g. attribute of base class not defined in analyzed code
+            return None, UNKNOWN
+        return None, NO_TYPE
+
+    def _get_call_type(self, func_node, callee_def: DefItem, callee_type, scope: FastScope):
+        if isinstance(func_node, ast.Name) and func_node.id == "super" and callee_def is None:
+            class_scope = scope.parent
+            if scope.item.is_method() and class_scope is not None and class_scope.item.is_class():
+                return ("super", class_scope.item)
+            return UNKNOWN
+        if callee_def is None:
+            return NO_TYPE if callee_type is NO_TYPE else UNKNOWN
+        if callee_def.is_class():
+            return callee_def
+        if callee_def.is_method():
+            func_node, func_scope = self.def_nodes.get(callee_def, (None, None))
+            if func_node is None:
+                # implicit constructor
+                return UNKNOWN
+            if func_node.returns is not None:
+                return ("annot", func_node.returns, func_scope)
+            return self._get_returned_type(func_node)
+        return UNKNOWN
+
+    # returns type of values returned by function without annotation
+    def _get_returned_type(self, func_node):
+        key = id(func_node)
+        if key in self._resolving:
+            return UNKNOWN
+        self._resolving.add(key)
+        try:
+            body_scope = self.scopes[key]
+            returned_type = NO_TYPE  # function returns None (or generator)
+            for value_node in body_scope.returns:
+                value_type = self.resolve_type(value_node, body_scope, infer=False)
+                if value_type is NO_TYPE:
+                    continue
+                if returned_type is not NO_TYPE and value_type is not returned_type:
+                    return UNKNOWN
+                returned_type = value_type
+            return returned_type
+        finally:
+            self._resolving.discard(key)
+
+    def _get_item_type(self, def_item: DefItem):
+        if not def_item.is_field():
+            return def_item
+        type_hint = self.items.get_type_hint(def_item)
+        if type_hint is not None:
+            return type_hint
+        value = self.member_values.get(def_item)
+        if value is not None:
+            return ("expr", value[0], value[1])
+        return UNKNOWN
+
+    # returns DefItem of class given by annotation or NO_TYPE if type is not defined in analyzed code
+    def resolve_annotation(self, annotation_node, scope: FastScope):
+        return self.get_container(None, ("annot", annotation_node, scope), annotation_node, scope)
+
+    def _get_expr_type(self, expr_node, scope: FastScope):
+        key = id(expr_node)
+        if key in self._resolving:
+            return UNKNOWN
+        self._resolving.add(key)
+        try:
+            return self.resolve_type(expr_node, scope, infer=False)
+        finally:
+            self._resolving.discard(key)
+
+    def _get_annotation_type(self, annotation_node, scope: FastScope):
+        if isinstance(annotation_node, ast.Constant) and isinstance(annotation_node.value, str):
+            # forward reference
+            try:
+                annotation_node = ast.parse(annotation_node.value, mode="eval").body
+            except SyntaxError:
+                return UNKNOWN
+        if isinstance(annotation_node, ast.Subscript):
+            # generic type, e.g. 'Optional[Item]' or 'List[Item]'
+            if self._get_expr_type(annotation_node.value, scope) is not NO_TYPE:
+                return UNKNOWN
+            generic_node = annotation_node.value
+            generic_name = (
+                generic_node.attr if isinstance(generic_node, ast.Attribute) else getattr(generic_node, "id", None)
+            )
+            if generic_name != "Optional":
+                return NO_TYPE
+            annotation_node = annotation_node.slice
+            if isinstance(annotation_node, ast.Index):
+                annotation_node = annotation_node.value
+        annotation_type = self._get_expr_type(annotation_node, scope)
+        if isinstance(annotation_type, ClassItem) or annotation_type is NO_TYPE:
+            return annotation_type
+        return UNKNOWN
+
+    # returns type of value derived from given expression (e.g. items of iterated container)
+    def _get_derived_type(self, expr_node, scope: FastScope):
+        if self._get_expr_type(expr_node, scope) is NO_TYPE:
+            # e.g. result of external function - astroid is not able to infer it's items
+            return NO_TYPE
+        return UNKNOWN
+
+    def _infer(self, ast_node, module: FastModule):
+        if not module.is_astroid_loaded():
+            _LOGGER.debug("loading astroid tree of %s", module.file_path)
+            self.stats["astroid_modules"] += 1
+        astroid_node = module.get_astroid_node(ast_node)
+        if astroid_node is None:
+            return NO_TYPE
+        inferred = infer_type(astroid_node)
+        if isinstance(inferred, astroid_nodes.Module):
+            return self.full_names.get(inferred.name, NO_TYPE)
+        if isinstance(inferred, (astroid_nodes.ClassDef, astroid_nodes.FunctionDef)):
+            return self.full_names.get(inferred.qname(), NO_TYPE)
+        return NO_TYPE
+
+
+# ============================================
+
+
+# use parser of 'ast' trees
+#
+# Handlers receive node and context (scope of names, True if node is placed directly in class body)
+# and return list of pairs (child nodes, context) to visit. Nodes without handler are traversed
+# through their children.
+class FastUseParser:
+    VISIT_HANDLERS = {
+        ast.FunctionDef: "visit_functiondef",
+        ast.AsyncFunctionDef: "visit_functiondef",
+        ast.ClassDef: "visit_classdef",
+        ast.Lambda: "visit_nested_scope",
+        ast.ListComp: "visit_nested_scope",
+        ast.SetComp: "visit_nested_scope",
+        ast.DictComp: "visit_nested_scope",
+        ast.GeneratorExp: "visit_nested_scope",
+        ast.Call: "visit_call",
+        ast.keyword: "visit_keyword",
+        ast.Assign: "visit_assign",
+        ast.AnnAssign: "visit_annassign",
+        ast.Name: "visit_name",
+        ast.Attribute: "visit_attribute",
+        ast.Constant: "skip_node",
+        ast.Import: "skip_node",
+        ast.ImportFrom: "skip_node",
+        ast.Global: "skip_node",
+        ast.Nonlocal: "skip_node",
+        ast.Pass: "skip_node",
+        ast.Break: "skip_node",
+        ast.Continue: "skip_node",
+    }
+
+    def __init__(self, engine: FastEngine):
+        self.engine = engine
+        self.items = engine.items
+        self._handlers = {node_class: getattr(self, name) for node_class, name in self.VISIT_HANDLERS.items()}
+        self._values: Dict[int, ast.expr] = {}  # id of assignment target to assigned value
+
+    def analyze(self, module: FastModule):
+        handlers = self._handlers
+        stack = [(iter(module.tree.body), (module.scope, False))]
+        while stack:
+            nodes_iter, context = stack[-1]
+            for node in nodes_iter:
+                handler = handlers.get(node.__class__)
+                if handler is None:
+                    stack.append((ast.iter_child_nodes(node), context))
+                    break
+                visit_list = handler(node, context)
+                if visit_list:
+                    # visit children before remaining siblings
+                    for child_nodes, child_context in reversed(visit_list):
+                        stack.append((iter(child_nodes), child_context))
+                    break
+            else:
+                stack.pop()
+
+    def skip_node(self, _node, _context):
+        return None
+
+    def visit_functiondef(self, node, context):
+        if self.items.is_deadline_exceeded():
+            # no time left - skip body of function
+            return None
+        func_scope = self.engine.scopes[id(node)]
+        body_list = [node.args] + node.body
+        if node.returns is not None:
+            body_list.append(node.returns)
+        return [(node.decorator_list, context), (body_list, (func_scope, False))]
+
+    def visit_classdef(self, node, context):
+        class_scope = self.engine.scopes[id(node)]
+        return [(node.decorator_list, context), (node.bases + node.keywords + node.body, (class_scope, True))]
+
+    def visit_nested_scope(self, node, context):
+        scope, _ = context
+        return [(ast.iter_child_nodes(node), (scope, False))]
+
+    def visit_call(self, node, context):
+        scope, _ = context
+        def_list = self.engine.resolve_chain(node, scope)
+        self._append_uses(scope.item, def_list, True)
+        return [(node.args + node.keywords, context)]
+
+    def visit_keyword(self, node, context):
+        scope, _ = context
+        def_list = self.engine.resolve_chain(node.value, scope)
+        self._append_uses(scope.item, def_list, False)
+
+    def visit_assign(self, node, context):
+        if len(node.targets) == 1:
+            self._values[id(node.targets[0])] = node.value
+        return [(node.targets + [node.value], context)]
+
+    def visit_annassign(self, node, context):
+        scope, _ = context
+        if node.value is not None:
+            self._values[id(node.target)] = node.value
+        target_handler = self._handlers.get(node.target.__class__)
+        if target_handler is not None:
+            target_list = target_handler(node.target, context) or []
+        else:
+            target_list = [([node.target], context)]
+
+        def_list = self.engine.resolve_chain(node.target, scope)
+        last_item = def_list[-1] if def_list else None
+        if last_item is not None:
+            hint_def = self.engine.resolve_annotation(node.annotation, scope)
+            if not isinstance(hint_def, DefItem):
+                hint_def = None
+            self.items.set_type_hint(last_item, hint_def)
+
+        visit_list = [([node.annotation], context)]
+        if node.value is not None:
+            visit_list.append(([node.value], context))
+        return target_list + visit_list
+
+    def visit_name(self, node, context):
+        scope, class_level = context
+        if not class_level or not isinstance(node.ctx, ast.Store):
+            return
+        # class field
+        value = self._values.pop(id(node), None)
+        child = self.items.get_child(scope.item, node.id)
+        if child is None:
+            child = self.items.create_def(node.id, DefItemType.MEMBER, node)
+            self.items.append_def_parent(scope.item, child)
+        if value is not None:
+            self.engine.member_values.setdefault(child, (value, scope))
+
+    def visit_attribute(self, node, context):
+        scope, _ = context
+        if isinstance(node.ctx, ast.Load):
+            # read value from object's attribute
+            def_list = self.engine.resolve_chain(node, scope)
+            self._append_uses(scope.item, def_list, False)
+            return None
+        if isinstance(node.ctx, ast.Store) and isinstance(node.value, ast.Name):
+            # assigning value to object's attribute
+            self._handle_name(node, scope)
+            return None
+        return [([node.value], context)]
+
+    def _handle_name(self, attr_node, scope: FastScope):
+        value = self._values.pop(id(attr_node), None)
+        name_node = attr_node.value
+        name_def, name_type = self.engine.resolve_name(name_node.id, scope)
+        type_def = self.engine.get_container(name_def, name_type, name_node, scope)
+        if not isinstance(type_def, ClassItem):
+            _LOGGER.debug("unable to find class of %s", name_node.id)
+            return
+
+        child = self.items.get_child(type_def, attr_node.attr)
+        if child is None:
+            # add new attribute
+            child = self.items.create_def(attr_node.attr, DefItemType.MEMBER, attr_node)
+            self.items.append_def_parent(type_def, child)
+        self.items.append_use(scope.item, child)
+        if value is not None:
+            self.engine.member_values.setdefault(child, (value, scope))
+
+    def _append_uses(self, user_def: DefItem, def_list: List[Optional[DefItem]], is_call):
+        for def_item in def_list[:-1]:
+            if def_item is None:
+                # happens e.g. in case of direct imports
+                continue
+            if def_item.type in (DefItemType.MODULE, DefItemType.CLASS):
+                continue
+            self.items.append_use(user_def, def_item)
+        last_item = def_list[-1] if def_list else None
+        if last_item is None:
+            # None can occur for function calls (e.g. 'print')
+            return
+        if is_call:
+            last_item = self.items.get_callable(last_item)
+        self.items.append_use(user_def, last_item)
+
+
+# ============================================
+
+
+# analyze files using standard 'ast' module, astroid is used only for chains of attributes which
+# types can not be found in items tree
+def analyze_fast(parser: TreeParser, files_list) -> FastEngine:
+    add_search_paths(files_list)
+    engine = FastEngine(parser.items)
+    module_list = engine.load_files(files_list, parser.prefetcher)
+    if parser.prefetcher is not None:
+        _LOGGER.info("prefetch stats: %s", parser.prefetcher.get_stats())
+    engine.analyze_defs(module_list)
+    engine.analyze_uses(module_list)
+    _LOGGER.info("fast engine stats: %s", engine.stats)
+    return engine
@@ -0,0 +1,62 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+from typing import List, Optional
+
+import astroid.nodes.scoped_nodes.scoped_nodes as astroid_nodes
+from astroid.nodes import NodeNG
+
+from astgraph.treeparser import ItemContainer, DefParser, UseParser, DefItem
+
+
+# definitions parser collecting also nodes to be analyzed by 'UseParser' (see 'UseParser.analyze_candidates()')
+#
+# Candidates are top-most nodes handled by 'UseParser' in order of tree traversal, so analysis of the list
+# gives the same results as traversal of whole tree. Subtrees of candidates do not contain definitions,
+# so each node is visited only once by both passes.
+class FusedDefParser(DefParser):
+    VISIT_HANDLERS = DefParser.VISIT_HANDLERS + [
+        (node_type, "visit_use_candidate")
+        for node_type, _ in UseParser.VISIT_HANDLERS
+        if node_type is not astroid_nodes.FunctionDef
+    ]
+    SKIP_TYPES = UseParser.SKIP_TYPES
+
+    def __init__(self, container: ItemContainer = None):
+        super().__init__(container)
+        self.candidates: List[NodeNG] = []
+        self._forward_depth = 0  # depth of visits of "forward declarations"
+
+    def _is_skipped(self, node_class) -> bool:
+        return issubclass(node_class, self.SKIP_TYPES)
+
+    def _find_type_def_in_scope(self, astroid_node: NodeNG, item_name: str = None) -> Optional[DefItem]:
+        # nodes visited out of order are collected when reached by traversal
+        self._forward_depth += 1
+        try:
+            return super()._find_type_def_in_scope(astroid_node, item_name)
+        finally:
+            self._forward_depth -= 1
+
+    def visit_classdef(self, astroid_node):
+        if self.items.find_def_item(astroid_node) and self._forward_depth == 0:
+            # defined by "forward declaration" - collect candidates only
+            self._visit_children(astroid_node)
+            return
+        super().visit_classdef(astroid_node)
+
+    def visit_functiondef(self, astroid_node):
+        if self.items.find_def_item(astroid_node) and self._forward_depth == 0:
+            # defined by "forward declaration" - collect candidates only
+            self._visit_children(astroid_node)
+            return
+        super().visit_functiondef(astroid_node)
+
+    def visit_use_candidate(self, astroid_node):
+        if self._forward_depth == 0:
+            self.candidates.append(astroid_node)
@@ -73,15 +73,18 @@ class Visitor:
         self._visited = set()
         self._visit_node(start_node)
 
-    def _visit_node(self, node):
-        if node in self._visited:
-            return
-        self._visited.add(node)
-        self._callback(node)
-
-        sub_list = self._edges_dict.get(node, [])
-        for item in sub_list:
-            self._visit_node(item)
+    # depth-first traversal using explicit stack - long chains of calls do not exceed recursion limit
+    def _visit_node(self, start_node):
+        stack = [start_node]
+        while stack:
+            node = stack.pop()
+            if node in self._visited:
+                continue
+            self._visited.add(node)
+            self._callback(node)
+
+            sub_list = self._edges_dict.get(node, [])
+            stack.extend(reversed(sub_list))
 
 
 def visit_graph(edges_dict, start_node, node_callback):
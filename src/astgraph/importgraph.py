@@ -0,0 +1,258 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import ast
+import logging
+from typing import Dict, List, Set
+
+from astgraph.modpath import add_search_paths, get_import_name
+from astgraph.graphtheory import Filter
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# returns name of package containing module (used to resolve relative imports)
+def get_package_name(module_name, file_path):
+    base_name = os.path.splitext(os.path.basename(file_path))[0]
+    if base_name == "__init__":
+        return module_name
+    return module_name.rpartition(".")[0]
+
+
+# returns absolute name of module of 'from' import
+def get_from_name(node: ast.ImportFrom, package) -> str:
+    if not node.level:
+        return node.module or ""
+    # relative import
+    parts = package.split(".") if package else []
+    parts = parts[: len(parts) - node.level + 1]
+    if node.module:
+        parts.append(node.module)
+    return ".".join(parts)
+
+
+# returns names of modules imported by given source code
+# 'from' imports add also names of imported items, because they can be submodules
+def get_imports(content: bytes, module_name, file_path) -> List[str]:
+    try:
+        tree = ast.parse(content, filename=file_path)
+    except (SyntaxError, ValueError):
+        return []
+    return get_tree_imports(tree, module_name, file_path)
+
+
+def get_tree_imports(tree: ast.Module, module_name, file_path) -> List[str]:
+    package = get_package_name(module_name, file_path)
+    imports = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.add(alias.name)
+        elif isinstance(node, ast.ImportFrom):
+            from_name = get_from_name(node, package)
+            if from_name:
+                imports.add(from_name)
+            for alias in node.names:
+                imports.add(f"{from_name}.{alias.name}" if from_name else alias.name)
+    return sorted(imports)
+
+
+# returns names of all definitions (classes and functions) and class attributes
+def get_tree_names(tree: ast.Module, module_name) -> List[str]:
+    names_list = [module_name]
+    visit_list = [(module_name, child) for child in tree.body]
+    while visit_list:
+        namespace, node = visit_list.pop()
+        if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            full_name = f"{namespace}.{node.name}"
+            names_list.append(full_name)
+            visit_list.extend((full_name, child) for child in ast.iter_child_nodes(node))
+            continue
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names_list.append(f"{namespace}.{node.id}")
+        elif isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Store) and namespace != module_name:
+            # e.g. 'self.field' in method - member of class
+            names_list.append(f"{namespace.rpartition('.')[0]}.{node.attr}")
+        visit_list.extend((namespace, child) for child in ast.iter_child_nodes(node))
+    return names_list
+
+
+# returns dotted names of base classes (with names resolved through imports)
+def get_tree_bases(tree: ast.Module, module_name, file_path) -> List[str]:
+    package = get_package_name(module_name, file_path)
+    aliases: Dict[str, str] = {}  # local name to imported name
+    star_imports = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+                else:
+                    top_name = alias.name.split(".")[0]
+                    aliases[top_name] = top_name
+        elif isinstance(node, ast.ImportFrom):
+            from_name = get_from_name(node, package)
+            for alias in node.names:
+                if alias.name == "*":
+                    star_imports.append(from_name)
+                    continue
+                aliases[alias.asname or alias.name] = f"{from_name}.{alias.name}" if from_name else alias.name
+
+    bases_list = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for base_node in node.bases:
+            attr_list = []
+            while isinstance(base_node, ast.Attribute):
+                attr_list.insert(0, base_node.attr)
+                base_node = base_node.value
+            if not isinstance(base_node, ast.Name):
+                continue
+            imported_name = aliases.get(base_node.id)
+            if imported_name is None:
+                # local class or name from star import
+                bases_list.extend(star_imports)
+                continue
+            bases_list.append(".".join([imported_name] + attr_list))
+    return bases_list
+
+
+# ============================================
+
+
+class ModuleInfo:
+    def __init__(self, file_path: str, module_name: str):
+        self.file_path = file_path
+        self.module_name = module_name
+        self.imports: List[str] = []
+        self.names: List[str] = []  # full names of items defined in module
+        self.bases: List[str] = []  # full names of imported base classes
+
+
+def read_module(file_path) -> ModuleInfo:
+    module_name = get_import_name(file_path)
+    module_info = ModuleInfo(file_path, module_name)
+    with open(file_path, "rb") as src_file:
+        content = src_file.read()
+    try:
+        tree = ast.parse(content, filename=file_path)
+    except (SyntaxError, ValueError):
+        _LOGGER.warning("unable to parse file %s", file_path)
+        return module_info
+    module_info.imports = get_tree_imports(tree, module_name, file_path)
+    module_info.names = get_tree_names(tree, module_name)
+    module_info.bases = get_tree_bases(tree, module_name, file_path)
+    return module_info
+
+
+# graph of imports between analyzed modules
+#
+# Built using standard 'ast' module only, so it is cheap to calculate it before astroid analysis.
+class ImportGraph:
+    def __init__(self, files_list):
+        add_search_paths(files_list)
+        self.modules: Dict[str, ModuleInfo] = {}
+        self.files: Dict[str, str] = {}  # file path to module name
+        for file_path in files_list:
+            module_info = read_module(file_path)
+            self.modules[module_info.module_name] = module_info
+            self.files[file_path] = module_info.module_name
+
+        self.imports: Dict[str, Set[str]] = {}  # module to imported modules
+        self.importers: Dict[str, Set[str]] = {}  # module to importing modules
+        self.bases: Dict[str, Set[str]] = {}  # module to modules of base classes
+        self.derived: Dict[str, Set[str]] = {}  # module to modules of derived classes
+        for module_name, module_info in self.modules.items():
+            imported_set = self._find_modules(module_info.imports, module_name)
+            self.imports[module_name] = imported_set
+            for imported_name in imported_set:
+                self.importers.setdefault(imported_name, set()).add(module_name)
+            bases_set = self._find_modules(module_info.bases, module_name, longest=True)
+            self.bases[module_name] = bases_set
+            for base_name in bases_set:
+                self.derived.setdefault(base_name, set()).add(module_name)
+
+    # returns modules containing items matching filter
+    def find_matching(self, filter_obj: Filter) -> Set[str]:
+        ret_set = set()
+        for module_name, module_info in self.modules.items():
+            for item_name in module_info.names:
+                if filter_obj.is_matching(item_name):
+                    ret_set.add(module_name)
+                    break
+        return ret_set
+
+    # returns analyzed modules containing given names
+    # 'longest' - return only the innermost module, otherwise parent packages are included
+    def _find_modules(self, names_list, module_name, longest=False) -> Set[str]:
+        ret_set = set()
+        for import_name in names_list:
+            found_list = []
+            name_parts = import_name.split(".")
+            for index in range(1, len(name_parts) + 1):
+                # importing submodule imports parent packages
+                imported_name = ".".join(name_parts[:index])
+                if imported_name in self.modules and imported_name != module_name:
+                    found_list.append(imported_name)
+            if longest:
+                found_list = found_list[-1:]
+            ret_set.update(found_list)
+        return ret_set
+
+    # returns modules that can be used by given modules
+    #
+    # Includes also modules deriving from classes of reached modules - overrides of called methods are
+    # marked as used.
+    def get_down(self, modules_set: Set[str]) -> Set[str]:
+        ret_set = set(modules_set)
+        visit_list = list(modules_set)
+        while visit_list:
+            module_name = visit_list.pop()
+            next_set = self.imports.get(module_name, set()) | self.derived.get(module_name, set())
+            for next_name in next_set:
+                if next_name in ret_set:
+                    continue
+                ret_set.add(next_name)
+                visit_list.append(next_name)
+        return ret_set
+
+    # returns modules that can use given modules
+    #
+    # Includes also users of base classes of reached modules - overrides of called methods are
+    # marked as used.
+    def get_up(self, modules_set: Set[str]) -> Set[str]:
+        ret_set = set(modules_set)
+        visit_list = list(modules_set)
+        while visit_list:
+            module_name = visit_list.pop()
+            next_set = self.importers.get(module_name, set()) | self.bases.get(module_name, set())
+            for next_name in next_set:
+                if next_name in ret_set:
+                    continue
+                ret_set.add(next_name)
+                visit_list.append(next_name)
+        return ret_set
+
+
+# returns files containing modules connected by imports with items matching filters
+# order of files is preserved
+def prune_files(files_list, filter_down_obj: Filter = None, filter_up_obj: Filter = None) -> List[str]:
+    if filter_down_obj is None and filter_up_obj is None:
+        return files_list
+    graph = ImportGraph(files_list)
+    modules_set = set()
+    if filter_down_obj is not None:
+        modules_set.update(graph.get_down(graph.find_matching(filter_down_obj)))
+    if filter_up_obj is not None:
+        modules_set.update(graph.get_up(graph.find_matching(filter_up_obj)))
+    ret_list = [file_path for file_path in files_list if graph.files[file_path] in modules_set]
+    _LOGGER.info("pruned files: %s/%s", len(ret_list), len(files_list))
+    return ret_list
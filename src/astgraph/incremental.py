@@ -0,0 +1,206 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+from typing import Dict, Set, Optional
+
+import astroid
+import astroid.context as astroid_context
+from astroid.inference_tip import clear_inference_tip_cache
+import astroid.nodes.scoped_nodes.scoped_nodes as astroid_nodes
+from astroid.nodes import node_classes
+
+from astgraph.treeparser import TreeParser, ItemContainer, DefItem, ClassItem
+from astgraph.modpath import add_search_paths, get_import_name
+from astgraph.inference import INFERENCE_CACHE
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# returns names of modules imported by given module (including parent packages)
+def get_module_imports(module_node: astroid_nodes.Module) -> Set[str]:
+    imports = set()
+    for import_node in module_node.nodes_of_class((node_classes.Import, node_classes.ImportFrom)):
+        if isinstance(import_node, node_classes.Import):
+            names_list = [name for name, _ in import_node.names]
+        else:
+            try:
+                from_name = module_node.relative_to_absolute_name(import_node.modname, import_node.level)
+            except astroid.exceptions.TooManyLevelsError:
+                continue
+            # imported names can be submodules
+            names_list = [from_name] + [f"{from_name}.{name}" for name, _ in import_node.names]
+        for import_name in names_list:
+            name_parts = import_name.split(".")
+            for index in range(1, len(name_parts) + 1):
+                imports.add(".".join(name_parts[:index]))
+    return imports
+
+
+# ============================================
+
+
+# update analysis results after change of single file
+#
+# Changed module and modules depending on it (importing it directly or indirectly, using it's items or
+# declaring members in it) are removed from items container and analyzed again. Other modules are
+# not touched.
+class IncrementalUpdater:
+    def __init__(self, parser: TreeParser):
+        self.parser = parser
+        self._imports: Dict[str, Set[str]] = {}  # imports of modules
+
+    def update_file(self, file_path):
+        module_name = get_import_name(file_path)
+        _LOGGER.info("updating module %s", module_name)
+        affected = self.find_affected({module_name})
+        self._remove_modules(affected)
+
+        mod_dict = self.parser.items.mod_dict
+        files_dict = {name: mod_dict[name].file for name in affected if name in mod_dict}
+        files_dict[module_name] = file_path
+        self._reanalyze(files_dict)
+
+    def remove_file(self, file_path):
+        module_name = get_import_name(file_path)
+        _LOGGER.info("removing module %s", module_name)
+        affected = self.find_affected({module_name})
+        self._remove_modules(affected)
+
+        self.parser.items.remove_mod(module_name)
+        mod_dict = self.parser.items.mod_dict
+        astroid.MANAGER.astroid_cache.pop(module_name, None)
+        affected.discard(module_name)
+        files_dict = {name: mod_dict[name].file for name in affected if name in mod_dict}
+        self._reanalyze(files_dict)
+
+    # returns names of given modules and modules depending on them
+    def find_affected(self, modules_set: Set[str]) -> Set[str]:
+        dependents = self._get_dependents()
+        affected = set(modules_set)
+        visit_list = list(modules_set)
+        while visit_list:
+            module_name = visit_list.pop()
+            for dep_name in dependents.get(module_name, []):
+                if dep_name in affected:
+                    continue
+                affected.add(dep_name)
+                visit_list.append(dep_name)
+        return affected
+
+    # returns dict: module name to names of modules depending on it
+    def _get_dependents(self) -> Dict[str, Set[str]]:
+        items = self.parser.items
+        dependents: Dict[str, Set[str]] = {}
+        for module_name, module_node in items.mod_dict.items():
+            imports = self._imports.get(module_name)
+            if imports is None:
+                imports = get_module_imports(module_node)
+                self._imports[module_name] = imports
+            for import_name in imports:
+                dependents.setdefault(import_name, set()).add(module_name)
+
+        modules_dict: Dict[DefItem, str] = {}
+        for user_item, uses_list in items.use_dict.items():
+            user_module = self._get_module_name(user_item, modules_dict)
+            for use_item in uses_list:
+                use_module = self._get_module_name(use_item, modules_dict)
+                dependents.setdefault(use_module, set()).add(user_module)
+                owner_module = self._get_owner_name(use_item)
+                if owner_module is not None:
+                    dependents.setdefault(owner_module, set()).add(user_module)
+        for def_item in items.def_items:
+            # members declared by other modules
+            owner_module = self._get_owner_name(def_item)
+            if owner_module is None:
+                continue
+            item_module = self._get_module_name(def_item, modules_dict)
+            if owner_module != item_module:
+                dependents.setdefault(item_module, set()).add(owner_module)
+        return dependents
+
+    def _remove_modules(self, modules_set: Set[str]):
+        items: ItemContainer = self.parser.items
+        modules_dict: Dict[DefItem, str] = {}
+        removed: Set[DefItem] = set()
+        for def_item in items.def_items:
+            if self._get_module_name(def_item, modules_dict) in modules_set:
+                removed.add(def_item)
+            elif self._get_owner_name(def_item) in modules_set:
+                removed.add(def_item)
+        for def_item in items.def_items:
+            parent = def_item.parent
+            while parent is not None:
+                if parent in removed:
+                    removed.add(def_item)
+                    break
+                parent = parent.parent
+
+        # implicit constructors added by calls from removed modules
+        used_items = set()
+        for user_item, uses_list in items.use_dict.items():
+            if user_item not in removed:
+                used_items.update(uses_list)
+        for def_item in items.def_items:
+            if def_item in removed or def_item in used_items:
+                continue
+            parent = def_item.parent
+            if isinstance(parent, ClassItem) and not parent.explicit_ctor and def_item.name == "__init__":
+                removed.add(def_item)
+
+        _LOGGER.info("removing %s items of modules: %s", len(removed), sorted(modules_set))
+        items.remove_defs(removed)
+        for module_name in modules_set:
+            self._imports.pop(module_name, None)
+
+    def _reanalyze(self, files_dict: Dict[str, str]):
+        # analyze in order of original files, new files at the end
+        items = self.parser.items
+        module_names = [name for name in items.mod_dict if name in files_dict]
+        module_names += [name for name in files_dict if name not in items.mod_dict]
+
+        # trees of dependent modules can refer to outdated nodes
+        for module_name in module_names:
+            astroid.MANAGER.astroid_cache.pop(module_name, None)
+        astroid.MANAGER._mod_file_cache.clear()  # pylint: disable=W0212
+        astroid_context._invalidate_cache()  # pylint: disable=W0212
+        clear_inference_tip_cache()
+        INFERENCE_CACHE.clear()
+
+        files_list = [files_dict[name] for name in module_names]
+        add_search_paths(files_list)
+        astroid_tree_list = []
+        for file_path in files_list:
+            astroid_tree: astroid_nodes.Module = astroid.MANAGER.ast_from_file(file_path)
+            items.set_mod(astroid_tree)
+            astroid_tree_list.append(astroid_tree)
+
+        self.parser.analyze_defs(astroid_tree_list)
+        self.parser.analyze_uses(astroid_tree_list)
+
+    def _get_module_name(self, def_item: DefItem, modules_dict: Dict[DefItem, str]) -> str:
+        module_name = modules_dict.get(def_item)
+        if module_name is not None:
+            return module_name
+        if def_item.parent is None:
+            module_node = self.parser.items.astroid_node_dict.get(def_item.node_id)
+            module_name = module_node.name if module_node is not None else def_item.name
+        else:
+            module_name = self._get_module_name(def_item.parent, modules_dict)
+        modules_dict[def_item] = module_name
+        return module_name
+
+    # returns name of module declaring member (by assignment), None for items of definitions
+    def _get_owner_name(self, def_item: DefItem) -> Optional[str]:
+        if not def_item.is_field():
+            return None
+        astroid_node = self.parser.items.astroid_node_dict.get(def_item.node_id)
+        if astroid_node is None:
+            return None
+        return astroid_node.root().name
@@ -0,0 +1,444 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import gc
+import sys
+import signal
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+import astypes
+
+import astroid
+import astroid.context as astroid_context
+import astroid.inference as astroid_inference
+from astroid.builder import AstroidBuilder
+from astroid.manager import AstroidManager
+from astroid.inference_tip import clear_inference_tip_cache
+from astroid.transforms import TransformVisitor
+from astroid.interpreter.objectmodel import ObjectModel
+import astroid.nodes.scoped_nodes.scoped_nodes as astroid_nodes
+import astroid.bases as astroid_bases
+import astroid.objects as astroid_objects
+from astroid.nodes import NodeNG
+from astroid.nodes.node_classes import LookupMixIn
+
+from astgraph.modpath import get_import_name
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+DEFAULT_INFERENCE_CACHE_SIZE = 100000  # number of entries
+
+REPEAT_INTERVAL = 0.1  # minimal interval of repeated inference timeout in seconds
+
+# code of functions building astroid modules - inference timeout is deferred until build is finished
+BUILD_CODES = {AstroidBuilder.file_build.__code__, AstroidBuilder.string_build.__code__}
+
+# functions building astroid modules - limit of inferred values is not applied while module is built
+BUILD_FUNCS = {name: getattr(AstroidBuilder, name) for name in ("file_build", "string_build", "module_build")}
+
+DEFAULT_MAX_INFERRED = astroid_context.InferenceContext.max_inferred
+
+
+# ============================================
+
+
+# raised by timer when inference of node takes too long
+#
+# Derives from BaseException, so it is not swallowed by generic handlers inside astroid.
+class InferenceTimeout(BaseException):
+    pass
+
+
+# limits of inference of single node
+#
+# 'timeout' - maximum time of inference of single node in milliseconds (including loading of
+#             imported modules), enforced by SIGALRM timer, so it is available only in main thread
+#             on systems supporting 'signal.setitimer'
+# 'max_inferred' - maximum number of values inferred by astroid in single inference (astroid's
+#                  'InferenceContext.max_inferred'), astroid returns uninferable value when exceeded,
+#                  limit is not applied while astroid builds modules
+# Node exceeding the budget (or astroid recursion limit) is treated as unresolved.
+class InferenceBudget:
+    def __init__(self):
+        self.timeout: int = None
+        self.max_inferred: int = None
+        self.exceeded = 0
+        self._active = False
+        self._prev_unraisable_hook = None
+
+    def configure(self, timeout: int = None, max_inferred: int = None):
+        self.timeout = timeout
+        if hasattr(sys, "unraisablehook"):
+            # timeout raised in generators closed by garbage collector is reported as unraisable
+            if timeout and self._prev_unraisable_hook is None:
+                self._prev_unraisable_hook = sys.unraisablehook
+                sys.unraisablehook = self._on_unraisable
+            elif not timeout and self._prev_unraisable_hook is not None:
+                sys.unraisablehook = self._prev_unraisable_hook
+                self._prev_unraisable_hook = None
+        self.max_inferred = max_inferred
+        # limit is applied only while budgeted node is inferred
+        # brain transforms of astroid do not handle uninferable values returned when limit is exceeded
+        for func_name, build_func in BUILD_FUNCS.items():
+            if max_inferred:
+                setattr(AstroidBuilder, func_name, _unlimited_build(build_func))
+            else:
+                setattr(AstroidBuilder, func_name, build_func)
+
+    def get_config(self):
+        return (self.timeout, self.max_inferred)
+
+    def get_stats(self):
+        return {"exceeded": self.exceeded}
+
+    # returns result of 'infer_func' or None if budget exceeded
+    def run(self, infer_func, astroid_node: NodeNG):
+        use_timer = self.timeout and self._is_timer_available()
+        if self._active or (not use_timer and not self.max_inferred):
+            # nested call runs within budget of outer call
+            try:
+                return infer_func(astroid_node)
+            except RecursionError:
+                self._on_exceeded(astroid_node, "recursion limit")
+                return None
+
+        self._active = True
+        if use_timer:
+            prev_handler = signal.signal(signal.SIGALRM, self._on_timer)
+            # repeated - exception raised in generator being closed is ignored by interpreter
+            timeout = self.timeout / 1000.0
+            signal.setitimer(signal.ITIMER_REAL, timeout, max(timeout, REPEAT_INTERVAL))
+        if self.max_inferred:
+            astroid_context.InferenceContext.max_inferred = self.max_inferred
+        try:
+            try:
+                return infer_func(astroid_node)
+            finally:
+                self._active = False
+        except InferenceTimeout:
+            reason = f"timeout {self.timeout}ms"
+        except RecursionError:
+            reason = "recursion limit"
+        except TypeError:
+            if not self.max_inferred:
+                raise
+            # code of astroid's brain expects iterable values where uninferable value is returned
+            reason = f"max inferred {self.max_inferred}"
+        finally:
+            self._active = False
+            astroid_context.InferenceContext.max_inferred = DEFAULT_MAX_INFERRED
+            if use_timer:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, prev_handler)
+        self._on_exceeded(astroid_node, reason)
+        return None
+
+    def _on_timer(self, _signum, frame):
+        if not self._active:
+            return
+        while frame is not None:
+            if frame.f_code in BUILD_CODES:
+                # interrupted build would be repeated by every following inference - wait for next timer
+                return
+            frame = frame.f_back
+        raise InferenceTimeout()
+
+    def _on_unraisable(self, unraisable):
+        if isinstance(unraisable.exc_value, InferenceTimeout):
+            return
+        self._prev_unraisable_hook(unraisable)
+
+    def _on_exceeded(self, astroid_node: NodeNG, reason: str):
+        self.exceeded += 1
+        module_node = astroid_node.root()
+        _LOGGER.warning(
+            "inference budget exceeded (%s), node unresolved: %s(%s)",
+            reason,
+            getattr(module_node, "file", None),
+            astroid_node.lineno,
+        )
+
+    def _is_timer_available(self):
+        if not hasattr(signal, "setitimer"):
+            return False
+        return threading.current_thread() is threading.main_thread()
+
+
+# wraps function building astroid module, so module is built with default limit of inferred values
+def _unlimited_build(build_func):
+    def build_module(*args, **kwargs):
+        max_inferred = astroid_context.InferenceContext.max_inferred
+        astroid_context.InferenceContext.max_inferred = DEFAULT_MAX_INFERRED
+        try:
+            return build_func(*args, **kwargs)
+        finally:
+            astroid_context.InferenceContext.max_inferred = max_inferred
+
+    return build_module
+
+
+INFERENCE_BUDGET = InferenceBudget()
+
+
+# ============================================
+
+
+# limits inference to modules of analyzed files
+#
+# When enabled, modules outside of analyzed files (standard library and third-party packages) are
+# opaque: astroid does not load them, so inference does not descend into them and names imported
+# from them are unresolved. Packages containing analyzed modules are loaded (their '__init__' is
+# required to import the modules). Module 'builtins' is always available.
+#
+# Boundary replaces 'ast_from_module_name' of astroid's manager, astroid shares state of all
+# instances of manager, so replacement applies to every instance.
+class ProjectBoundary:
+    def __init__(self):
+        self.modules: Set[str] = set()  # names of project modules and their packages
+        self._stubs: Dict[str, astroid_nodes.Module] = {}  # empty modules returned instead of external modules
+        self._files: List[str] = []
+        self._enabled = False
+
+    # 'files_list' - analyzed files, None disables boundary
+    def configure(self, files_list=None):
+        self.modules.clear()
+        self._stubs.clear()
+        self._files = []
+        manager = astroid.MANAGER
+        if files_list is None:
+            if self._enabled:
+                del manager.ast_from_module_name
+                self._enabled = False
+            return
+        self.add_files(files_list)
+        if not self._enabled:
+            manager.ast_from_module_name = self._ast_from_module_name
+            self._enabled = True
+
+    # extend boundary by given files (e.g. new files found in watch mode)
+    def add_files(self, files_list):
+        for file_path in files_list:
+            self._files.append(file_path)
+            name_parts = get_import_name(file_path).split(".")
+            for index in range(1, len(name_parts) + 1):
+                self.modules.add(".".join(name_parts[:index]))
+
+    def get_config(self):
+        if not self._enabled:
+            return (None,)
+        return (list(self._files),)
+
+    def is_enabled(self) -> bool:
+        return self._enabled
+
+    def is_external(self, module_name: str) -> bool:
+        if not self._enabled or module_name == "builtins":
+            return False
+        return module_name not in self.modules
+
+    def get_stats(self):
+        return {"external": len(self._stubs)}
+
+    def _ast_from_module_name(self, modname, context_file=None):
+        if not self.is_external(modname):
+            return AstroidManager.ast_from_module_name(astroid.MANAGER, modname, context_file)
+        stub_module = self._stubs.get(modname)
+        if stub_module is None:
+            _LOGGER.debug("module outside of project, not loaded: %s", modname)
+            stub_module = AstroidBuilder(astroid.MANAGER).string_build("", modname)
+            # stub is not cached by astroid, so it does not replace module when boundary is disabled
+            if astroid.MANAGER.astroid_cache.get(modname) is stub_module:
+                del astroid.MANAGER.astroid_cache[modname]
+            self._stubs[modname] = stub_module
+        return stub_module
+
+
+PROJECT_BOUNDARY = ProjectBoundary()
+
+
+# ============================================
+
+
+# memoization of inference results shared by all parsers
+#
+# Results (also negative ones) are stored per node, least recently used entries are removed
+# when size limit is exceeded. Entries keep reference to their nodes, so ids of nodes are not
+# reused while entry exists. Cache has to be cleared when astroid trees are reloaded.
+class InferenceCache:
+    def __init__(self, max_size: int = DEFAULT_INFERENCE_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # 'kind' - name of inference function
+    def get(self, kind: str, astroid_node: NodeNG, infer_func):
+        key = (kind, id(astroid_node))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        result = INFERENCE_BUDGET.run(infer_func, astroid_node)
+        self._entries[key] = (astroid_node, result)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
+
+
+INFERENCE_CACHE = InferenceCache()
+
+
+# memoized functions of astroid keeping references to nodes of all loaded trees
+ASTROID_MEMOIZED = [(LookupMixIn, "lookup"), (ObjectModel, "attributes"), (TransformVisitor, "_transform")]
+
+
+# release results of inference held by caches of astroid and by 'INFERENCE_CACHE', loaded modules are kept
+def clear_inference_caches():
+    INFERENCE_CACHE.clear()
+    _reset_object_models()
+    astroid_context._invalidate_cache()  # pylint: disable=W0212
+    clear_inference_tip_cache()
+    for owner_class, func_name in ASTROID_MEMOIZED:
+        cached_func = getattr(owner_class, func_name, None)
+        if hasattr(cached_func, "cache_clear"):
+            cached_func.cache_clear()
+    # results of inference of functions are stored in default argument of astroid's decorator
+    cached_generator = getattr(getattr(astroid_inference, "_cached_generator", None), "__wrapped__", None)
+    for default_value in getattr(cached_generator, "__defaults__", None) or ():
+        if isinstance(default_value, dict):
+            default_value.clear()
+    # nodes of literals are proxies of builtin classes, so results memoized by astroid's 'cached' decorator
+    # are stored in builtin classes (shared by all analyses)
+    builtins_node = astroid.MANAGER.astroid_cache.get("builtins")
+    if builtins_node is not None:
+        for child_node in builtins_node.body:
+            if isinstance(child_node, astroid_nodes.ClassDef):
+                vars(child_node).pop("__cache", None)
+
+
+# release astroid trees and inference results held by caches of astroid and by 'INFERENCE_CACHE'
+#
+# Trees are loaded again by next analysis, nodes referenced outside of caches are not released.
+def clear_astroid_caches():
+    clear_inference_caches()
+    astroid.MANAGER.astroid_cache.clear()
+    # failed lookups of modules are stored with exceptions referencing frames of inference
+    getattr(astroid.MANAGER, "_mod_file_cache", {}).clear()
+    # trees are released before 'builtins' module is built again, so memory is reused
+    gc.collect()
+    astroid.MANAGER.clear_cache()
+    gc.collect()
+
+
+# object models are shared by all nodes (and proxies) of class and keep last accessed node and inference context
+def _reset_object_models():
+    for astroid_module in (astroid_nodes, astroid_bases, astroid_objects):
+        for module_value in list(vars(astroid_module).values()):
+            if not isinstance(module_value, type):
+                continue
+            object_model = vars(module_value).get("special_attributes")
+            # lazily created models are wrapped by proxy, models not created yet are skipped
+            if not getattr(object_model, "__resolved__", True):
+                continue
+            object_model = getattr(object_model, "__wrapped__", object_model)
+            if isinstance(object_model, ObjectModel):
+                object_model.__init__()
+
+
+def get_type(astroid_node: NodeNG) -> str:
+    return INFERENCE_CACHE.get("type", astroid_node, _get_type)
+
+
+def infer_node(astroid_node: NodeNG):
+    return INFERENCE_CACHE.get("node", astroid_node, _infer_node)
+
+
+def infer_type(astroid_node: NodeNG) -> Optional[NodeNG]:
+    return INFERENCE_CACHE.get("infer_type", astroid_node, _infer_type)
+
+
+def _get_type(astroid_node: NodeNG) -> str:
+    node_astype = astypes.get_type(astroid_node)
+    if not node_astype:
+        return None
+    return node_astype.annotation
+
+
+def _infer_node(astroid_node: NodeNG):
+    try:
+        return next(astroid_node.infer())
+    except astroid.exceptions.InferenceError:
+        # no inference succeed
+        return None
+
+
+def _infer_type(astroid_node: NodeNG) -> Optional[NodeNG]:
+    try:
+        inferred = next(astroid_node.infer())
+        if not inferred:
+            return None
+        # if isinstance(inferred, BoundMethod):
+        #     caller = astroid_node.expr
+        #     inferred_result = inferred.infer_call_result(caller)
+        #     inferred_value = next(inferred_result)
+        #     return unpack_proxy(inferred_value)
+        if isinstance(inferred, astroid_bases.Proxy):
+            return unpack_proxy(inferred)
+        if isinstance(inferred, NodeNG):
+            return inferred
+        raise RuntimeError(f"unhandled type: {type(inferred)}")
+    except astroid.exceptions.InferenceError as exc:
+        # no inference succeed
+        # message is passed instead of exception - records kept by log handlers would keep trees alive
+        _LOGGER.warning("unable to infer: %s", str(exc))
+        return None
+
+
+# returns class of method if given name is it's first argument ('self' or 'cls'), otherwise None
+def get_self_class(name_node: NodeNG) -> Optional[astroid_nodes.ClassDef]:
+    scope_node = name_node.scope()
+    if not isinstance(scope_node, astroid_nodes.FunctionDef):
+        return None
+    class_node = scope_node.parent
+    if not isinstance(class_node, astroid_nodes.ClassDef):
+        return None
+    if scope_node.type not in ("method", "classmethod"):
+        return None
+    args_list = scope_node.args.args
+    if not args_list or args_list[0].name != name_node.name:
+        return None
+    if len(scope_node.locals.get(name_node.name, [])) != 1:
+        # argument reassigned in method
+        return None
+    return class_node
+
+
+def unpack_proxy(inferred):
+    while inferred:
+        if isinstance(inferred, astroid_bases.Proxy):
+            inferred = inferred._proxied  # pylint: disable=W0212
+            continue
+        if isinstance(inferred, NodeNG):
+            return inferred
+        raise RuntimeError(f"unhandled type: {type(inferred)}")
+    return None
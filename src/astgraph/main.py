@@ -10,15 +10,28 @@
 
 import sys
 import os
+import time
 import logging
 import argparse
+import itertools
 
-from glob import glob
 import re
 import pprint
 
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
 from astgraph.objtodict import obj_to_dict
 from astgraph.treeparser import TreeParser, DefItem
+from astgraph.cache import AnalysisCache
+from astgraph.importgraph import prune_files
+from astgraph.discovery import DEFAULT_EXCLUDES, iter_files
+from astgraph.prefetch import SourcePrefetcher
+from astgraph.modpath import clear_package_roots
+from astgraph.inference import INFERENCE_BUDGET, PROJECT_BOUNDARY, clear_astroid_caches
 from astgraph.pyanwrap import draw_use_graph, draw_full_graph
 from astgraph.plantuml import draw_graph as draw_plantuml_graph
 from astgraph.graphtheory import filter_down, Filter, join_graph, filter_up
@@ -29,37 +42,273 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _LOGGER = logging.getLogger(__name__)
 
 
-def process_files(files_list, filters, output_dict, show_defs=False, debug_dump=False):
+WATCH_INTERVAL = 1.0  # in seconds
+
+
+def process_files(files_list, filters, output_dict, show_defs=False, debug_dump=False, parser_options=None):
     data_dump_path = None
     if debug_dump:
         out_svg_file_path = output_dict["outsvgfile"]
         data_dump_path = f"{out_svg_file_path}.analyze.txt"
 
-    analyze_data = analyze_files(files_list, filters, data_dump_path)
+    analyzer = parse_files(files_list, parser_options, filters)
+    if data_dump_path:
+        dump_items(analyzer.items, data_dump_path)
 
+    filtered_defs, filtered_uses = filter_graph(analyzer.items, filters)
+    title = get_graph_title(analyzer.items)
     if not show_defs:
-        filtered_uses = analyze_data[1]
-        draw_use_graph(filtered_uses, output_dict)
-        draw_plantuml_graph(filtered_uses, output_dict)
+        draw_use_graph(filtered_uses, output_dict, title)
+        draw_plantuml_graph(filtered_uses, output_dict, title)
+    else:
+        draw_full_graph(filtered_defs, filtered_uses, output_dict, title)
+        draw_plantuml_graph(filtered_uses, output_dict, title)
+    log_peak_memory("rendering")
+
+
+# analyze files and regenerate outputs after every change of files (until interrupted)
+# outputs are written only if their graph changed
+# 'find_options' - arguments of 'astgraph.discovery.iter_files()'
+def watch_files(search_dir, files_list, filters, output_dict, show_defs=False, parser_options=None, find_options=None):
+    if parser_options is None:
+        parser_options = {}
+
+    files_state = get_files_state(search_dir, files_list, find_options)
+    analyzer = parse_files(list(files_state.keys()), parser_options, filters)
+    signatures = draw_changed(analyzer.items, filters, output_dict, show_defs, {})
+    full_analysis = False
+
+    _LOGGER.info("watching for changes")
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            new_state = get_files_state(search_dir, files_list, find_options)
+            changed_list = [file_path for file_path, mtime in new_state.items() if files_state.get(file_path) != mtime]
+            removed_list = [file_path for file_path in files_state if file_path not in new_state]
+            if not changed_list and not removed_list:
+                continue
+            files_state = new_state
+            _LOGGER.info("changed files: %s removed files: %s", changed_list, removed_list)
+
+            try:
+                # cache restores unchanged modules without astroid, deadline applies to whole analysis,
+                # fast engine does not keep astroid trees required by incremental updates
+                # released trees can not be updated
+                reparse_options = ("cachedir", "pruneimports", "demand", "deadline", "releasetrees")
+                reparse = any(parser_options.get(name) for name in reparse_options)
+                if full_analysis or reparse or parser_options.get("engine") == "fast":
+                    analyzer = reparse_files(list(files_state.keys()), parser_options, filters)
+                    full_analysis = False
+                else:
+                    # packages could be added or removed
+                    clear_package_roots()
+                    if PROJECT_BOUNDARY.is_enabled():
+                        PROJECT_BOUNDARY.add_files(changed_list)
+                    for file_path in removed_list:
+                        analyzer.remove_file(file_path)
+                    for file_path in changed_list:
+                        analyzer.update_file(file_path)
+                signatures = draw_changed(analyzer.items, filters, output_dict, show_defs, signatures)
+            except Exception:  # pylint: disable=W0703
+                # e.g. syntax error in edited file
+                _LOGGER.exception("unable to analyze changes")
+                full_analysis = True
+    except KeyboardInterrupt:
+        _LOGGER.info("watching stopped")
+
+
+# draw outputs which graph differs from given signatures, returns new signatures
+def draw_changed(items, filters, output_dict, show_defs, prev_signatures):
+    filtered_defs, filtered_uses = filter_graph(items, filters)
+    title = get_graph_title(items)
+    uses_signature = (title, get_uses_signature(filtered_uses))
+    signatures = {"pyan": uses_signature, "plantuml": uses_signature}
+    if show_defs:
+        signatures["pyan"] = (get_defs_signature(filtered_defs), uses_signature)
+
+    if signatures["pyan"] != prev_signatures.get("pyan"):
+        if not show_defs:
+            draw_use_graph(filtered_uses, output_dict, title)
+        else:
+            draw_full_graph(filtered_defs, filtered_uses, output_dict, title)
     else:
-        filtered_defs = analyze_data[0]
-        filtered_uses = analyze_data[1]
-        draw_full_graph(filtered_defs, filtered_uses, output_dict)
-        draw_plantuml_graph(filtered_uses, output_dict)
+        _LOGGER.info("use graph not changed")
 
+    if signatures["plantuml"] != prev_signatures.get("plantuml"):
+        draw_plantuml_graph(filtered_uses, output_dict, title)
+    else:
+        _LOGGER.info("sequence graph not changed")
+    return signatures
 
-def analyze_files(files_list, filters, data_dump_path=None):
-    if filters is None:
-        filters = {}
 
-    analyzer = TreeParser()
-    analyzer.analyze_files(files_list)
+# returns title annotating graph or None
+def get_graph_title(items):
+    titles_list = []
+    if items.approximate:
+        titles_list.append("approximate graph: analyzed by fast engine")
+    if items.partial:
+        titles_list.append("partial graph: analysis stopped by deadline")
+    if not titles_list:
+        return None
+    return ", ".join(titles_list)
+
+
+def get_uses_signature(use_dict):
+    ret_list = []
+    for user_item, uses_list in use_dict.items():
+        uses_names = tuple(get_item_signature(use_item) for use_item in uses_list)
+        ret_list.append((get_item_signature(user_item), uses_names))
+    return tuple(ret_list)
+
+
+def get_defs_signature(defs_list):
+    return tuple(sorted(get_item_signature(def_item) for def_item in defs_list))
+
+
+def get_item_signature(def_item: DefItem):
+    return (def_item.get_full_name(), def_item.type.value, def_item.get_filename())
+
+
+# returns modification times of files
+def get_files_state(search_dir, files_list, find_options=None):
+    if find_options is None:
+        find_options = {}
+    files_state = {}
+    for file_path in itertools.chain(iter_files(search_dir, **find_options), files_list):
+        try:
+            files_state[file_path] = os.stat(file_path).st_mtime_ns
+        except OSError:
+            # file removed
+            continue
+    return files_state
+
+
+def analyze_files(files_list, filters, data_dump_path=None, parser_options=None):
+    analyzer = parse_files(files_list, parser_options, filters)
     items = analyzer.items
 
     if data_dump_path:
-        graph_dict = obj_to_dict(items, skip_meta_data=False)
-        with open(data_dump_path, "w", encoding="utf-8") as out_file:
-            pprint.pprint(graph_dict, out_file, indent=4, sort_dicts=False)
+        dump_items(items, data_dump_path)
+
+    return filter_graph(items, filters)
+
+
+def dump_items(items, data_dump_path):
+    graph_dict = obj_to_dict(items, skip_meta_data=False)
+    with open(data_dump_path, "w", encoding="utf-8") as out_file:
+        pprint.pprint(graph_dict, out_file, indent=4, sort_dicts=False)
+
+
+# returns peak resident set size of process in MB or None if unknown
+def get_peak_memory():
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # in bytes
+        return max_rss / (1024 * 1024)
+    # in kilobytes
+    return max_rss / 1024
+
+
+def log_peak_memory(stage):
+    peak_memory = get_peak_memory()
+    if peak_memory is not None:
+        _LOGGER.info("peak memory usage after %s: %.1f MB", stage, peak_memory)
+
+
+# options requiring whole list of files before analysis, otherwise files are loaded as they are found
+LIST_OPTIONS = ("pruneimports", "noexternal", "demand", "cachedir")
+
+
+# 'files_list' - list or iterator of files (e.g. 'astgraph.discovery.iter_files()')
+# 'filters' - used to prune files if enabled in 'parser_options'
+# 'releasetrees' option releases astroid trees after analysis (results can not be updated incrementally)
+def parse_files(files_list, parser_options=None, filters=None) -> TreeParser:
+    if parser_options is None:
+        parser_options = {}
+    analyzer = _parse_files(files_list, parser_options, filters)
+    log_peak_memory("analysis")
+    if parser_options.get("releasetrees"):
+        analyzer.release_trees()
+    return analyzer
+
+
+# analyze again files which could change since previous analysis
+# astroid returns cached trees of loaded modules, so trees and inference results of previous analysis are dropped
+def reparse_files(files_list, parser_options=None, filters=None) -> TreeParser:
+    clear_astroid_caches()
+    return parse_files(files_list, parser_options, filters)
+
+
+def _parse_files(files_list, parser_options, filters) -> TreeParser:
+    if filters is None:
+        filters = {}
+
+    clear_package_roots()
+    if any(parser_options.get(name) for name in LIST_OPTIONS) or parser_options.get("engine") == "fast":
+        files_list = list(files_list)
+
+    # deadline counts whole analysis including pruning and loading of files
+    deadline = None
+    if parser_options.get("deadline") is not None:
+        deadline = time.time() + parser_options["deadline"]
+
+    if parser_options.get("pruneimports"):
+        filter_down_obj = None
+        filter_up_obj = None
+        if filters.get("filterdown"):
+            filter_down_obj = Filter([re.compile(item) for item in filters["filterdown"]])
+        if filters.get("filterup"):
+            filter_up_obj = Filter([re.compile(item) for item in filters["filterup"]])
+        files_list = prune_files(files_list, filter_down_obj, filter_up_obj)
+
+    INFERENCE_BUDGET.configure(parser_options.get("infertimeout"), parser_options.get("infermax"))
+    PROJECT_BOUNDARY.configure(files_list if parser_options.get("noexternal") else None)
+
+    analyzer = TreeParser()
+    analyzer.items.deadline = deadline
+    if parser_options.get("prefetch"):
+        analyzer.prefetcher = SourcePrefetcher(parser_options["prefetch"])
+    if parser_options.get("engine") == "fast":
+        for name in ("demand", "cachedir"):
+            if parser_options.get(name):
+                _LOGGER.warning("fast engine does not support '%s', option ignored", name)
+        if parser_options.get("jobs", 1) > 1:
+            _LOGGER.warning("fast engine does not support 'jobs', option ignored")
+        analyzer.analyze_fast(files_list)
+        analyzer.items.deadline = None
+        return analyzer
+
+    if parser_options.get("demand"):
+        if filters.get("filterup"):
+            # callers of items can be found only by analyzing all items
+            _LOGGER.warning("demand-driven analysis does not support 'filterup', analyzing all items")
+        else:
+            filter_obj = None
+            if filters.get("filterdown"):
+                filter_obj = DefItemFilter([re.compile(item) for item in filters["filterdown"]])
+            analyzer.analyze_reachable(files_list, filter_obj)
+            analyzer.items.deadline = None
+            return analyzer
+
+    cache = None
+    cache_dir = parser_options.get("cachedir")
+    if cache_dir:
+        if parser_options.get("jobs", 1) > 1:
+            _LOGGER.warning("analysis cache does not support 'jobs', option ignored")
+        cache_size = parser_options.get("cachesize", 256)
+        cache = AnalysisCache(cache_dir, cache_size * 1024 * 1024)
+
+    analyzer.analyze_files(files_list, jobs=parser_options.get("jobs", 1), cache=cache)
+    # deadline does not apply to incremental updates of results
+    analyzer.items.deadline = None
+    return analyzer
+
+
+def filter_graph(items, filters):
+    if filters is None:
+        filters = {}
 
     filter_down_list = filters.get("filterdown", [])
     filter_up_list = filters.get("filterup", [])
@@ -121,17 +370,34 @@ class DefItemFilter(Filter):
 
 
 # ext - with dot if needed
-def find_files(search_dir, ext):
-    ret_list = []
-    for filename in glob(f"{search_dir}/**/*{ext}", recursive=True):
-        ret_list.append(filename)
-    return ret_list
+# see 'astgraph.discovery.iter_files()' for description of other arguments
+def find_files(search_dir, ext, exclude=None, gitignore=True):
+    return list(iter_files(search_dir, [f"*{ext}"], exclude, gitignore))
 
 
 def main():
     parser = argparse.ArgumentParser(description="Thread graph generator")
     parser.add_argument("-f", "--files", nargs="+", default=[], help="Files to analyze")
     parser.add_argument("-d", "--dir", action="store", help="Path to directory to search .py files")
+    parser.add_argument(
+        "--include",
+        metavar="PATTERN",
+        nargs="+",
+        default=["*.py"],
+        help="Glob patterns of files found in 'dir' to analyze, matched against name and path relative to 'dir'"
+        " (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--exclude",
+        metavar="PATTERN",
+        nargs="+",
+        default=DEFAULT_EXCLUDES,
+        help="Glob patterns of files and directories in 'dir' to skip, matched against name and path relative"
+        " to 'dir' (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--nogitignore", action="store_true", help="Do not skip files ignored by '.gitignore' files found in 'dir'"
+    )
     parser.add_argument(
         "--filterdown",
         metavar="N",
@@ -151,6 +417,85 @@ def main():
     parser.add_argument(
         "--showdefs", action="store_true", help="Show defs relation on use graph (fixes dot 'init_rank' error)"
     )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, help="Number of processes used to analyze files (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--cachedir",
+        action="store",
+        required=False,
+        help="Path to directory storing analysis results between runs (files are analyzed in single process,"
+        " 'jobs' is ignored)",
+    )
+    parser.add_argument(
+        "--cachesize",
+        type=int,
+        default=256,
+        help="Maximum size of cache directory in MB, least recently used entries are removed (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--pruneimports",
+        action="store_true",
+        help="Analyze only modules connected by imports with modules of items matched by filters",
+    )
+    parser.add_argument(
+        "--demand",
+        action="store_true",
+        help="Analyze uses only of items reachable from items matched by 'filterdown'"
+        " (or from entry modules if no filter given)",
+    )
+    parser.add_argument(
+        "--infertimeout",
+        type=int,
+        default=None,
+        help="Maximum time of inference of single node in milliseconds (including loading of imported modules),"
+        " node is treated as unresolved when exceeded (default: no limit)",
+    )
+    parser.add_argument(
+        "--infermax",
+        type=int,
+        default=None,
+        help="Maximum number of values inferred by astroid for single node (default: astroid's limit)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Maximum time of whole analysis in seconds, when exceeded remaining modules and function bodies"
+        " are skipped and partial graph is generated (default: no limit)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["astroid", "fast"],
+        default="astroid",
+        help="Analysis engine: 'astroid' analyzes whole code with astroid, 'fast' parses code with standard 'ast'"
+        " module and uses astroid only to infer unresolved chains of attributes (graph differs from 'astroid':"
+        " annotated types are trusted, so more uses are found, uses requiring evaluation of expressions, e.g."
+        " 'type(self).new()', can be missed, graph is titled as approximate) (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--noexternal",
+        action="store_true",
+        help="Do not load modules outside of analyzed files (standard library and third-party packages),"
+        " names imported from them are unresolved (faster, but types declared using e.g. 'typing' are lost)",
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=0,
+        help="Number of threads reading files in background while previous files are analyzed (useful on slow"
+        " filesystems), time of reading hidden by analysis is logged (default: %(default)s - disabled)",
+    )
+    parser.add_argument(
+        "--releasetrees",
+        action="store_true",
+        help="Release astroid trees and caches after analysis, before rendering outputs (reduces memory usage)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running, analyze changed files and regenerate outputs which graph changed",
+    )
     parser.add_argument("--outsvgfile", action="store", required=True, help="Path to output SVG file")
     parser.add_argument("--outdotfile", action="store", required=False, help="Path to output DOT file")
     parser.add_argument("--outhtmlfile", action="store", required=False, help="Path to output HTML file")
@@ -173,11 +518,11 @@ def main():
 
     filters = {"filterdown": args.filterdown, "filterup": args.filterup}
 
-    files_list = find_files(args.dir, ".py")
-    if args.files:
-        files_list.extend(args.files)
+    find_options = {"include": args.include, "exclude": args.exclude, "gitignore": not args.nogitignore}
+    # files are analyzed as they are found
+    files_iter = itertools.chain(iter_files(args.dir, **find_options), args.files)
 
-    _LOGGER.info("parsing files: %s", files_list)
+    _LOGGER.info("parsing files from directory: %s and files: %s", args.dir, args.files)
 
     output_dict = {
         "outdotfile": args.outdotfile,
@@ -186,7 +531,24 @@ def main():
         "outseqdiag": args.outseqdiag,
         "outseqsvg": args.outseqsvg,
     }
-    process_files(files_list, filters, output_dict, args.showdefs, args.dumpdebugdata)
+    parser_options = {
+        "jobs": args.jobs,
+        "cachedir": args.cachedir,
+        "cachesize": args.cachesize,
+        "pruneimports": args.pruneimports,
+        "demand": args.demand,
+        "infertimeout": args.infertimeout,
+        "infermax": args.infermax,
+        "deadline": args.deadline,
+        "engine": args.engine,
+        "noexternal": args.noexternal,
+        "prefetch": args.prefetch,
+        "releasetrees": args.releasetrees,
+    }
+    if args.watch:
+        watch_files(args.dir, args.files, filters, output_dict, args.showdefs, parser_options, find_options)
+    else:
+        process_files(files_iter, filters, output_dict, args.showdefs, args.dumpdebugdata, parser_options)
 
     _LOGGER.info("done")
     return 0
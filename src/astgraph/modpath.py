@@ -0,0 +1,144 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import sys
+import os
+from typing import Dict, Optional
+
+import astroid
+from astroid.builder import AstroidBuilder
+from astroid.modutils import _has_init
+
+from astgraph.prefetch import decode_source
+
+
+def add_search_paths(files_list):
+    root_paths = set()
+    for src_file_path in files_list:
+        pkg_root = get_package_root(src_file_path)
+        root_paths.add(pkg_root)
+    for pkg_root in root_paths:
+        if pkg_root in sys.path:
+            continue
+        # fixes importing packages from Import and ImportFrom node
+        sys.path.append(pkg_root)
+
+
+# returns astroid module of given file
+#
+# Astroid does not find modules of packages ('__init__.py') in it's cache by file path, so they would be
+# built again while other modules refer to previously loaded instance.
+# 'content' - content of file already read (see 'astgraph.prefetch'), file is read if None
+def load_module(file_path, content: bytes = None):
+    module_name = get_import_name(file_path)
+    astroid_cache = astroid.MANAGER.astroid_cache
+    if module_name in astroid_cache:
+        cached_module = astroid_cache[module_name]
+        if cached_module.file and os.path.abspath(cached_module.file) == os.path.abspath(file_path):
+            return cached_module
+    if content is not None:
+        astroid_tree = build_module(file_path, content)
+        if astroid_tree is not None:
+            return astroid_tree
+    return astroid.MANAGER.ast_from_file(file_path, modname=module_name)
+
+
+# build astroid module from content of file the same way as 'ast_from_file()' does
+# module is named by 'get_import_name()' as all modules loaded by 'load_module()'
+# returns None if content can not be decoded (reading file by astroid reports error)
+def build_module(file_path, content: bytes):
+    if os.path.splitext(file_path)[1] != ".py":
+        # astroid finds source file of other files (e.g. compiled)
+        return None
+    try:
+        source, encoding = decode_source(content)
+    except (SyntaxError, LookupError, UnicodeError):
+        return None
+    file_path = os.path.abspath(file_path)
+    module_name = get_import_name(file_path)
+    cached_module = astroid.MANAGER.astroid_cache.get(module_name)
+    if cached_module is not None and cached_module.file == file_path:
+        return cached_module
+    astroid_tree = AstroidBuilder(astroid.MANAGER).string_build(source, module_name, file_path)
+    # content is not kept in memory, it is read from file if needed
+    astroid_tree.file_bytes = None
+    astroid_tree.file_encoding = encoding
+    return astroid_tree
+
+
+def get_modname(file_path):
+    package_root = get_package_root(file_path)
+    file_modname = get_file_modname(file_path)
+    relative_path = os.path.relpath(file_modname, package_root)
+    module_name = relative_path.replace("/", ".")
+    module_name = module_name.replace("\\", ".")
+    return module_name
+
+
+# returns name of module used by imports (name of package for '__init__.py')
+def get_import_name(file_path):
+    module_name = get_modname(file_path)
+    if module_name.endswith(".__init__"):
+        module_name = module_name[: -len(".__init__")]
+    return module_name
+
+
+# package root of directory (None if all parent directories are packages), shared by all files of directory
+PACKAGE_ROOTS: Dict[str, Optional[str]] = {}
+
+
+# has to be called when packages structure could change ('__init__.py' added or removed)
+def clear_package_roots():
+    PACKAGE_ROOTS.clear()
+
+
+def get_package_root(file_path):
+    abs_path = os.path.abspath(file_path)
+    package_root = _get_dir_package_root(os.path.dirname(abs_path))
+    if package_root is None:
+        # no top package found
+        return os.path.dirname(file_path)
+    return package_root
+
+
+def _get_dir_package_root(dir_name):
+    visited_list = []
+    package_root = None
+    while True:
+        if dir_name in PACKAGE_ROOTS:
+            package_root = PACKAGE_ROOTS[dir_name]
+            break
+        visited_list.append(dir_name)
+        if not _has_init(dir_name):
+            package_root = dir_name
+            break
+        parent_dir = os.path.dirname(dir_name)
+        if parent_dir == dir_name:
+            # no __init__.py found in path directories
+            break
+        dir_name = parent_dir
+    for visited_dir in visited_list:
+        PACKAGE_ROOTS[visited_dir] = package_root
+    return package_root
+
+
+# return file path without extension
+def get_file_modname(file_path):
+    dir_name = os.path.dirname(file_path)
+    base_name = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(dir_name, base_name)
+
+
+# returns modification time of file in nanoseconds or None if file is missing
+def get_file_mtime(file_path):
+    if not file_path:
+        return None
+    try:
+        return os.stat(file_path).st_mtime_ns
+    except OSError:
+        return None
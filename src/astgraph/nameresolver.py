@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+from typing import Dict, Optional, Tuple
+
+from astroid.nodes import node_classes, NodeNG
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# marker of missing entry of cache (None is valid value)
+_MISSING = object()
+
+
+# returns names of modules imported by statements of given scope: local name -> imported module name
+def get_import_table(scope_node: NodeNG) -> Dict[str, str]:
+    ret_dict = {}
+    for name, nodes_list in scope_node.locals.items():
+        found_node = nodes_list[0]
+        if isinstance(found_node, node_classes.Import):
+            ret_dict[name] = found_node.names[0][0]
+        elif isinstance(found_node, node_classes.ImportFrom):
+            ret_dict[name] = found_node.modname
+    return ret_dict
+
+
+# resolution of names in scopes of analyzed modules (see 'ItemContainer.find_in_scope()')
+#
+# Results are cached per (scope, name), all scopes passed while looking for name get the same result.
+# Imports of scope are taken from import table computed once per scope. Results depend on set of analyzed
+# modules, so cache has to be cleared when modules are added, replaced or removed.
+class NameResolver:
+    def __init__(self, mod_dict: Dict[str, NodeNG]):
+        self.mod_dict = mod_dict  # analyzed modules (shared with items container)
+        self.names_dict: Dict[Tuple[NodeNG, str], Optional[NodeNG]] = {}
+        self.imports_dict: Dict[NodeNG, Dict[str, str]] = {}  # import tables of scopes
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.names_dict.clear()
+        self.imports_dict.clear()
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.names_dict)}
+
+    # name is type name or variable name
+    def find_in_scope(self, scope_node: NodeNG, name: str) -> Optional[NodeNG]:
+        if scope_node is None:
+            return None
+        found_node = self.names_dict.get((scope_node, name), _MISSING)
+        if found_node is not _MISSING:
+            self.hits += 1
+            return found_node
+        self.misses += 1
+
+        scopes_list = []
+        while scope_node:
+            scopes_list.append(scope_node)
+            found_type_node = scope_node.locals.get(name)
+            if found_type_node:
+                # found node
+                imports_table = self.imports_dict.get(scope_node)
+                if imports_table is None:
+                    imports_table = get_import_table(scope_node)
+                    self.imports_dict[scope_node] = imports_table
+                mod_name = imports_table.get(name)
+                if mod_name is not None:
+                    mod_node = self.mod_dict.get(mod_name)
+                    found_node = self.find_in_scope(mod_node, name)
+                else:
+                    found_node = found_type_node[0]
+                break
+            parent_node = scope_node.parent  # scope returns self
+            if parent_node is None:
+                # no parent scope
+                break
+            scope_node = parent_node.scope()
+        if found_node is _MISSING:
+            # no item found up to module - check other imported modules
+            found_node = self.mod_dict.get(name)
+
+        for item_scope in scopes_list:
+            self.names_dict[(item_scope, name)] = found_node
+        return found_node
@@ -62,7 +62,7 @@ class ObjRepr:
                 ret_dict = {}
             else:
                 ret_dict = {"___type___": type(obj).__name__, "___id___": hex(id(obj))}
-            for key in obj.__slots__:
+            for key in get_slots(obj):
                 if key in self.ignore_fields:
                     ret_dict[key] = "<ignored>"
                     continue
@@ -82,6 +82,17 @@ class ObjRepr:
         return obj
 
 
+# returns names of slots of object including slots of base classes
+def get_slots(obj):
+    ret_list = []
+    for obj_class in reversed(type(obj).__mro__):
+        class_slots = obj_class.__dict__.get("__slots__", ())
+        if isinstance(class_slots, str):
+            class_slots = (class_slots,)
+        ret_list.extend(class_slots)
+    return ret_list
+
+
 def obj_to_dict(obj, skip_meta_data=False, ignore_fields=None):
     repr_obj = ObjRepr()
     return repr_obj.repr_obj(obj, skip_meta_data=skip_meta_data, ignore_fields=ignore_fields)
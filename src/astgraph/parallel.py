@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from astgraph.treeparser import TreeParser, DeclarationParser, UseParser
+from astgraph.summary import ModuleSummary, SummaryRecorder, SummaryApplier
+from astgraph.inference import INFERENCE_BUDGET, PROJECT_BOUNDARY
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# split range of 'items_num' items into 'chunks_num' continuous ranges
+def split_range(items_num, chunks_num):
+    chunks_num = max(1, min(chunks_num, items_num))
+    chunk_size, rest = divmod(items_num, chunks_num)
+    ret_list = []
+    start = 0
+    for index in range(chunks_num):
+        end = start + chunk_size
+        if index < rest:
+            end += 1
+        ret_list.append((start, end))
+        start = end
+    return ret_list
+
+
+# configure worker process same as current process
+def init_worker(budget_config, boundary_config):
+    INFERENCE_BUDGET.configure(*budget_config)
+    PROJECT_BOUNDARY.configure(*boundary_config)
+
+
+# analyze uses of files in given range
+#
+# Executed in worker process. Definitions of all files are analyzed to have complete items container.
+# Members declared in files preceding the range are collected as well, to reproduce state of container
+# seen by sequential analysis.
+# All files are loaded, because astroid adds names of loaded modules to scopes of other modules (e.g.
+# attributes assigned to instances), so results of inference depend on the whole set of files. Cost is
+# small: inference loads imported modules anyway and definitions analysis is cheap compared to uses
+# analysis (worker loading only files of its range was at most ~1.5s and ~12MB cheaper on measured packages).
+# Returns summaries of analyzed files (analysis stops on 'deadline'), counters of resolution of attribute
+# chains of each file (see 'ItemContainer.resolve_stats') and flag if results are partial.
+def analyze_chunk(
+    files_list, chunk_start, chunk_end, deadline=None
+) -> Tuple[List[ModuleSummary], List[Dict[str, int]], bool]:
+    parser = TreeParser()
+    parser.items.deadline = deadline
+    astroid_tree_list = parser.load_files(files_list)
+    parser.analyze_defs(astroid_tree_list)
+
+    items = parser.items
+    for astroid_tree in astroid_tree_list[:chunk_start]:
+        decl_parser = DeclarationParser(items)
+        decl_parser.analyze(astroid_tree)
+
+    recorder = SummaryRecorder(items)
+    items.recorder = recorder
+    summary_list = []
+    stats_list = []
+    for astroid_tree in astroid_tree_list[chunk_start:chunk_end]:
+        if items.is_deadline_exceeded():
+            break
+        _LOGGER.info("=== analyzing astroid usage: %s", astroid_tree.file)
+        recorder.begin(astroid_tree.name)
+        prev_stats = dict(items.resolve_stats)
+        use_parser = UseParser(items)
+        use_parser.analyze(astroid_tree)
+        summary_list.append(recorder.end())
+        stats_list.append({key: value - prev_stats[key] for key, value in items.resolve_stats.items()})
+    items.recorder = None
+    return (summary_list, stats_list, items.partial)
+
+
+# analyze files using multiple processes
+#
+# Workers return summaries of uses analysis. Summaries are applied in order of files,
+# if summary does not match state of container then file is analyzed again in current process.
+# In result content of container is the same as in case of sequential analysis.
+def analyze_parallel(parser: TreeParser, files_list, jobs):
+    files_list = list(files_list)
+    chunks = split_range(len(files_list), jobs)
+    # workers have to use the same inference limits
+    init_args = (INFERENCE_BUDGET.get_config(), PROJECT_BOUNDARY.get_config())
+    with ProcessPoolExecutor(max_workers=len(chunks), initializer=init_worker, initargs=init_args) as executor:
+        futures_list = []
+        for chunk_start, chunk_end in chunks:
+            future = executor.submit(analyze_chunk, files_list, chunk_start, chunk_end, parser.items.deadline)
+            futures_list.append(future)
+
+        # definitions are analyzed in parallel to workers
+        astroid_tree_list = parser.load_files(files_list)
+        parser.analyze_defs(astroid_tree_list)
+
+        applier = SummaryApplier(parser.items)
+        reanalyzed = 0
+        for future, (chunk_start, chunk_end) in zip(futures_list, chunks):
+            summary_list, stats_list, partial = future.result()
+            if partial:
+                parser.items.partial = True
+            for index, astroid_tree in enumerate(astroid_tree_list[chunk_start:chunk_end]):
+                if index >= len(summary_list):
+                    # worker stopped by deadline
+                    parser.analyze_uses([astroid_tree])
+                    continue
+                if applier.apply(summary_list[index]):
+                    for key, value in stats_list[index].items():
+                        parser.items.resolve_stats[key] += value
+                    continue
+                _LOGGER.info("summary of %s does not match, analyzing again", astroid_tree.file)
+                parser.analyze_uses([astroid_tree])
+                reanalyzed += 1
+
+    _LOGGER.info("parallel analysis completed, reanalyzed files: %s/%s", reanalyzed, len(files_list))
@@ -200,6 +200,10 @@ skinparam backgroundColor #FEFEFE
 
 """
 
+        title = self.params_dict.get("title")
+        if title:
+            content += f"title {title}\n\n"
+
         ## add actors
         actors_order: List[ActorData] = calculate_actors_optimized_order(self.seq_diagram)
         if actors_order:
@@ -641,7 +645,8 @@ class Converter:
         return parent
 
 
-def draw_graph(use_dict, output_dict=None):
+# 'title' - optional title of diagram
+def draw_graph(use_dict, output_dict=None, title=None):
     # import pprint
     # pprint.pprint(use_dict)
 
@@ -657,6 +662,8 @@ def draw_graph(use_dict, output_dict=None):
 
     converter = Converter()
     sequence_graph = converter.convert(use_dict)
+    if title:
+        sequence_graph.params["title"] = title
 
     _LOGGER.info("generating plantuml diagram in file: %s", out_seq_diag_path)
     generate_diagram(sequence_graph, out_seq_diag_path)
@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import io
+import time
+import logging
+import tokenize
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, Tuple
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+DEFAULT_AHEAD = 16  # number of files read in advance
+
+
+# returns content of file and time of reading, content is None if file can not be read
+def read_file(file_path) -> Tuple[Optional[bytes], float]:
+    start_time = time.perf_counter()
+    try:
+        with open(file_path, "rb") as src_file:
+            content = src_file.read()
+    except OSError:
+        content = None
+    return (content, time.perf_counter() - start_time)
+
+
+# decode source code the same way as astroid reads files (encoding declaration and universal newlines)
+# returns (source, encoding), raises SyntaxError or UnicodeError on invalid encoding
+def decode_source(content: bytes) -> Tuple[str, str]:
+    encoding = tokenize.detect_encoding(io.BytesIO(content).readline)[0]
+    with io.TextIOWrapper(io.BytesIO(content), encoding=encoding, newline=None) as text_stream:
+        return (text_stream.read(), encoding)
+
+
+# reads files in background threads while previous files are analyzed
+#
+# Useful when files are placed on slow (e.g. network) filesystem. Files are read in order of given
+# iterator, at most 'ahead' files are kept in memory. Statistics:
+# 'read'   - total time of reading files by threads in seconds
+# 'wait'   - time of waiting for content of files by analysis
+# 'hidden' - time of reading files overlapped with analysis
+class SourcePrefetcher:
+    def __init__(self, workers: int, ahead: int = DEFAULT_AHEAD):
+        self.workers = workers
+        self.ahead = max(ahead, workers)
+        self.files = 0
+        self.read_time = 0.0
+        self.wait_time = 0.0
+
+    # yields (file path, content of file), content is None if file could not be read
+    def iter_sources(self, files_list) -> Iterator[Tuple[str, Optional[bytes]]]:
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch") as executor:
+            for file_path in files_list:
+                pending.append((file_path, executor.submit(read_file, file_path)))
+                if len(pending) >= self.ahead:
+                    yield self._take(pending)
+            while pending:
+                yield self._take(pending)
+
+    def get_stats(self):
+        hidden_time = max(self.read_time - self.wait_time, 0.0)
+        return {
+            "files": self.files,
+            "read": round(self.read_time, 3),
+            "wait": round(self.wait_time, 3),
+            "hidden": round(hidden_time, 3),
+        }
+
+    def _take(self, pending):
+        file_path, future = pending.popleft()
+        start_time = time.perf_counter()
+        content, read_time = future.result()
+        self.wait_time += time.perf_counter() - start_time
+        self.read_time += read_time
+        self.files += 1
+        return (file_path, content)
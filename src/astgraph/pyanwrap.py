@@ -24,7 +24,8 @@ pyan_logger.setLevel(logging.WARN)
 _LOGGER = logging.getLogger(__name__)
 
 
-def draw_full_graph(def_items: List[DefItem], use_dict: Dict[Any, Any], output_dict=None):
+# 'title' - optional label placed on top of graph
+def draw_full_graph(def_items: List[DefItem], use_dict: Dict[Any, Any], output_dict=None, title=None):
     if not output_dict:
         output_dict = {}
 
@@ -57,6 +58,7 @@ def draw_full_graph(def_items: List[DefItem], use_dict: Dict[Any, Any], output_d
     ranksep = max(ranksep, 1.0)
     options = ["rankdir=TB"]
     options += [f'ranksep="{ranksep}"']
+    options += get_title_options(title)
 
     if out_dot_file_path:
         _LOGGER.info("writing DOT file to %s", out_dot_file_path)
@@ -74,7 +76,7 @@ def draw_full_graph(def_items: List[DefItem], use_dict: Dict[Any, Any], output_d
         writer.run()
 
 
-def draw_use_graph(use_dict: Dict[Any, Any], output_dict=None):
+def draw_use_graph(use_dict: Dict[Any, Any], output_dict=None, title=None):
     if not output_dict:
         output_dict = {}
 
@@ -153,6 +155,7 @@ def draw_use_graph(use_dict: Dict[Any, Any], output_dict=None):
     ranksep = max(ranksep, 1.0)
     options = ["rankdir=TB"]
     options += [f'ranksep="{ranksep}"']
+    options += get_title_options(title)
 
     if out_dot_file_path:
         _LOGGER.info("writing DOT file to %s", out_dot_file_path)
@@ -170,6 +173,13 @@ def draw_use_graph(use_dict: Dict[Any, Any], output_dict=None):
         writer.run()
 
 
+def get_title_options(title):
+    if not title:
+        return []
+    label = title.replace('"', '\\"')
+    return [f'label="{label}"', 'labelloc="t"']
+
+
 def convert_to_pyan_graph(def_items: List[DefItem], use_dict: Dict[Any, Any]):
     # initialize translation map
     node_translation_map: Dict[DefItem, PyanNodeMock] = {}
@@ -0,0 +1,99 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+from typing import Dict, Set, Optional, Any, Callable
+
+import astroid.nodes.scoped_nodes.scoped_nodes as astroid_nodes
+from astroid.nodes import node_classes, NodeNG
+
+from astgraph.inference import infer_type
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# marker of missing entry of table (None is valid value)
+_MISSING = object()
+
+
+# returns True if type returned by function does not depend on call site
+#
+# Returned expressions can not refer to arguments or local variables of function (including 'self'
+# and 'super()'). Decorated functions, generators and '__new__' are not handled, because astroid
+# infers their calls in special way.
+def is_site_independent(func_node: NodeNG) -> bool:
+    if not isinstance(func_node, astroid_nodes.FunctionDef):
+        return False
+    if isinstance(func_node, astroid_nodes.AsyncFunctionDef):
+        return False
+    if func_node.decorators or func_node.name == "__new__" or func_node.is_generator():
+        return False
+    local_names = set(func_node.locals.keys())
+    local_names.add("super")
+    skip_types = (astroid_nodes.FunctionDef, astroid_nodes.ClassDef)
+    for return_node in func_node.nodes_of_class(node_classes.Return, skip_klass=skip_types):
+        value_node = return_node.value
+        if value_node is None:
+            continue
+        for name_node in value_node.nodes_of_class(node_classes.Name):
+            if name_node.name in local_names:
+                return False
+    return True
+
+
+# summary table of types returned by functions of analyzed code (items of type 'DEF_METHOD')
+#
+# Type returned by function is inferred once on first call site and reused by other call sites,
+# if the type does not depend on call site (see 'is_site_independent()'). None denotes function
+# returning None or not inferred type. Entries can be restored from analysis cache ('seed()').
+class ReturnTable:
+    # 'find_def_item' - function returning def item of given astroid node
+    def __init__(self, find_def_item: Callable):
+        self.find_def_item = find_def_item
+        self.types_dict: Dict[Any, Optional[NodeNG]] = {}  # function item -> returned type
+        self.computed: Set[Any] = set()  # functions which types were inferred by current analysis
+        self.dependent: Set[Any] = set()  # functions returning types depending on call site
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.types_dict.clear()
+        self.computed.clear()
+        self.dependent.clear()
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.types_dict)}
+
+    # store type restored from cache
+    def seed(self, func_def: Any, type_node: Optional[NodeNG]):
+        self.types_dict[func_def] = type_node
+
+    # returns inferred type of call of function
+    # 'func_node' - inferred called function, None if unknown
+    def infer_call(self, call_node: NodeNG, func_node: Optional[NodeNG]) -> Optional[NodeNG]:
+        if not isinstance(func_node, astroid_nodes.FunctionDef):
+            return infer_type(call_node)
+        func_def = self.find_def_item(func_node)
+        if func_def is None:
+            # function outside of analyzed code
+            return infer_type(call_node)
+        type_node = self.types_dict.get(func_def, _MISSING)
+        if type_node is not _MISSING:
+            self.hits += 1
+            return type_node
+        if func_def in self.dependent:
+            return infer_type(call_node)
+        if not is_site_independent(func_node):
+            self.dependent.add(func_def)
+            return infer_type(call_node)
+        self.misses += 1
+        type_node = infer_type(call_node)
+        self.types_dict[func_def] = type_node
+        self.computed.add(func_def)
+        return type_node
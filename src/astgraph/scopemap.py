@@ -0,0 +1,109 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+from typing import Dict, Optional, Callable, Any
+
+from astroid.nodes import node_classes, NodeNG
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# nodes of members created by uses analysis
+MEMBER_NODE_TYPES = (node_classes.AssignName, node_classes.AssignAttr)
+
+# marker of missing entry of maps (None is valid value)
+_MISSING = object()
+
+
+# maps of astroid nodes to def items of scopes enclosing the nodes
+#
+# Maps are filled by lookups: every node passed while walking up the tree stores the found item, so
+# next lookups from its descendants stop on it (each node is walked once). Items of members can be
+# created during uses analysis, so member nodes are checked on each lookup and nodes below them are
+# not stored. Maps have to be cleared when items are removed or when item is created for node
+# already stored (see 'on_register()').
+class ScopeMap:
+    # 'find_def_item' - function returning def item of astroid node or None
+    def __init__(self, find_def_item: Callable[[NodeNG], Any]):
+        self.find_def_item = find_def_item
+        self.scope_dict: Dict[int, Any] = {}  # node (id) -> nearest item of node or its ancestors
+        self.parent_scope_dict: Dict[int, Any] = {}  # node (id) -> item of scope of node's children
+
+    def clear(self):
+        self.scope_dict.clear()
+        self.parent_scope_dict.clear()
+
+    # called when def item is created for node of given id
+    def on_register(self, node_id: int):
+        if node_id in self.scope_dict or node_id in self.parent_scope_dict:
+            # node was passed as node without item (e.g. "forward declaration")
+            self.clear()
+
+    # returns def item of nearest ancestor having def item
+    def find_scope(self, astroid_node: NodeNG) -> Optional[Any]:
+        scope_dict = self.scope_dict
+        visited_list = []
+        parent_def = None
+        parent_node: NodeNG = astroid_node.parent
+        while parent_node:
+            if isinstance(parent_node, MEMBER_NODE_TYPES):
+                parent_def = self.find_def_item(parent_node)
+                if parent_def:
+                    break
+                visited_list.clear()
+                parent_node = parent_node.parent
+                continue
+            node_id = id(parent_node)
+            parent_def = scope_dict.get(node_id, _MISSING)
+            if parent_def is not _MISSING:
+                break
+            visited_list.append(node_id)
+            parent_def = self.find_def_item(parent_node)
+            if parent_def:
+                break
+            parent_node = parent_node.parent
+        else:
+            parent_def = None
+        for node_id in visited_list:
+            scope_dict[node_id] = parent_def
+        return parent_def
+
+    # returns def item of nearest scope node (module, class, function, lambda or comprehension)
+    # enclosing given node and having def item
+    def find_parent_scope(self, astroid_node: NodeNG) -> Optional[Any]:
+        parent_node = astroid_node.parent  # scope returns self
+        if parent_node is None:
+            # no parent scope
+            return None
+        parent_scope_dict = self.parent_scope_dict
+        node_id = id(parent_node)
+        scope_def = parent_scope_dict.get(node_id, _MISSING)
+        if scope_def is not _MISSING:
+            return scope_def
+
+        visited_list = [node_id]
+        scope_node = parent_node.scope()
+        while True:
+            node_id = id(scope_node)
+            scope_def = parent_scope_dict.get(node_id, _MISSING)
+            if scope_def is not _MISSING:
+                break
+            visited_list.append(node_id)
+            scope_def = self.find_def_item(scope_node)
+            if scope_def is not None:
+                break
+            parent_node = scope_node.parent
+            if parent_node is None:
+                # no parent scope
+                break
+            scope_node = parent_node.scope()
+        for node_id in visited_list:
+            parent_scope_dict[node_id] = scope_def
+        return scope_def
@@ -0,0 +1,273 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import sys
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import astroid
+import astroid.nodes.scoped_nodes.scoped_nodes as astroid_nodes
+
+from astgraph.treeparser import TreeParser
+from astgraph.modpath import PACKAGE_ROOTS, clear_package_roots, get_file_mtime
+from astgraph.inference import INFERENCE_BUDGET, PROJECT_BOUNDARY, clear_inference_caches
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# astroid modules cache keeping order of use (least recently used first)
+#
+# Astroid reads cached module by '[]' operator, so reading moves entry to end.
+class ModuleCache(OrderedDict):
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+
+# returns size of source file of astroid module or 0 if module has no file
+def get_module_size(module_node) -> int:
+    file_path = getattr(module_node, "file", None)
+    if not file_path:
+        return 0
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
+
+
+# scopes of module which names can be changed after build of module
+def get_scope_nodes(module_node):
+    return [module_node] + list(module_node.nodes_of_class(astroid_nodes.ClassDef))
+
+
+# names of scope: (scope node, locals, instance attributes)
+ScopeState = Tuple[astroid_nodes.LocalsDictNodeNG, Dict[str, tuple], Dict[str, tuple]]
+
+
+def get_scope_state(scope_node) -> ScopeState:
+    locals_state = {name: tuple(nodes_list) for name, nodes_list in scope_node.locals.items()}
+    attrs_dict = getattr(scope_node, "instance_attrs", {})
+    attrs_state = {name: tuple(nodes_list) for name, nodes_list in attrs_dict.items()}
+    return (scope_node, locals_state, attrs_state)
+
+
+# isolated context of analyses
+#
+# Session owns search paths of analyzed packages and cache of astroid modules. Both are installed
+# into 'sys.path' and 'astroid.MANAGER' only while session is active (inside 'with' block or
+# 'analyze_files()'), so consecutive analyses do not affect each other and the process. Global
+# state of analysis (inference budget, project boundary, roots of packages and inference caches)
+# is configured by session when entered and restored when left. Modules are reused by following
+# analyses of session. After each analysis least recently used modules are removed from cache
+# until limits are met:
+# 'max_modules'   - maximum number of cached modules
+# 'max_bytes'     - maximum size of source files of cached modules (approximation of trees size)
+# 'infertimeout'  - timeout of inference of single node (see 'InferenceBudget')
+# 'infermax'      - maximum number of values of single inference (see 'InferenceBudget')
+# 'noexternal'    - analyzed files are boundary of project (see 'ProjectBoundary')
+# Module 'builtins' is shared by all sessions (proxies of constants refer to it) and is never removed.
+# If file of any cached module changed then whole cache is cleared (other modules could refer to
+# outdated nodes).
+#
+# Astroid adds names to scopes of cached modules during inference and when building other modules
+# (assignments of attributes). After each analysis names of scopes are restored to state after build
+# of module, names assigned by other cached modules are kept.
+class AnalysisSession:
+    def __init__(
+        self,
+        max_modules: int = None,
+        max_bytes: int = None,
+        infertimeout: int = None,
+        infermax: int = None,
+        noexternal: bool = False,
+    ):
+        self.max_modules = max_modules
+        self.max_bytes = max_bytes
+        self.infertimeout = infertimeout
+        self.infermax = infermax
+        self.noexternal = noexternal
+        self.search_paths: List[str] = []
+        self.modules = ModuleCache()
+        self.evictions = 0
+        self._mod_file_cache = {}
+        self._mtimes: Dict[str, int] = {}  # modification times of files of cached modules
+        self._states: Dict[str, List[ScopeState]] = {}  # state of scopes of cached modules after build
+        self._saved_state = None
+
+    def __enter__(self):
+        if self._saved_state is not None:
+            raise RuntimeError("analysis session is already active")
+        manager = astroid.MANAGER
+        prev_path = list(sys.path)
+        self._saved_state = (
+            manager.astroid_cache,
+            manager._mod_file_cache,  # pylint: disable=W0212
+            prev_path,
+            INFERENCE_BUDGET.get_config(),
+            PROJECT_BOUNDARY.get_config(),
+            dict(PACKAGE_ROOTS),
+        )
+        # inference results and roots of packages of previous analyses can be outdated
+        clear_inference_caches()
+        clear_package_roots()
+        INFERENCE_BUDGET.configure(self.infertimeout, self.infermax)
+        PROJECT_BOUNDARY.configure()
+        builtins_node = manager.astroid_cache.get("builtins")
+        if builtins_node is not None:
+            self.modules["builtins"] = builtins_node
+        manager.astroid_cache = self.modules
+        manager._mod_file_cache = self._mod_file_cache  # pylint: disable=W0212
+        manager.register_transform(astroid_nodes.Module, self._on_module_built)
+        sys.path.extend(path for path in self.search_paths if path not in prev_path)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        manager = astroid.MANAGER
+        prev_cache, prev_mod_file_cache, prev_path, budget_config, boundary_config, package_roots = self._saved_state
+        self._saved_state = None
+        manager.unregister_transform(astroid_nodes.Module, self._on_module_built)
+        # inference results refer to nodes of session's modules
+        clear_inference_caches()
+        INFERENCE_BUDGET.configure(*budget_config)
+        PROJECT_BOUNDARY.configure(*boundary_config)
+        PACKAGE_ROOTS.clear()
+        PACKAGE_ROOTS.update(package_roots)
+        # cache could be replaced (e.g. by 'clear_cache()')
+        self.modules = manager.astroid_cache
+        self._mod_file_cache = manager._mod_file_cache  # pylint: disable=W0212
+        builtins_node = self.modules.get("builtins")
+        if builtins_node is not None:
+            prev_cache["builtins"] = builtins_node
+        manager.astroid_cache = prev_cache
+        manager._mod_file_cache = prev_mod_file_cache  # pylint: disable=W0212
+        for path in sys.path:
+            if path not in prev_path and path not in self.search_paths:
+                self.search_paths.append(path)
+        sys.path[:] = prev_path
+
+    def is_active(self) -> bool:
+        return self._saved_state is not None
+
+    # analyze files in context of session, returns parser containing results
+    #
+    # Results can be updated (e.g. 'TreeParser.update_file()') only inside 'with' block of session.
+    def analyze_files(self, files_list, jobs=1) -> TreeParser:
+        parser = TreeParser()
+        files_list = list(files_list)
+        with self:
+            self._clear_changed()
+            if self.noexternal:
+                PROJECT_BOUNDARY.configure(files_list)
+            try:
+                parser.analyze_files(files_list, jobs=jobs)
+            finally:
+                self._store_mtimes()
+        self.trim()
+        self._restore_scopes()
+        _LOGGER.info("analysis session stats: %s", self.get_stats())
+        return parser
+
+    # remove least recently used modules until limits are met
+    def trim(self):
+        if not isinstance(self.modules, ModuleCache):
+            self.modules = ModuleCache(self.modules)
+        total_size = None
+        if self.max_bytes is not None:
+            total_size = sum(get_module_size(module_node) for module_node in self.modules.values())
+        for module_name in list(self.modules.keys()):
+            over_count = self.max_modules is not None and len(self.modules) > self.max_modules
+            over_size = total_size is not None and total_size > self.max_bytes
+            if not over_count and not over_size:
+                break
+            if module_name == "builtins":
+                continue
+            # 'pop()' of ordered dict reads value by overridden '[]' operator
+            module_node = self.modules.get(module_name)
+            del self.modules[module_name]
+            self._mtimes.pop(module_name, None)
+            self._states.pop(module_name, None)
+            if total_size is not None:
+                total_size -= get_module_size(module_node)
+            self.evictions += 1
+        # lookups of module files can refer to removed modules
+        self._mod_file_cache.clear()
+
+    def clear(self):
+        builtins_node = self.modules.get("builtins")
+        self.modules.clear()
+        if builtins_node is not None:
+            self.modules["builtins"] = builtins_node
+        self._mod_file_cache.clear()
+        self._mtimes.clear()
+        self._states.clear()
+        self._restore_scopes()
+
+    def get_stats(self):
+        total_size = sum(get_module_size(module_node) for module_node in self.modules.values())
+        return {"modules": len(self.modules), "bytes": total_size, "evictions": self.evictions}
+
+    def _on_module_built(self, module_node):
+        self._states[module_node.name] = [get_scope_state(scope_node) for scope_node in get_scope_nodes(module_node)]
+
+    # remove names added to scopes of cached modules, except names assigned by other cached modules
+    def _restore_scopes(self):
+        cached_ids = {id(module_node) for module_node in self.modules.values()}
+        for module_name, module_node in self.modules.items():
+            states_list = self._states.get(module_name)
+            if states_list is None or states_list[0][0] is not module_node:
+                # module built outside of session (e.g. 'builtins') - only names of removed modules are known
+                states_list = [(scope_node, None, None) for scope_node in get_scope_nodes(module_node)]
+            for scope_node, locals_state, attrs_state in states_list:
+                # memoized results of methods of node (see astroid's 'cached' decorator)
+                vars(scope_node).pop("__cache", None)
+                _restore_names(scope_node.locals, locals_state, module_node, cached_ids)
+                attrs_dict = getattr(scope_node, "instance_attrs", None)
+                if attrs_dict is not None:
+                    _restore_names(attrs_dict, attrs_state, module_node, cached_ids)
+
+    def _clear_changed(self):
+        for module_name, mtime in self._mtimes.items():
+            module_node = self.modules.get(module_name)
+            if module_node is None or get_file_mtime(module_node.file) != mtime:
+                _LOGGER.info("module %s changed, clearing session cache", module_name)
+                self.clear()
+                return
+
+    def _store_mtimes(self):
+        for module_name, module_node in self.modules.items():
+            if module_name in self._mtimes or module_name == "builtins":
+                continue
+            mtime = get_file_mtime(getattr(module_node, "file", None))
+            if mtime is not None:
+                self._mtimes[module_name] = mtime
+
+
+# 'names_state' - names after build of module or None if unknown
+def _restore_names(names_dict, names_state, module_node, cached_ids):
+    for name, nodes_list in list(names_dict.items()):
+        initial_ids = None
+        if names_state is not None:
+            initial_ids = {id(node) for node in names_state.get(name, ())}
+        kept_list = []
+        for node in nodes_list:
+            root_node = node.root()
+            if root_node is module_node:
+                if initial_ids is None or id(node) in initial_ids:
+                    kept_list.append(node)
+            elif id(root_node) in cached_ids:
+                kept_list.append(node)
+        if len(kept_list) == len(nodes_list):
+            continue
+        if kept_list:
+            names_dict[name] = kept_list
+        else:
+            del names_dict[name]
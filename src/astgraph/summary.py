@@ -0,0 +1,398 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+from typing import Dict, List, Set, Tuple, Any, Optional
+
+import astroid.nodes.scoped_nodes.scoped_nodes as astroid_nodes
+from astroid.nodes import NodeNG
+
+from astgraph.treeparser import ItemContainer, DefItem, DefItemType, ClassItem
+from astgraph.scopemap import MEMBER_NODE_TYPES
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+# nodes of items created by definitions analysis
+DEF_NODE_TYPES = (astroid_nodes.Module, astroid_nodes.ClassDef, astroid_nodes.FunctionDef)
+
+
+# identify astroid node independently of process
+def get_node_key(astroid_node: NodeNG):
+    module_node = astroid_node.root()
+    return (module_node.name, type(astroid_node).__name__, astroid_node.lineno, astroid_node.col_offset)
+
+
+# ============================================
+
+
+# identify def items independently of process
+#
+# items created by definitions analysis are identified by position of it's node,
+# members created by uses analysis are identified by parent and name
+class ItemKeys:
+    def __init__(self, container: ItemContainer):
+        self.items = container
+        self._keys: Dict[DefItem, Any] = {}
+        self._def_index: Dict[Any, DefItem] = {}
+        self._def_indexed = False
+        self._node_index: Dict[str, Dict[Any, NodeNG]] = {}
+        self._node_items: Dict[Any, DefItem] = {}  # members created without astroid node
+
+    def get_key(self, def_item: DefItem):
+        if def_item is None:
+            return None
+        key = self._keys.get(def_item)
+        if key is not None:
+            return key
+        astroid_node = self.items.astroid_node_dict.get(def_item.node_id)
+        if isinstance(astroid_node, DEF_NODE_TYPES):
+            key = ("node",) + get_node_key(astroid_node)
+        else:
+            key = ("member", self.get_key(def_item.parent), def_item.name)
+        self._keys[def_item] = key
+        return key
+
+    # register item created by definitions analysis
+    # items created without astroid node have to be registered with explicit key
+    def register(self, def_item: DefItem, key=None):
+        if key is None:
+            key = self.get_key(def_item)
+        self._keys[def_item] = key
+        self._def_index[key] = def_item
+
+    # register member created without astroid node (node's module is not loaded)
+    def register_node(self, node_key, def_item: DefItem):
+        self._node_items[node_key] = def_item
+
+    def find_item(self, key) -> Optional[DefItem]:
+        if key is None:
+            return None
+        if key[0] == "node":
+            if not self._def_indexed:
+                self._def_index.update(self._create_def_index())
+                self._def_indexed = True
+            return self._def_index.get(key)
+        parent = self.find_item(key[1])
+        if parent is None:
+            return None
+        child = parent.get_child_direct(key[2])
+        if child is None:
+            return None
+        if self.get_key(child) != key:
+            # child with the same name created by definitions analysis
+            return None
+        return child
+
+    def find_node(self, node_key) -> Optional[NodeNG]:
+        module_name = node_key[0]
+        nodes_dict = self._node_index.get(module_name)
+        if nodes_dict is None:
+            nodes_dict = {}
+            module_node = self.items.mod_dict.get(module_name)
+            if module_node is not None:
+                for astroid_node in module_node.nodes_of_class(MEMBER_NODE_TYPES):
+                    nodes_dict[get_node_key(astroid_node)] = astroid_node
+            self._node_index[module_name] = nodes_dict
+        return nodes_dict.get(node_key)
+
+    def find_node_item(self, node_key) -> Optional[DefItem]:
+        astroid_node = self.find_node(node_key)
+        if astroid_node is not None:
+            return self.items.astroid_item_dict.get(id(astroid_node))
+        return self._node_items.get(node_key)
+
+    def is_loaded(self, node_key) -> bool:
+        return node_key[0] in self.items.mod_dict
+
+    def _create_def_index(self):
+        def_index = {}
+        for node_id, def_item in self.items.astroid_item_dict.items():
+            astroid_node = self.items.astroid_node_dict.get(node_id)
+            if isinstance(astroid_node, DEF_NODE_TYPES):
+                def_index[("node",) + get_node_key(astroid_node)] = def_item
+        return def_index
+
+
+# ============================================
+
+
+# definitions analysis of single module
+#
+# Contains items created by the analysis in order of creation.
+class DefSummary:
+    def __init__(self, module_name: str):
+        self.module_name = module_name
+        self.items: List[Tuple] = []
+
+
+def record_defs(keys: ItemKeys, module_name: str, def_items: List[DefItem]) -> DefSummary:
+    summary = DefSummary(module_name)
+    for def_item in def_items:
+        keys.register(def_item)
+        item_key = keys.get_key(def_item)
+        parent_key = keys.get_key(def_item.parent)
+        base_keys = None
+        explicit_ctor = False
+        if isinstance(def_item, ClassItem):
+            base_keys = [keys.get_key(base) for base in def_item.bases]
+            explicit_ctor = def_item.explicit_ctor
+        filename = def_item.get_filename() if def_item.is_module() else None
+        summary.items.append(
+            (item_key, parent_key, def_item.name, def_item.type.value, base_keys, explicit_ctor, filename)
+        )
+    return summary
+
+
+# create items stored in summary without analyzing astroid tree
+# returns False if summary refers to missing items
+def apply_defs(keys: ItemKeys, summary: DefSummary) -> bool:
+    container = keys.items
+    for item_key, parent_key, name, type_value, base_keys, explicit_ctor, filename in summary.items:
+        item_type = DefItemType(type_value)
+        parent = None
+        if parent_key is not None:
+            parent = keys.find_item(parent_key)
+            if parent is None:
+                return False
+        if item_type == DefItemType.MODULE:
+            def_item = container.create_module_def(name, None)
+            def_item.filename = filename
+        else:
+            def_item = container.create_def(name, item_type, None)
+        if base_keys is not None:
+            for base_key in base_keys:
+                base = keys.find_item(base_key)
+                if base is None:
+                    return False
+                def_item.append_base(base)
+            def_item.explicit_ctor = explicit_ctor
+        if parent is None:
+            container.append_def(def_item)
+        else:
+            container.append_def_parent(parent, def_item)
+        keys.register(def_item, item_key)
+    return True
+
+
+# ============================================
+
+
+# uses analysis of single module
+#
+# Contains modifications of items container and lookups of state that influenced the analysis.
+# All items are described by keys, so summary can be transferred between processes.
+class ModuleSummary:
+    def __init__(self, module_name: str):
+        self.module_name = module_name
+        self.events: List[Tuple] = []
+
+
+# listener of items container creating summaries of analyzed modules
+class SummaryRecorder:
+    def __init__(self, container: ItemContainer, keys: ItemKeys = None):
+        if keys is None:
+            keys = ItemKeys(container)
+        self.keys = keys
+        self.summary: ModuleSummary = None
+
+    def begin(self, module_name: str) -> ModuleSummary:
+        self.summary = ModuleSummary(module_name)
+        return self.summary
+
+    def end(self) -> ModuleSummary:
+        summary = self.summary
+        self.summary = None
+        return summary
+
+    def on_get_child(self, def_item: DefItem, name: str, direct: bool, child: DefItem):
+        self._add_event("child", self.keys.get_key(def_item), name, direct, self.keys.get_key(child))
+
+    def on_get_type_hint(self, def_item: DefItem, hint_item: DefItem):
+        self._add_event("gethint", self.keys.get_key(def_item), self.keys.get_key(hint_item))
+
+    def on_set_type_hint(self, def_item: DefItem, hint_item: DefItem):
+        self._add_event("sethint", self.keys.get_key(def_item), self.keys.get_key(hint_item))
+
+    def on_find_def_item(self, astroid_node: NodeNG, def_item: DefItem):
+        if not isinstance(astroid_node, MEMBER_NODE_TYPES):
+            # other nodes are registered only by definitions analysis
+            return
+        self._add_event("node", get_node_key(astroid_node), self.keys.get_key(def_item))
+
+    def on_def(self, parent: DefItem, def_item: DefItem):
+        astroid_node = self.keys.items.astroid_node_dict.get(def_item.node_id)
+        node_key = None
+        if astroid_node is not None:
+            node_key = get_node_key(astroid_node)
+        self._add_event("def", self.keys.get_key(parent), def_item.name, def_item.type.value, node_key)
+
+    def on_use(self, user_item: DefItem, use_item: DefItem):
+        self._add_event("use", self.keys.get_key(user_item), self.keys.get_key(use_item))
+
+    def _add_event(self, *event):
+        if self.summary is None:
+            return
+        self.summary.events.append(event)
+
+
+# ============================================
+
+
+# apply summaries to items container
+#
+# Summary is applied only if all lookups stored in summary give the same results
+# on the container, so the result is the same as analyzing the module directly.
+class SummaryApplier:
+    def __init__(self, container: ItemContainer, keys: ItemKeys = None):
+        if keys is None:
+            keys = ItemKeys(container)
+        self.items = container
+        self.keys = keys
+
+    # returns False if summary does not match state of container
+    def apply(self, summary: ModuleSummary) -> bool:
+        skip_events = self._verify(summary)
+        if skip_events is None:
+            _LOGGER.debug("summary does not match: %s", summary.module_name)
+            return False
+
+        for index, event in enumerate(summary.events):
+            if index in skip_events:
+                continue
+            event_type = event[0]
+            if event_type == "def":
+                _, parent_key, name, type_value, node_key = event
+                parent = self.keys.find_item(parent_key)
+                astroid_node = None
+                if node_key is not None:
+                    astroid_node = self.keys.find_node(node_key)
+                def_item = self.items.create_def(name, DefItemType(type_value), astroid_node)
+                self.items.append_def_parent(parent, def_item)
+                if node_key is not None and astroid_node is None:
+                    self.keys.register_node(node_key, def_item)
+            elif event_type == "sethint":
+                _, item_key, hint_key = event
+                self.items.set_type_hint(self.keys.find_item(item_key), self.keys.find_item(hint_key))
+            elif event_type == "use":
+                _, user_key, use_key = event
+                self.items.append_use(self.keys.find_item(user_key), self.keys.find_item(use_key))
+        return True
+
+    # returns indexes of events to skip or None if summary does not match
+    def _verify(self, summary: ModuleSummary) -> Optional[Set[int]]:
+        created: Set[Any] = set()  # keys of items created by summary
+        created_nodes: Dict[Any, Any] = {}  # node key to item key
+        hints: Dict[Any, Any] = {}  # type hints set by summary
+        skip_events: Set[int] = set()
+        for index, event in enumerate(summary.events):
+            if index in skip_events:
+                continue
+            event_type = event[0]
+            if event_type == "child":
+                _, parent_key, name, direct, child_key = event
+                found_key = self._find_child_key(parent_key, name, direct, created)
+                if found_key == child_key:
+                    continue
+                if child_key is not None:
+                    return None
+                # child is missing in summary, but exists in container - accept if summary creates the same item
+                def_index = self._find_created_def(summary, index, found_key)
+                if def_index < 0:
+                    return None
+                skip_events.add(def_index)
+            elif event_type == "gethint":
+                _, item_key, hint_key = event
+                if self._get_hint_key(item_key, hints) != hint_key:
+                    return None
+            elif event_type == "node":
+                _, node_key, item_key = event
+                if self._find_node_item_key(node_key, created_nodes) != item_key:
+                    return None
+            elif event_type == "def":
+                _, parent_key, name, _, node_key = event
+                item_key = ("member", parent_key, name)
+                if item_key in created or self.keys.find_item(item_key) is not None:
+                    return None
+                if not self._exists(parent_key, created):
+                    return None
+                created.add(item_key)
+                if node_key is not None:
+                    if self.keys.is_loaded(node_key) and self.keys.find_node(node_key) is None:
+                        return None
+                    created_nodes[node_key] = item_key
+            elif event_type == "sethint":
+                _, item_key, hint_key = event
+                if not self._exists(item_key, created):
+                    return None
+                if hint_key is not None and not self._exists(hint_key, created):
+                    return None
+                hints[item_key] = hint_key
+            elif event_type == "use":
+                _, user_key, use_key = event
+                if not self._exists(user_key, created) or not self._exists(use_key, created):
+                    return None
+        return skip_events
+
+    # find creation of item directly following the lookup ("get or create" case)
+    def _find_created_def(self, summary: ModuleSummary, lookup_index, item_key) -> int:
+        def_item = self.keys.find_item(item_key)
+        if def_item is None:
+            return -1
+        for index in range(lookup_index + 1, len(summary.events)):
+            event = summary.events[index]
+            event_type = event[0]
+            if event_type == "node":
+                continue
+            if event_type != "def":
+                return -1
+            _, parent_key, name, type_value, _ = event
+            if ("member", parent_key, name) != item_key:
+                return -1
+            if def_item.type.value != type_value:
+                return -1
+            return index
+        return -1
+
+    def _exists(self, item_key, created) -> bool:
+        if item_key in created:
+            return True
+        return self.keys.find_item(item_key) is not None
+
+    def _find_child_key(self, parent_key, name, direct, created):
+        parent = self.keys.find_item(parent_key)
+        if parent is not None:
+            child = parent.get_child_direct(name)
+            if child is not None:
+                return self.keys.get_key(child)
+        member_key = ("member", parent_key, name)
+        if member_key in created:
+            return member_key
+        if direct or not isinstance(parent, ClassItem):
+            return None
+        for base in parent.bases:
+            base_child_key = self._find_child_key(self.keys.get_key(base), name, False, created)
+            if base_child_key is not None:
+                return base_child_key
+        return None
+
+    def _get_hint_key(self, item_key, hints):
+        if item_key in hints:
+            return hints[item_key]
+        def_item = self.keys.find_item(item_key)
+        if def_item is None:
+            return None
+        return self.keys.get_key(def_item.type_hint)
+
+    def _find_node_item_key(self, node_key, created_nodes):
+        item_key = created_nodes.get(node_key)
+        if item_key is not None:
+            return item_key
+        def_item = self.keys.find_node_item(node_key)
+        return self.keys.get_key(def_item)
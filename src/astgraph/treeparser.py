@@ -6,19 +6,22 @@
 # LICENSE file in the root directory of this source tree.
 #
 
-import sys
 import os
+import time
 import logging
-from enum import Enum
-from typing import Dict, List, Set, Optional
-
-import astypes
+from typing import Dict, List, Set, Optional, Tuple, Callable
 
 import astroid
 import astroid.nodes.scoped_nodes.scoped_nodes as astroid_nodes
-import astroid.bases as astroid_bases
 from astroid.nodes import node_classes, NodeNG
-from astroid.modutils import _has_init
+from astgraph.modpath import add_search_paths, load_module
+from astgraph.defitem import DefItemType, DefItem, ClassItem, ModuleItem
+from astgraph.scopemap import ScopeMap
+from astgraph.nameresolver import NameResolver
+from astgraph.chaincache import ChainCache, get_chain_key
+from astgraph.returntypes import ReturnTable
+from astgraph.inference import INFERENCE_CACHE, INFERENCE_BUDGET, get_type, infer_type, get_self_class
+from astgraph.inference import PROJECT_BOUNDARY, clear_astroid_caches
 from astgraph.graphtheory import convert_to_list, get_direct_predecessors
 
 
@@ -42,194 +45,6 @@ def get_message(message: str, astroid_node: NodeNG):
     return f"{message} (node {type(astroid_node)})"
 
 
-def get_type(astroid_node: NodeNG) -> str:
-    node_astype = astypes.get_type(astroid_node)
-    if not node_astype:
-        return None
-    return node_astype.annotation
-
-
-def infer_node(astroid_node: NodeNG):
-    try:
-        return next(astroid_node.infer())
-    except astroid.exceptions.InferenceError:
-        # no inference succeed
-        return None
-
-
-def infer_type(astroid_node: NodeNG) -> Optional[NodeNG]:
-    try:
-        inferred = next(astroid_node.infer())
-        if not inferred:
-            return None
-        # if isinstance(inferred, BoundMethod):
-        #     caller = astroid_node.expr
-        #     inferred_result = inferred.infer_call_result(caller)
-        #     inferred_value = next(inferred_result)
-        #     return unpack_proxy(inferred_value)
-        if isinstance(inferred, astroid_bases.Proxy):
-            return unpack_proxy(inferred)
-        if isinstance(inferred, NodeNG):
-            return inferred
-        raise RuntimeError(f"unhandled type: {type(inferred)}")
-    except astroid.exceptions.InferenceError as exc:
-        # no inference succeed
-        _LOGGER.warning("unable to infer: %s", exc)
-        return None
-
-
-def unpack_proxy(inferred):
-    while inferred:
-        if isinstance(inferred, astroid_bases.Proxy):
-            inferred = inferred._proxied  # pylint: disable=W0212
-            continue
-        if isinstance(inferred, NodeNG):
-            return inferred
-        raise RuntimeError(f"unhandled type: {type(inferred)}")
-    return None
-
-
-# ============================================
-
-
-class DefItemType(Enum):
-    MODULE = "module"
-    CLASS = "class"
-    DEF_METHOD = "method"  # defined method
-    MEMBER = "member"  # free function, method or attribute
-
-
-class DefItem:
-    def __init__(self, name: str, item_type: DefItemType, astroid_node):
-        self.node_id = id(astroid_node)
-        self.type: DefItemType = item_type
-        self.parent = None
-        self.name = name
-        self._items: List[DefItem] = []
-        self.type_hint: Optional[DefItem] = None  # member type hint
-
-    @property
-    def info(self):
-        return (self.get_full_name(), self.type)
-
-    def is_module(self) -> bool:
-        return self.type == DefItemType.MODULE
-
-    def is_class(self) -> bool:
-        return self.type == DefItemType.CLASS
-
-    def is_method(self) -> bool:
-        return self.type == DefItemType.DEF_METHOD
-
-    def is_field(self) -> bool:
-        return self.type == DefItemType.MEMBER
-
-    def get_items(self) -> List["DefItem"]:
-        return self._items
-
-    def append(self, item):
-        self._items.append(item)
-        item.parent = self
-
-    def get_namespace(self):
-        if not self.parent:
-            return ""
-        return self.parent.get_full_name()
-
-    def get_name(self):
-        return self.name
-
-    def get_full_name(self):
-        full_name = self.get_name()
-        parent = self.parent
-        while parent:
-            par_name = parent.get_name()
-            full_name = f"{par_name}.{full_name}"
-            parent = parent.parent
-        return full_name
-
-    def get_filename(self):
-        if not self.parent:
-            return ""
-        return self.parent.get_filename()
-
-    def get_child(self, name) -> "DefItem":
-        return self.get_child_direct(name)
-
-    def get_child_direct(self, name) -> "DefItem":
-        for item in self._items:
-            if item.name == name:
-                return item
-        return None
-
-    def find_items(self, name) -> List["DefItem"]:
-        direct_child = self.get_child_direct(name)
-        if direct_child is not None:
-            return [direct_child]
-        return []
-
-    def to_string(self):
-        return f"({self.name}, {self.type})"
-
-    def __repr__(self):
-        full_name = self.get_full_name()
-        hex_id = f"0x{id(self):0x}"
-        return f"<{full_name}, {self.type} {hex_id}>"
-
-
-class ClassItem(DefItem):
-    def __init__(self, name: str, astroid_node):
-        super().__init__(name, DefItemType.CLASS, astroid_node)
-        self.bases: List["ClassItem"] = []
-        self.explicit_ctor = False
-
-    def append_base(self, base: "ClassItem"):
-        self.bases.append(base)
-
-    def get_child(self, name) -> "DefItem":
-        direct_child = self.get_child_direct(name)
-        if direct_child is not None:
-            return direct_child
-        for base in self.bases:
-            base_child = base.get_child(name)
-            if base_child is not None:
-                return base_child
-        return None
-
-    def find_items(self, name) -> List["DefItem"]:
-        direct_child = self.get_child_direct(name)
-        if direct_child is not None:
-            return [direct_child]
-
-        ret_list = []
-        for base in self.bases:
-            base_children = base.find_items(name)
-            if base_children is not None:
-                ret_list.extend(base_children)
-        return ret_list
-
-    def find_in_bases(self, name) -> List["DefItem"]:
-        ret_list = []
-        for base in self.bases:
-            base_children = base.find_items(name)
-            if base_children is not None:
-                ret_list.extend(base_children)
-        return ret_list
-
-
-class ModuleItem(DefItem):
-    def __init__(self, name: str, astroid_node, namespace=""):
-        super().__init__(name, DefItemType.MODULE, astroid_node)
-        self.namespace = namespace
-        self.filename = None
-
-    def get_namespace(self):
-        return self.namespace
-
-    def get_filename(self):
-        return self.filename
-
-
 # ============================================
 
 
@@ -240,13 +55,45 @@ class ItemContainer:
         self.use_dict: Dict[DefItem, List[DefItem]] = {}
         self.astroid_item_dict: Dict[int, DefItem] = {}  # map astroid node (id) to def item
         self.astroid_node_dict: Dict[int, NodeNG] = {}
+        self.scopes = ScopeMap(self.find_def_item)  # map astroid node to def item of enclosing scope
+        self.names = NameResolver(self.mod_dict)  # cache of names resolution
+        self.chains = ChainCache()  # cache of inferred types of chains of attributes
+        self.returns = ReturnTable(self.find_def_item)  # types returned by functions
+        self.recorder = None  # optional listener of use analysis (see 'astgraph.summary')
+        self.deadline: float = None  # optional end time of use analysis (value of 'time.time()')
+        self.partial = False  # use analysis was stopped by deadline - uses are incomplete
+        self.approximate = False  # uses found by fast engine - can differ from uses found by astroid
+        # counters of resolution of 'self' (or 'cls') attribute chains: "tree" - resolved using items tree
+        # and type hints of members, "astroid" - inference of member without type hint was needed
+        self.resolve_stats = {"tree": 0, "astroid": 0}
+
+    # returns True if deadline passed, then analysis of next items has to be skipped
+    def is_deadline_exceeded(self) -> bool:
+        if self.deadline is None or time.time() < self.deadline:
+            return False
+        self.partial = True
+        return True
 
     def add_mod(self, mod: astroid_nodes.Module):
         if mod.name in self.mod_dict:
             return False
         self.mod_dict[mod.name] = mod
+        self.names.clear()
         return True
 
+    # replace module (new tree of module), position of existing module is kept
+    def set_mod(self, mod: astroid_nodes.Module):
+        self.mod_dict[mod.name] = mod
+        self.names.clear()
+        self.chains.clear()
+        self.returns.clear()
+
+    def remove_mod(self, mod_name: str):
+        self.mod_dict.pop(mod_name, None)
+        self.names.clear()
+        self.chains.clear()
+        self.returns.clear()
+
     def get_def_list_info(self):
         ret_list = []
         # def_item: DefItem
@@ -281,28 +128,28 @@ class ItemContainer:
 
         item: DefItem = DefItem(name, def_type, astroid_node)
         if astroid_node is not None:
-            node_id = id(astroid_node)
-            self.astroid_item_dict[node_id] = item
-            self.astroid_node_dict[node_id] = astroid_node
+            self._register_node(astroid_node, item)
         return item
 
     def create_class_def(self, name: str, astroid_node: NodeNG) -> ClassItem:
         item = ClassItem(name, astroid_node)
         if astroid_node is not None:
-            node_id = id(astroid_node)
-            self.astroid_item_dict[node_id] = item
-            self.astroid_node_dict[node_id] = astroid_node
+            self._register_node(astroid_node, item)
         return item
 
     def create_module_def(self, name: str, astroid_node: NodeNG) -> ModuleItem:
         item = ModuleItem(name, astroid_node)
-        item.filename = astroid_node.file
         if astroid_node is not None:
-            node_id = id(astroid_node)
-            self.astroid_item_dict[node_id] = item
-            self.astroid_node_dict[node_id] = astroid_node
+            item.filename = astroid_node.file
+            self._register_node(astroid_node, item)
         return item
 
+    def _register_node(self, astroid_node: NodeNG, def_item: DefItem):
+        node_id = id(astroid_node)
+        self.astroid_item_dict[node_id] = def_item
+        self.astroid_node_dict[node_id] = astroid_node
+        self.scopes.on_register(node_id)
+
     def append_def(self, def_item: DefItem):
         if def_item.type == DefItemType.MODULE:
             # add top level item - module (does not have parent scope)
@@ -320,9 +167,13 @@ class ItemContainer:
         _LOGGER.debug("append def: %s", def_item.get_full_name())
         self.def_items.append(def_item)
         parent.append(def_item)
+        if self.recorder is not None:
+            self.recorder.on_def(parent, def_item)
 
     def append_use(self, user_item: DefItem, use_item: DefItem):
         # here we are sure that 'user_item' and 'use_item' is already added to def structures
+        if self.recorder is not None:
+            self.recorder.on_use(user_item, use_item)
         uses_list = self.use_dict.get(user_item)
         if uses_list is None:
             uses_list = []
@@ -331,31 +182,102 @@ class ItemContainer:
             _LOGGER.debug("append use: %s -> %s", user_item.get_full_name(), use_item.get_full_name())
             uses_list.append(use_item)
 
+    # drop references to astroid nodes, items and uses are kept
+    # node ids stored in items can be reused by new nodes, so items can not be found by nodes anymore
+    def release_nodes(self):
+        self.mod_dict.clear()
+        self.astroid_item_dict.clear()
+        self.astroid_node_dict.clear()
+        self.scopes.clear()
+        self.names.clear()
+        self.chains.clear()
+        self.returns.clear()
+
+    # remove items with all their uses and references
+    def remove_defs(self, items_set: Set[DefItem]):
+        self.def_items = [def_item for def_item in self.def_items if def_item not in items_set]
+        for def_item in items_set:
+            parent = def_item.parent
+            if parent is not None and parent not in items_set:
+                parent.remove(def_item)
+            node_id = def_item.node_id
+            if self.astroid_item_dict.get(node_id) is def_item:
+                del self.astroid_item_dict[node_id]
+                del self.astroid_node_dict[node_id]
+        self.scopes.clear()
+        self.chains.clear()
+        self.returns.clear()
+
+        for user_item in list(self.use_dict.keys()):
+            if user_item in items_set:
+                del self.use_dict[user_item]
+                continue
+            uses_list = self.use_dict[user_item]
+            uses_list[:] = [use_item for use_item in uses_list if use_item not in items_set]
+            if not uses_list:
+                del self.use_dict[user_item]
+
+        for def_item in self.def_items:
+            if def_item.type_hint in items_set:
+                def_item.type_hint = None
+            if isinstance(def_item, ClassItem):
+                def_item.bases = [base for base in def_item.bases if base not in items_set]
+
+    def get_child(self, def_item: DefItem, name: str) -> Optional[DefItem]:
+        child = def_item.get_child(name)
+        if self.recorder is not None:
+            self.recorder.on_get_child(def_item, name, False, child)
+        return child
+
+    def get_child_direct(self, def_item: DefItem, name: str) -> Optional[DefItem]:
+        child = def_item.get_child_direct(name)
+        if self.recorder is not None:
+            self.recorder.on_get_child(def_item, name, True, child)
+        return child
+
+    def get_type_hint(self, def_item: DefItem) -> Optional[DefItem]:
+        if self.recorder is not None:
+            self.recorder.on_get_type_hint(def_item, def_item.type_hint)
+        return def_item.type_hint
+
+    def set_type_hint(self, def_item: DefItem, hint_item: Optional[DefItem]):
+        if self.recorder is not None:
+            self.recorder.on_set_type_hint(def_item, hint_item)
+        def_item.type_hint = hint_item
+
+    # returns item called by calling given item - constructor in case of class
+    def get_callable(self, item_type: DefItem) -> DefItem:
+        if not isinstance(item_type, ClassItem):
+            # calling function
+            return item_type
+        item_ctor: DefItem = self.get_ctor(item_type)
+        if not item_type.explicit_ctor:
+            for base_def in item_type.bases:
+                base_ctor: DefItem = self.get_ctor(base_def)
+                self.append_use(item_ctor, base_ctor)
+        return item_ctor
+
+    def get_ctor(self, item_type: ClassItem) -> DefItem:
+        ctor_item: DefItem = self.get_child_direct(item_type, "__init__")
+        if ctor_item is not None:
+            return ctor_item
+        # constructor not explicitly defined - add node
+        ctor_item = self.create_def("__init__", DefItemType.DEF_METHOD, None)
+        self.append_def_parent(item_type, ctor_item)
+        return ctor_item
+
     def find_def_item(self, astroid_node: NodeNG) -> Optional[DefItem]:
         node_id = id(astroid_node)
-        return self.astroid_item_dict.get(node_id)
+        def_item = self.astroid_item_dict.get(node_id)
+        if self.recorder is not None:
+            self.recorder.on_find_def_item(astroid_node, def_item)
+        return def_item
 
     def find_scope(self, astroid_node: NodeNG) -> Optional[DefItem]:
-        parent_node: NodeNG = astroid_node.parent
-        while parent_node:
-            parent_def = self.find_def_item(parent_node)
-            if parent_def:
-                return parent_def
-            parent_node = parent_node.parent
-        return None
+        return self.scopes.find_scope(astroid_node)
 
     def find_parent_scope_def(self, astroid_node: NodeNG) -> Optional[DefItem]:
-        scope_node = astroid_node
-        while scope_node:
-            parent_node = scope_node.parent  # scope returns self
-            if parent_node is None:
-                # no parent scope
-                return None
-            scope_node = parent_node.scope()
-            scope_def = self.find_def_item(scope_node)
-            if scope_def is not None:
-                return scope_def
-        return None
+        return self.scopes.find_parent_scope(astroid_node)
 
     def find_scope_by_id(self, node_id: int) -> Optional[DefItem]:
         item_node: NodeNG = self.astroid_node_dict.get(node_id)
@@ -364,40 +286,19 @@ class ItemContainer:
         return self.find_scope(item_node)
 
     def find_scope_class(self, astroid_node: NodeNG) -> Optional[DefItem]:
-        parent_node: NodeNG = astroid_node.parent
-        while parent_node:
-            parent_def = self.find_def_item(parent_node)
-            if parent_def and parent_def.type == DefItemType.CLASS:
+        parent_def = self.find_scope(astroid_node)
+        while parent_def:
+            if parent_def.type == DefItemType.CLASS:
                 return parent_def
-            parent_node = parent_node.parent
+            parent_node = self.astroid_node_dict.get(parent_def.node_id)
+            if parent_node is None:
+                return None
+            parent_def = self.find_scope(parent_node)
         return None
 
     # name is type name or variable name
     def find_in_scope(self, scope_node, name) -> Optional[NodeNG]:
-        if scope_node is None:
-            return None
-        while scope_node:
-            found_type_node = scope_node.locals.get(name)
-            if found_type_node:
-                # found node
-                found_node = found_type_node[0]
-                if isinstance(found_node, node_classes.Import):
-                    mod_name = found_node.names[0][0]
-                    mod_node = self.mod_dict.get(mod_name)
-                    return self.find_in_scope(mod_node, name)
-                if isinstance(found_node, node_classes.ImportFrom):
-                    mod_name = found_node.modname
-                    mod_node = self.mod_dict.get(mod_name)
-                    return self.find_in_scope(mod_node, name)
-                return found_node
-            parent_node = scope_node.parent  # scope returns self
-            if parent_node is None:
-                # no parent scope
-                break
-            scope_node = parent_node.scope()
-
-        # no item found up to module - check other imported modules
-        return self.mod_dict.get(name)
+        return self.names.find_in_scope(scope_node, name)
 
     def find_callers(self, func: DefItem) -> Set[DefItem]:
         return get_direct_predecessors(self.use_dict, func)
@@ -406,22 +307,76 @@ class ItemContainer:
 # ============================================
 
 
+# dispatch tables of parsers: parser class -> (astroid node class -> handler function)
+HANDLERS_TABLES: Dict[type, Dict[type, Callable]] = {}
+
+
+# visitor of astroid tree dispatching nodes to handlers through table
+#
+# Handler of node class is found once (see 'VISIT_HANDLERS' and '_is_skipped()'), then it is taken from table.
+# Nodes without handler are traversed through their children. Subtrees that can not contain items handled
+# by parser are skipped.
 class BaseParser:
+    # pairs (astroid node class, name of handler method) - first pair matching node is used
+    VISIT_HANDLERS: List[Tuple[type, str]] = []
+    # node classes which subtrees does not contain nodes handled by parser
+    SKIP_TYPES: Tuple[type, ...] = ()
+
     def __init__(self, container: ItemContainer = None):
         if container is None:
             container = ItemContainer()
         self.items = container
+        self._handlers = HANDLERS_TABLES.setdefault(type(self), {})
 
     def analyze(self, astroid_node: astroid_nodes.Module):
         self._visit(astroid_node)
 
     def _visit(self, astroid_node):
-        # implement if needed
+        node_class = astroid_node.__class__
+        handler = self._handlers.get(node_class)
+        if handler is None:
+            handler = self._find_handler(node_class)
+            self._handlers[node_class] = handler
+        handler(self, astroid_node)
+
+    # returns unbound method handling nodes of given class
+    def _find_handler(self, node_class) -> Callable:
+        parser_class = type(self)
+        handler_name = "_visit_children"
+        for node_type, method_name in parser_class.VISIT_HANDLERS:
+            if issubclass(node_class, node_type):
+                handler_name = method_name
+                break
+        else:
+            if self._is_skipped(node_class):
+                handler_name = "_skip_node"
+        return getattr(parser_class, handler_name)
+
+    def _is_skipped(self, node_class) -> bool:
+        return issubclass(node_class, self.SKIP_TYPES)
+
+    def _skip_node(self, astroid_node):
         pass
 
+    # nodes without handler are traversed using explicit stack (in the same order as recursive traversal),
+    # so deeply nested code does not exceed recursion limit
     def _visit_children(self, astroid_node):
-        for child in astroid_node.get_children():
-            self._visit(child)
+        handlers = self._handlers
+        stack = [astroid_node.get_children()]
+        while stack:
+            for child in stack[-1]:
+                node_class = child.__class__
+                handler = handlers.get(node_class)
+                if handler is None:
+                    handler = self._find_handler(node_class)
+                    handlers[node_class] = handler
+                if handler is BaseParser._visit_children:
+                    # continue with children of node, remaining siblings are visited after them
+                    stack.append(child.get_children())
+                    break
+                handler(self, child)
+            else:
+                stack.pop()
 
     def _visit_list(self, nodes_list):
         for child in nodes_list:
@@ -457,24 +412,16 @@ class BaseParser:
 
 
 class DefParser(BaseParser):
-    def _visit(self, astroid_node):
-        _LOGGER.debug("visiting item: %s", type(astroid_node))
+    VISIT_HANDLERS = [
+        (astroid_nodes.Module, "visit_module"),
+        (astroid_nodes.ClassDef, "visit_classdef"),
+        (astroid_nodes.FunctionDef, "visit_functiondef"),
+    ]
 
-        if isinstance(astroid_node, astroid_nodes.Module):
-            self.visit_module(astroid_node)
-            return
-        if isinstance(astroid_node, astroid_nodes.ClassDef):
-            self.visit_classdef(astroid_node)
-            return
-        if isinstance(astroid_node, astroid_nodes.FunctionDef):
-            self.visit_functiondef(astroid_node)
-            return
-
-        self._visit_children(astroid_node)
-
-    def _visit_children(self, astroid_node):
-        for child in astroid_node.get_children():
-            self._visit(child)
+    def _is_skipped(self, node_class) -> bool:
+        # definitions are placed only in blocks of statements - expressions are skipped
+        # (including decorators, arguments and bases of classes)
+        return not node_class.is_statement and not issubclass(node_class, node_classes.MatchCase)
 
     # ============================================================
 
@@ -540,39 +487,44 @@ class DefParser(BaseParser):
 
 
 class UseParser(BaseParser):
-    def _visit(self, astroid_node):
-        _LOGGER.debug("visiting item: %s", type(astroid_node))
-
-        if isinstance(astroid_node, node_classes.Call):
-            # function call
-            self.visit_call(astroid_node)
-            return
-        if isinstance(astroid_node, node_classes.Keyword):
-            self.visit_keyword(astroid_node)
-            return
-        if isinstance(astroid_node, node_classes.AssignName):
-            # assign to variable
-            self.visit_assignname(astroid_node)
-            return
-        if isinstance(astroid_node, node_classes.AssignAttr):
-            # assign to attribute
-            self.visit_assignattr(astroid_node)
-            return
-        if isinstance(astroid_node, node_classes.AnnAssign):
-            self.visit_annassign(astroid_node)
-            return
-        if isinstance(astroid_node, node_classes.Attribute):
-            # read value from object's attribute
-            self.visit_attribute(astroid_node)
-            return
+    VISIT_HANDLERS = [
+        (astroid_nodes.FunctionDef, "visit_functiondef"),
+        (node_classes.Call, "visit_call"),  # function call
+        (node_classes.Keyword, "visit_keyword"),
+        (node_classes.AssignName, "visit_assignname"),  # assign to variable
+        (node_classes.AssignAttr, "visit_assignattr"),  # assign to attribute
+        (node_classes.AnnAssign, "visit_annassign"),
+        (node_classes.Attribute, "visit_attribute"),  # read value from object's attribute
+    ]
+    # leaf nodes and statements without uses
+    SKIP_TYPES = (
+        node_classes.Const,
+        node_classes.Name,
+        node_classes.DelName,
+        node_classes.Import,
+        node_classes.ImportFrom,
+        node_classes.Pass,
+        node_classes.Break,
+        node_classes.Continue,
+        node_classes.Global,
+        node_classes.Nonlocal,
+    )
 
-        self._visit_children(astroid_node)
+    # ============================================
 
-    def _visit_children(self, astroid_node):
-        for child in astroid_node.get_children():
-            self._visit(child)
+    # analyze uses of nodes collected by definitions analysis (see 'astgraph.fusedparser.FusedDefParser')
+    def analyze_candidates(self, candidates_list: List[NodeNG]):
+        for astroid_node in candidates_list:
+            if self.items.is_deadline_exceeded():
+                # no time left - skip remaining nodes
+                return
+            self._visit(astroid_node)
 
-    # ============================================
+    def visit_functiondef(self, astroid_node):
+        if self.items.is_deadline_exceeded():
+            # no time left - skip body of function
+            return
+        self._visit_children(astroid_node)
 
     def visit_call(self, astroid_node):
         _LOGGER.debug("visiting Call")
@@ -595,7 +547,7 @@ class UseParser(BaseParser):
             last_item: DefItem = def_list[-1]
             if last_item:
                 # None can occur for function calls (e.g. 'print')
-                last_callable = self._get_callable(last_item)
+                last_callable = self.items.get_callable(last_item)
                 self.items.append_use(user_def, last_callable)
 
         self._visit_list(astroid_node.args)
@@ -641,7 +593,7 @@ class UseParser(BaseParser):
             if scope_def is None:
                 raise RuntimeError("unable to find definition item")
             assign_name = astroid_node.name
-            child = scope_def.get_child(assign_name)
+            child = self.items.get_child(scope_def, assign_name)
             if child is None:
                 child = self.items.create_def(assign_name, DefItemType.MEMBER, astroid_node)
                 self.items.append_def(child)
@@ -679,7 +631,7 @@ class UseParser(BaseParser):
         if not inferred_hint:
             return
         hint_def = self.items.find_def_item(inferred_hint)
-        last_item.type_hint = hint_def
+        self.items.set_type_hint(last_item, hint_def)
 
     def visit_attribute(self, astroid_node):
         # read value from object's attribute
@@ -721,7 +673,7 @@ class UseParser(BaseParser):
         if not user_def:
             raise RuntimeError("unable to get user def item")
 
-        callable_def = type_def_item.get_child(target_attr_name)
+        callable_def = self.items.get_child(type_def_item, target_attr_name)
         if callable_def:
             # attribute already added
             self.items.append_use(user_def, callable_def)
@@ -745,49 +697,98 @@ class UseParser(BaseParser):
 
     # get item defined by attribute
     def _resolve_attribute(self, attr_node: NodeNG):
+        def_list = self._resolve_self_attribute(attr_node)
+        if def_list is not None:
+            return def_list
         full_call = self._get_attr_full_call(attr_node)
         return self._resolve_item(attr_node, full_call)
 
+    # resolve chain of attributes of 'self' (or 'cls') using items tree and type hints of members
+    # astroid is used only for members without type hint, returns None if chain is not handled
+    def _resolve_self_attribute(self, attr_node: NodeNG) -> Optional[List[DefItem]]:
+        chain_node = attr_node
+        if isinstance(chain_node, node_classes.Call):
+            chain_node = chain_node.func
+        attr_list = []
+        while isinstance(chain_node, (node_classes.Attribute, node_classes.AssignAttr)):
+            attr_list.insert(0, chain_node)
+            chain_node = chain_node.expr
+        if not attr_list or not isinstance(chain_node, node_classes.Name):
+            return None
+        class_node = get_self_class(chain_node)
+        if class_node is None:
+            return None
+        class_def = self.items.find_def_item(class_node)
+        if class_def is None:
+            return None
+
+        ret_list: List[Optional[DefItem]] = [None]  # 'self' is not an item
+        type_def: Optional[DefItem] = class_def
+        resolve_path = "tree"
+        for index, item_node in enumerate(attr_list):
+            if index > 0:
+                prev_def = ret_list[-1]
+                owner_def = type_def  # type of object containing previous member
+                type_def = self.items.get_type_hint(prev_def) if prev_def else None
+                if type_def is None:
+                    resolve_path = "astroid"
+                    inferred = self.items.chains.infer_member(owner_def, attr_list[index - 1])
+                    if inferred is not None:
+                        type_def = self.items.find_def_item(inferred)
+            if type_def is None:
+                ret_list.append(None)
+                continue
+            ret_list.append(self.items.get_child(type_def, item_node.attrname))
+        self.items.resolve_stats[resolve_path] += 1
+        return ret_list
+
     # ============================================
 
     def _get_attr_full_call(self, attr_node: NodeNG):
+        scope_node = attr_node.scope()
+        return self._get_attr_chain(scope_node, attr_node)[0]
+
+    # returns list of items of chain and key of chain (see 'astgraph.chaincache.get_chain_key()')
+    # types of prefixes of chain are shared by chains in the same scope
+    def _get_attr_chain(self, scope_node: NodeNG, attr_node: NodeNG):
+        chains = self.items.chains
         if isinstance(attr_node, (node_classes.Name, node_classes.AssignName)):
-            inferred = infer_type(attr_node)
+            chain_key = get_chain_key(attr_node, None)
+            inferred = chains.infer_prefix(scope_node, chain_key, attr_node)
             item_name = {"name": attr_node.name, "node": attr_node, "inferred": inferred}
-            return [item_name]
+            return ([item_name], chain_key)
 
-        if isinstance(attr_node, node_classes.Attribute):
-            inferred = infer_type(attr_node)
-            sub_list = self._get_attr_full_call(attr_node.expr)
-            item_attr = {"name": attr_node.attrname, "node": attr_node, "inferred": inferred}
-            sub_list.append(item_attr)
-            return sub_list
-
-        if isinstance(attr_node, node_classes.AssignAttr):
-            inferred = infer_type(attr_node)
-            sub_list = self._get_attr_full_call(attr_node.expr)
+        if isinstance(attr_node, (node_classes.Attribute, node_classes.AssignAttr)):
+            sub_list, sub_key = self._get_attr_chain(scope_node, attr_node.expr)
+            chain_key = get_chain_key(attr_node, sub_key)
+            inferred = chains.infer_prefix(scope_node, chain_key, attr_node)
             item_attr = {"name": attr_node.attrname, "node": attr_node, "inferred": inferred}
             sub_list.append(item_attr)
-            return sub_list
+            return (sub_list, chain_key)
 
         if isinstance(attr_node, node_classes.Call):
-            inferred = infer_type(attr_node)
-            sub_list = self._get_attr_full_call(attr_node.func)
+            sub_list, sub_key = self._get_attr_chain(scope_node, attr_node.func)
+            chain_key = get_chain_key(attr_node, sub_key)
+            is_named = isinstance(attr_node.func, (node_classes.Name, node_classes.Attribute))
+            func_node = sub_list[-1]["inferred"] if is_named else None  # called function
+            inferred = chains.infer_prefix(
+                scope_node, chain_key, attr_node, lambda node: self.items.returns.infer_call(node, func_node)
+            )
             if inferred and inferred.name != "NoneType":
                 sub_list[-1]["inferred"] = inferred
-            return sub_list
+            return (sub_list, chain_key)
 
         if isinstance(attr_node, node_classes.Subscript):
+            sub_list, _ = self._get_attr_chain(scope_node, attr_node.value)
             inferred = infer_type(attr_node)
-            sub_list = self._get_attr_full_call(attr_node.value)
             sub_list[-1]["inferred"] = inferred
-            return sub_list
+            return (sub_list, None)
 
         # msg = get_message("unhandled case", attr_node)
         # raise RuntimeError(msg)
 
         # ignore type
-        return []
+        return ([], None)
 
     def _resolve_item(self, attr_node: NodeNG, item_list) -> List[DefItem]:
         if not item_list:
@@ -824,10 +825,10 @@ class UseParser(BaseParser):
                 continue
 
             item_name = item["name"]
-            item_def: DefItem = prev_type_def.get_child(item_name)
+            item_def: DefItem = self.items.get_child(prev_type_def, item_name)
             item["def"] = item_def
             if item_def:
-                item["type_def"] = item_def.type_hint
+                item["type_def"] = self.items.get_type_hint(item_def)
 
         ret_list = []
         for item in item_list:
@@ -841,27 +842,23 @@ class UseParser(BaseParser):
         # item_type: Optional[DefItem] = self._get_type_item(func_name)
         if item_type is None:
             return None
-        return self._get_callable(item_type)
+        return self.items.get_callable(item_type)
 
-    def _get_callable(self, item_type: DefItem):
-        if not isinstance(item_type, ClassItem):
-            # calling function
-            return item_type
-        item_ctor: DefItem = self._get_ctor(item_type)
-        if not item_type.explicit_ctor:
-            for base_def in item_type.bases:
-                base_ctor: DefItem = self._get_ctor(base_def)
-                self.items.append_use(item_ctor, base_ctor)
-        return item_ctor
 
-    def _get_ctor(self, item_type: ClassItem) -> DefItem:
-        ctor_item: DefItem = item_type.get_child_direct("__init__")
-        if ctor_item is not None:
-            return ctor_item
-        # constructor not explicitly defined - add node
-        ctor_item = self.items.create_def("__init__", DefItemType.DEF_METHOD, None)
-        self.items.append_def_parent(item_type, ctor_item)
-        return ctor_item
+# ============================================
+
+
+# use parser limited to nodes declaring members (assignments and annotations)
+class DeclarationParser(UseParser):
+    def visit_call(self, astroid_node):
+        self._visit_list(astroid_node.args)
+        self._visit_list(astroid_node.keywords)
+
+    def visit_keyword(self, astroid_node):
+        pass
+
+    def visit_attribute(self, astroid_node):
+        pass
 
 
 # ============================================
@@ -870,65 +867,167 @@ class UseParser(BaseParser):
 class TreeParser:
     def __init__(self):
         self.items = ItemContainer()
+        self.prefetcher = None  # reader of files in background (see 'astgraph.prefetch.SourcePrefetcher')
+        self._updater = None  # incremental updates of results
+        # nodes to analyze by use parser collected by definitions analysis (see 'astgraph.fusedparser')
+        self._use_candidates: Dict[astroid_nodes.Module, List[NodeNG]] = {}
 
     def analyze(self, astroid_node: astroid_nodes.Module):
         self.items.add_mod(astroid_node)
-
-        _LOGGER.info("=== analyzing astroid definitions ===")
-        def_parser = DefParser(self.items)
-        def_parser.analyze(astroid_node)
-
-        _LOGGER.info("=== analyzing astroid usage ===")
-        use_parser = UseParser(self.items)
-        use_parser.analyze(astroid_node)
+        self.analyze_defs([astroid_node], collect_uses=True)
+        self.analyze_uses([astroid_node])
 
     def analyze_code(self, code, module_name=""):
         astroid_node = astroid.parse(code)
         astroid_node.name = module_name
         self.analyze(astroid_node)
 
-    def analyze_files(self, files_list):
-        root_paths = set()
-        for src_file_path in files_list:
-            pkg_root = get_package_root(src_file_path)
-            root_paths.add(pkg_root)
-        for pkg_root in root_paths:
-            # fixes importing packages from Import and ImportFrom node
-            sys.path.append(pkg_root)
+    # 'jobs' - number of processes analyzing uses of files
+    # 'cache' - cache of analysis results (see 'astgraph.cache.AnalysisCache'), 'jobs' is ignored if given
+    # 'files_list' can be iterator in case of sequential analysis without cache
+    def analyze_files(self, files_list, jobs=1, cache=None):
+        # memoized inference results refer to nodes of previous analyses
+        INFERENCE_CACHE.clear()
+        if cache is not None or jobs > 1:
+            files_list = list(files_list)
+        if cache is not None:
+            from astgraph.cache import analyze_cached
+
+            analyze_cached(self, files_list, cache)
+        elif jobs > 1 and len(files_list) > 1:
+            from astgraph.parallel import analyze_parallel
+
+            analyze_parallel(self, files_list, jobs)
+        else:
+            astroid_tree_list = self.load_files(files_list)
+            self.analyze_defs(astroid_tree_list, collect_uses=True)
+            self.analyze_uses(astroid_tree_list)
 
+        self._mark_override_use()
+        if self.items.partial:
+            _LOGGER.warning("analysis stopped by deadline, results are partial")
+        _LOGGER.info(
+            "inference cache stats: %s budget stats: %s resolve stats: %s names stats: %s chains stats: %s"
+            " returns stats: %s boundary stats: %s",
+            INFERENCE_CACHE.get_stats(),
+            INFERENCE_BUDGET.get_stats(),
+            self.items.resolve_stats,
+            self.items.names.get_stats(),
+            self.items.chains.get_stats(),
+            self.items.returns.get_stats(),
+            PROJECT_BOUNDARY.get_stats(),
+        )
+
+    # analyze uses only of items reachable from items matching 'filter_obj' (or from entry modules)
+    # see 'astgraph.demand.analyze_demand'
+    def analyze_reachable(self, files_list, filter_obj=None):
+        from astgraph.demand import analyze_demand
+
+        INFERENCE_CACHE.clear()
+        analyze_demand(self, files_list, filter_obj)
+        self._mark_override_use()
+        if self.items.partial:
+            _LOGGER.warning("analysis stopped by deadline, results are partial")
+
+    # analyze files using standard 'ast' module, astroid infers only unresolved chains of attributes
+    # see 'astgraph.fastengine.analyze_fast'
+    def analyze_fast(self, files_list):
+        from astgraph.fastengine import analyze_fast
+
+        INFERENCE_CACHE.clear()
+        analyze_fast(self, files_list)
+        self.items.approximate = True
+        self._mark_override_use()
+        if self.items.partial:
+            _LOGGER.warning("analysis stopped by deadline, results are partial")
+
+    # 'files_list' can be iterator (e.g. 'astgraph.discovery.iter_files()') - files are loaded as they come
+    def load_files(self, files_list) -> List[astroid_nodes.Module]:
+        if self.prefetcher is not None:
+            sources_iter = self.prefetcher.iter_sources(files_list)
+        else:
+            sources_iter = ((file_path, None) for file_path in files_list)
         astroid_tree_list = []
-        for src_file_path in files_list:
-            astroid_tree: astroid_nodes.Module = astroid.MANAGER.ast_from_file(src_file_path)
+        for src_file_path, content in sources_iter:
+            # imports are resolved after all files are loaded
+            add_search_paths([src_file_path])
+            astroid_tree: astroid_nodes.Module = load_module(src_file_path, content)
             self.items.add_mod(astroid_tree)
             astroid_tree_list.append(astroid_tree)
+        if self.prefetcher is not None:
+            _LOGGER.info("prefetch stats: %s", self.prefetcher.get_stats())
+        return astroid_tree_list
 
-        # ===== analyze definitions =====
+    # 'collect_uses' - collect nodes for next call of 'analyze_uses()', so it does not traverse trees again
+    def analyze_defs(self, astroid_tree_list: List[astroid_nodes.Module], collect_uses=False):
         for astroid_tree in astroid_tree_list:
             try:
                 _LOGGER.info("=== analyzing astroid definitions: %s", astroid_tree.file)
-                def_parser = DefParser(self.items)
-                def_parser.analyze(astroid_tree)
+                if collect_uses:
+                    from astgraph.fusedparser import FusedDefParser
+
+                    def_parser = FusedDefParser(self.items)
+                    def_parser.analyze(astroid_tree)
+                    self._use_candidates[astroid_tree] = def_parser.candidates
+                else:
+                    def_parser = DefParser(self.items)
+                    def_parser.analyze(astroid_tree)
             except:  # noqa
                 _LOGGER.error("unable to analyze file %s", astroid_tree.file)
                 raise
 
-        # ===== analyze uses =====
-        for astroid_tree in astroid_tree_list:
+    def analyze_uses(self, astroid_tree_list: List[astroid_nodes.Module]):
+        for index, astroid_tree in enumerate(astroid_tree_list):
+            if self.items.is_deadline_exceeded():
+                _LOGGER.warning(
+                    "deadline exceeded, skipping usage analysis of %s files", len(astroid_tree_list) - index
+                )
+                for skipped_tree in astroid_tree_list[index:]:
+                    self._use_candidates.pop(skipped_tree, None)
+                return
             try:
                 _LOGGER.info("=== analyzing astroid usage: %s", astroid_tree.file)
                 use_parser = UseParser(self.items)
-                use_parser.analyze(astroid_tree)
+                candidates_list = self._use_candidates.pop(astroid_tree, None)
+                if candidates_list is not None:
+                    use_parser.analyze_candidates(candidates_list)
+                else:
+                    use_parser.analyze(astroid_tree)
             except:  # noqa
                 _LOGGER.error("unable to analyze file %s", astroid_tree.file)
                 raise
 
+    # release astroid trees after analysis, so they do not occupy memory while results are processed
+    # results can not be updated afterwards ('update_file()' and 'remove_file()')
+    def release_trees(self):
+        self.items.release_nodes()
+        self._use_candidates.clear()
+        self._updater = None
+        clear_astroid_caches()
+
+    # analyze again given file (new or modified) and modules depending on it
+    def update_file(self, file_path):
+        self._get_updater().update_file(file_path)
+        self._mark_override_use()
+
+    # remove given file from results and analyze again modules depending on it
+    def remove_file(self, file_path):
+        self._get_updater().remove_file(file_path)
         self._mark_override_use()
 
+    def _get_updater(self):
+        if self._updater is None:
+            from astgraph.incremental import IncrementalUpdater
+
+            self._updater = IncrementalUpdater(self)
+        return self._updater
+
     def _mark_override_use(self):
         # static deduction of exact method invocation in case of method override is hard
         # this method is workaround for the problem: it marks all overrides
 
-        defs_list = self.items.get_def_list()
+        # iterate in order of creation - keeps order of uses independent of memory layout
+        defs_list = self.items.def_items
         # def_item: DefItem
         for def_item in defs_list:
             if not def_item.is_class():
@@ -954,39 +1053,3 @@ class TreeParser:
                         if caller == def_subitem:
                             continue
                         self.items.append_use(caller, def_subitem)
-
-
-# ============================================
-
-
-def get_modname(file_path):
-    package_root = get_package_root(file_path)
-    file_modname = get_file_modname(file_path)
-    relative_path = os.path.relpath(file_modname, package_root)
-    module_name = relative_path.replace("/", ".")
-    module_name = module_name.replace("\\", ".")
-    return module_name
-
-
-def get_package_root(file_path):
-    abs_path = os.path.abspath(file_path)
-    prev_dirname = abs_path
-    dir_name = prev_dirname
-    while True:
-        dir_name = os.path.dirname(dir_name)
-        if dir_name == prev_dirname:
-            # no __init__.py found in path directories
-            break
-        if not _has_init(dir_name):
-            return dir_name
-        prev_dirname = dir_name
-
-    # no top package found
-    return os.path.dirname(file_path)
-
-
-# return file path without extension
-def get_file_modname(file_path):
-    dir_name = os.path.dirname(file_path)
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
-    return os.path.join(dir_name, base_name)
@@ -8,8 +8,14 @@
 
 import os
 import json
+import tempfile
+import unittest
+from typing import List
+
 import yaml
 
+import astroid
+
 
 SCRIPT_DIR = os.path.dirname(__file__)
 
@@ -22,6 +28,11 @@ def get_data_path(fileName: str) -> str:
     return os.path.join(SCRIPT_DIR, fileName)
 
 
+# returns paths of given files of sample code in directory 'code/<dir_name>'
+def get_code_files(dir_name, files_list) -> List[str]:
+    return [os.path.join(SCRIPT_DIR, "code", dir_name, file_name) for file_name in files_list]
+
+
 def load_json(fileName: str):
     data_path = get_data_path(fileName)
     with open(data_path, encoding="utf-8") as data_file:
@@ -32,3 +43,32 @@ def load_yaml(fileName: str):
     data_path = get_data_path(fileName)
     with open(data_path, encoding="utf-8") as data_file:
         return yaml.full_load(data_file)
+
+
+def write_file(file_path, content=""):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as out_file:
+        out_file.write(content)
+
+
+# writes package to directory 'root_dir', returns paths of files in given order
+# 'files' - list of pairs (name of file, content)
+def write_package(root_dir, package_name, files) -> List[str]:
+    files_list = []
+    for file_name, content in files:
+        file_path = os.path.join(root_dir, package_name, file_name)
+        write_file(file_path, content)
+        files_list.append(file_path)
+    return files_list
+
+
+# test case of code written to temporary directory ('temp_dir')
+class TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        # modules of the same name could be loaded by other tests
+        astroid.MANAGER.clear_cache()
+        # pylint: disable=R1732
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
@@ -0,0 +1,129 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import time
+
+import astroid
+
+from testastgraph.sample import TempDirTestCase, write_file, write_package
+
+from astgraph.treeparser import TreeParser
+from astgraph.cache import AnalysisCache
+from astgraph.inference import INFERENCE_BUDGET
+
+
+ITEM_CODE = """
+class Item:
+    def __init__(self):
+        self.value = 0
+
+    def do_work(self):
+        print("working")
+"""
+
+USER_CODE = """
+from cachepkg.item import Item
+
+
+def main():
+    itemobj = Item()
+    itemobj.do_work()
+    itemobj.value = 1
+"""
+
+OTHER_CODE = """
+def other():
+    return 1
+
+
+def call_other():
+    return other()
+"""
+
+
+def analyze(files_list, cache=None):
+    parser = TreeParser()
+    parser.analyze_files(files_list, cache=cache)
+    return parser
+
+
+class AnalysisCacheTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        files = [("__init__.py", ""), ("item.py", ITEM_CODE), ("user.py", USER_CODE), ("other.py", OTHER_CODE)]
+        self.files_list = write_package(os.path.join(self.temp_dir.name, "code"), "cachepkg", files)
+
+    def test_cache_hit(self):
+        expected = analyze(self.files_list)
+
+        cache = AnalysisCache(self.cache_dir)
+        parser = analyze(self.files_list, cache)
+        self.assertEqual(cache.get_stats(), {"hits": 0, "misses": 4, "evictions": 0})
+        self.assertEqual(parser.items.get_def_list_info(), expected.items.get_def_list_info())
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
+
+        cache = AnalysisCache(self.cache_dir)
+        parser = analyze(self.files_list, cache)
+        self.assertEqual(cache.get_stats(), {"hits": 4, "misses": 0, "evictions": 0})
+        # all modules restored from cache
+        self.assertEqual(len(parser.items.mod_dict), 0)
+        self.assertEqual(parser.items.get_def_list_info(), expected.items.get_def_list_info())
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
+
+    def test_cache_changed_import(self):
+        analyze(self.files_list, AnalysisCache(self.cache_dir))
+
+        item_path = self.files_list[1]
+        write_file(item_path, ITEM_CODE + "\n    def do_more(self):\n        pass\n")
+        astroid.MANAGER.clear_cache()
+        expected = analyze(self.files_list)
+
+        cache = AnalysisCache(self.cache_dir)
+        parser = analyze(self.files_list, cache)
+        # changed 'item' and 'user' importing it
+        self.assertEqual(cache.get_stats(), {"hits": 2, "misses": 2, "evictions": 0})
+        self.assertEqual(parser.items.get_def_list_info(), expected.items.get_def_list_info())
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
+
+    def test_cache_deadline(self):
+        expected = analyze(self.files_list)
+
+        parser = TreeParser()
+        parser.items.deadline = time.time()
+        parser.analyze_files(self.files_list, cache=AnalysisCache(self.cache_dir))
+        self.assertTrue(parser.items.partial)
+
+        # uses not analyzed because of deadline are not stored
+        cache = AnalysisCache(self.cache_dir)
+        parser = analyze(self.files_list, cache)
+        self.assertEqual(cache.get_stats(), {"hits": 0, "misses": 4, "evictions": 0})
+        self.assertFalse(parser.items.partial)
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
+
+    def test_cache_options(self):
+        INFERENCE_BUDGET.configure(max_inferred=1)
+        try:
+            analyze(self.files_list, AnalysisCache(self.cache_dir))
+        finally:
+            INFERENCE_BUDGET.configure()
+
+        # entries of analysis with other inference budget are not reused
+        cache = AnalysisCache(self.cache_dir)
+        analyze(self.files_list, cache)
+        self.assertEqual(cache.get_stats(), {"hits": 0, "misses": 4, "evictions": 0})
+        cache = AnalysisCache(self.cache_dir)
+        analyze(self.files_list, cache)
+        self.assertEqual(cache.get_stats(), {"hits": 4, "misses": 0, "evictions": 0})
+
+    def test_cache_evict(self):
+        cache = AnalysisCache(self.cache_dir, max_size=1)
+        analyze(self.files_list, cache)
+        self.assertEqual(cache.evictions, 4)
+        self.assertEqual(os.listdir(self.cache_dir), [])
@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+import astroid
+
+from astgraph.treeparser import TreeParser
+from astgraph.chaincache import is_single_binding, get_chain_key
+
+
+CHAIN_CODE = """\
+class Item:
+    def work(self):
+        return self
+
+    def stop(self):
+        pass
+
+
+class Holder:
+    def __init__(self):
+        self.item = Item()
+
+    def get(self):
+        return self.item
+
+
+def func():
+    holder = Holder()
+    holder.get().work().stop()
+    holder.get().work()
+    holder.get().stop()
+"""
+
+
+class ChainCacheTest(unittest.TestCase):
+    def test_single_binding(self):
+        module_node = astroid.parse(
+            "import os\nvalue = 1\nvalue = 2\nclass ABC:\n    os = 1\n    def method(self):\n        os.sep\n",
+            module_name="testmod",
+        )
+        name_list = list(module_node.nodes_of_class(astroid.nodes.Name))
+        self.assertEqual(name_list[0].name, "os")
+        # class scope is not visible in method
+        self.assertTrue(is_single_binding(name_list[0]))
+
+        func_node = astroid.extract_node("def func(arg):\n    arg = arg or 1\n    return arg #@\n")
+        self.assertFalse(is_single_binding(func_node.value))
+
+    def test_chain_key(self):
+        call_node = astroid.extract_node("obj = 1\nobj.get() #@\n")
+        attr_key = get_chain_key(call_node.func, get_chain_key(call_node.func.expr, None))
+        self.assertEqual(attr_key, "obj.get")
+        self.assertEqual(get_chain_key(call_node, attr_key), "obj.get()")
+
+        call_node = astroid.extract_node("obj = 1\nobj.get(1) #@\n")
+        self.assertIsNone(get_chain_key(call_node, "obj.get"))
+        name_node = astroid.extract_node("obj = 1\nobj = 2\nobj #@\n")
+        self.assertIsNone(get_chain_key(name_node, None))
+
+    def test_siblings(self):
+        parser = TreeParser()
+        parser.analyze_code(module_name="testmod", code=CHAIN_CODE)
+        use_list = parser.items.get_use_list()
+        self.assertIn(("testmod.func", "testmod.Item.stop"), use_list)
+        self.assertIn(("testmod.func", "testmod.Item.work"), use_list)
+        self.assertIn(("testmod.func", "testmod.Holder.get"), use_list)
+
+        # prefixes 'holder', 'holder.get()' and 'holder.get().work()' are inferred once
+        chains = parser.items.chains
+        self.assertEqual(
+            chains.prefix_dict[(parser.items.mod_dict["testmod"].locals["func"][0], "holder.get()")].name, "Item"
+        )
+        self.assertGreaterEqual(chains.hits, 5)
+
+        parser.release_trees()
+        self.assertEqual(chains.prefix_dict, {})
@@ -0,0 +1,79 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import time
+import unittest
+
+import astroid
+
+from testastgraph.sample import get_code_files
+
+from astgraph.treeparser import TreeParser, DefParser, UseParser
+
+
+class TreeParserDeadlineTest(unittest.TestCase):
+    def test_analyze_files_expired(self):
+        files_list = get_code_files("multifileimportfrom", ["modulea.py", "item.py"])
+
+        expected = TreeParser()
+        expected.analyze_files(files_list)
+
+        parser = TreeParser()
+        parser.items.deadline = time.time()
+        parser.analyze_files(files_list)
+
+        # definitions are complete, uses are skipped
+        self.assertTrue(parser.items.partial)
+        self.assertEqual(parser.items.get_def_list_info(), expected.items.get_def_list_info())
+        self.assertEqual(parser.items.get_use_list(), [])
+
+    def test_analyze_files_parallel_expired(self):
+        files_list = get_code_files("multifileimportfrom", ["modulea.py", "item.py"])
+
+        parser = TreeParser()
+        parser.items.deadline = time.time()
+        parser.analyze_files(files_list, jobs=2)
+
+        self.assertTrue(parser.items.partial)
+        self.assertEqual(parser.items.get_use_list(), [])
+
+    def test_analyze_files_in_time(self):
+        files_list = get_code_files("multifileimportfrom", ["modulea.py", "item.py"])
+
+        expected = TreeParser()
+        expected.analyze_files(files_list)
+
+        parser = TreeParser()
+        parser.items.deadline = time.time() + 3600
+        parser.analyze_files(files_list)
+
+        self.assertFalse(parser.items.partial)
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
+
+    def test_skip_function_body(self):
+        code = """
+def func1():
+    pass
+
+def func2():
+    func1()
+
+func1()
+"""
+        astroid_node = astroid.parse(code)
+        astroid_node.name = "deadline"
+
+        parser = TreeParser()
+        parser.items.add_mod(astroid_node)
+        DefParser(parser.items).analyze(astroid_node)
+        parser.items.deadline = time.time()
+        UseParser(parser.items).analyze(astroid_node)
+
+        # module level code is analyzed, body of 'func2' is skipped
+        self.assertTrue(parser.items.partial)
+        self.assertEqual(parser.items.get_use_list(), [("deadline", "deadline.func1")])
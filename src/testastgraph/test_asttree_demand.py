@@ -0,0 +1,58 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import re
+import unittest
+
+from testastgraph.sample import get_code_files
+
+from astgraph.graphtheory import Filter
+from astgraph.treeparser import TreeParser
+
+
+class NameFilter(Filter):
+    def is_matching(self, item):
+        return self._is_matching(item.get_full_name())
+
+
+class TreeParserReachableTest(unittest.TestCase):
+    def test_analyze_reachable_filter(self):
+        files_list = get_code_files("inherit", ["override01.py"])
+        filter_obj = NameFilter([re.compile(r"inherit\.override01\.Base\.execute")])
+
+        parser = TreeParser()
+        parser.analyze_reachable(files_list, filter_obj)
+
+        # module code is not reachable from filtered item
+        use_list = parser.items.get_use_list()
+        self.assertEqual(len(use_list), 2)
+        self.assertEqual(use_list[0], ("inherit.override01.Base.execute", "inherit.override01.Base.do_work"))
+        self.assertEqual(use_list[1], ("inherit.override01.Base.execute", "inherit.override01.Item.do_work"))
+
+    def test_analyze_reachable_entry(self):
+        files_list = get_code_files("multifileimportfrom", ["__main__.py", "modulea.py", "item.py"])
+
+        parser = TreeParser()
+        parser.analyze_reachable(files_list)
+
+        use_list = parser.items.get_use_list()
+        self.assertEqual(len(use_list), 3)
+        self.assertEqual(use_list[0], ("multifileimportfrom.__main__", "multifileimportfrom.modulea.main"))
+        self.assertEqual(use_list[1], ("multifileimportfrom.modulea.main", "multifileimportfrom.item.Item.__init__"))
+        self.assertEqual(use_list[2], ("multifileimportfrom.modulea.main", "multifileimportfrom.item.Item.do_work"))
+
+    def test_analyze_reachable_all(self):
+        files_list = get_code_files("inherit", ["override01.py"])
+
+        expected = TreeParser()
+        expected.analyze_files(files_list)
+
+        # no entry modules - all files analyzed
+        parser = TreeParser()
+        parser.analyze_reachable(files_list)
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
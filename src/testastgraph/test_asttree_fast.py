@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import tempfile
+import unittest
+
+from testastgraph.sample import get_code_files
+
+from astgraph.fastengine import analyze_fast
+from astgraph.treeparser import TreeParser
+
+
+ITEM_CODE = """
+class Item:
+    def do_work(self):
+        print("working")
+
+
+class Runner:
+    def __init__(self, item: Item):
+        self.item = item
+
+    def run(self):
+        self.item.do_work()
+
+
+def run_all():
+    items_list = [Item(), Item()]
+    for item in items_list:
+        item.do_work()
+"""
+
+
+def get_uses(files_list, engine):
+    parser = TreeParser()
+    if engine == "fast":
+        parser.analyze_fast(files_list)
+    else:
+        parser.analyze_files(files_list)
+    return sorted(parser.items.get_use_list()), sorted(parser.items.get_def_list_info(), key=str)
+
+
+class FastEngineTest(unittest.TestCase):
+    def test_analyze_importfrom(self):
+        files_list = get_code_files("multifileimportfrom", ["__main__.py", "modulea.py", "item.py"])
+        uses_list, defs_list = get_uses(files_list, "fast")
+        self.assertEqual(
+            uses_list,
+            [
+                ("multifileimportfrom.__main__", "multifileimportfrom.modulea.main"),
+                ("multifileimportfrom.modulea.main", "multifileimportfrom.item.Item.__init__"),
+                ("multifileimportfrom.modulea.main", "multifileimportfrom.item.Item.do_work"),
+            ],
+        )
+        self.assertEqual((uses_list, defs_list), get_uses(files_list, "astroid"))
+
+    def test_analyze_inherit(self):
+        files_list = get_code_files("inherit", ["inherit01.py", "inherit02.py", "inherit03.py", "override01.py"])
+        self.assertEqual(get_uses(files_list, "fast"), get_uses(files_list, "astroid"))
+
+    def test_analyze_fallback(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "fastitem.py")
+            with open(file_path, "w", encoding="utf-8") as out_file:
+                out_file.write(ITEM_CODE)
+
+            parser = TreeParser()
+            engine = analyze_fast(parser, [file_path])
+
+            uses_list = parser.items.get_use_list()
+            # resolved by annotation of argument
+            self.assertIn(("fastitem.Runner.run", "fastitem.Item.do_work"), uses_list)
+            # item of list resolved by astroid
+            self.assertIn(("fastitem.run_all", "fastitem.Item.do_work"), uses_list)
+            self.assertEqual(engine.stats["astroid"], 1)
+            self.assertEqual(engine.stats["astroid_modules"], 1)
@@ -0,0 +1,63 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import glob
+import unittest
+
+import astroid
+
+from testastgraph.sample import get_data_root_path
+
+from astgraph.treeparser import TreeParser
+from astgraph.fusedparser import FusedDefParser
+
+
+def get_code_files():
+    data_root_path = get_data_root_path()
+    code_path = os.path.join(data_root_path, "code")
+    return sorted(glob.glob(f"{code_path}/**/*.py", recursive=True))
+
+
+def analyze(files_list, collect_uses):
+    parser = TreeParser()
+    astroid_tree_list = parser.load_files(files_list)
+    parser.analyze_defs(astroid_tree_list, collect_uses=collect_uses)
+    parser.analyze_uses(astroid_tree_list)
+    return parser
+
+
+class FusedDefParserTest(unittest.TestCase):
+    def test_candidates_forward(self):
+        # base class is defined by "forward declaration" when resolving bases of 'Item'
+        code = """
+class Item(Base):
+    def run(self):
+        self.work()
+
+class Base:
+    def work(self):
+        return len([])
+"""
+        astroid_node = astroid.parse(code)
+        parser = TreeParser()
+        def_parser = FusedDefParser(parser.items)
+        def_parser.analyze(astroid_node)
+
+        # candidates in order of tree traversal
+        candidates = [node.as_string() for node in def_parser.candidates]
+        self.assertEqual(candidates, ["self", "self.work()", "self", "len([])"])
+
+    def test_analyze_files(self):
+        files_list = get_code_files()
+
+        expected = analyze(files_list, False)
+        parser = analyze(files_list, True)
+
+        self.assertEqual(parser.items.get_def_list_info(), expected.items.get_def_list_info())
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
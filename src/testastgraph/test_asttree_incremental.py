@@ -0,0 +1,109 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+
+from testastgraph.sample import TempDirTestCase, write_file, write_package
+
+from astgraph.treeparser import TreeParser
+from astgraph.modpath import load_module, get_import_name, clear_package_roots
+from astgraph.importgraph import read_module
+
+
+ITEM_CODE = """
+class Item:
+    def __init__(self):
+        self.value = 0
+
+    def do_work(self):
+        print("working")
+"""
+
+USER_CODE = """
+from incpkg.item import Item
+
+
+def main():
+    itemobj = Item()
+    itemobj.do_work()
+    itemobj.do_more()
+"""
+
+OTHER_CODE = """
+def other():
+    return 1
+
+
+def call_other():
+    return other()
+"""
+
+
+def get_state(parser):
+    items = parser.items
+    return (sorted(items.get_def_list_info(), key=str), sorted(items.get_use_list()))
+
+
+class TreeParserIncrementalTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        files = [("__init__.py", ""), ("item.py", ITEM_CODE), ("user.py", USER_CODE), ("other.py", OTHER_CODE)]
+        self.files_list = write_package(self.temp_dir.name, "incpkg", files)
+
+    def test_update_file(self):
+        parser = TreeParser()
+        parser.analyze_files(self.files_list)
+        self.assertNotIn(("incpkg.user.main", "incpkg.item.Item.do_more"), parser.items.get_use_list())
+
+        item_path = self.files_list[1]
+        write_file(item_path, ITEM_CODE + "\n    def do_more(self):\n        pass\n")
+        parser.update_file(item_path)
+        self.assertIn(("incpkg.user.main", "incpkg.item.Item.do_more"), parser.items.get_use_list())
+
+        expected = TreeParser()
+        expected.analyze_files(self.files_list)
+        self.assertEqual(get_state(parser), get_state(expected))
+
+    def test_remove_file(self):
+        parser = TreeParser()
+        parser.analyze_files(self.files_list)
+
+        other_path = self.files_list[3]
+        parser.remove_file(other_path)
+        self.assertNotIn("incpkg.other", parser.items.mod_dict)
+
+        expected = TreeParser()
+        expected.analyze_files(self.files_list[:3])
+        self.assertEqual(get_state(parser), get_state(expected))
+
+        # restore
+        parser.update_file(other_path)
+        expected = TreeParser()
+        expected.analyze_files(self.files_list)
+        self.assertEqual(get_state(parser), get_state(expected))
+
+    def test_module_names(self):
+        # nested package inside directory without '__init__.py'
+        sub_dir = os.path.join(self.temp_dir.name, "outer", "inner", "sub")
+        write_file(os.path.join(self.temp_dir.name, "outer", "inner", "__init__.py"), "")
+        init_path = os.path.join(sub_dir, "__init__.py")
+        write_file(init_path, "from inner.sub.mod import Mod\n")
+        mod_path = os.path.join(sub_dir, "mod.py")
+        write_file(mod_path, "class Mod:\n    pass\n")
+        clear_package_roots()
+
+        for file_path, module_name in [(init_path, "inner.sub"), (mod_path, "inner.sub.mod")]:
+            self.assertEqual(get_import_name(file_path), module_name)
+            self.assertEqual(read_module(file_path).module_name, module_name)
+            self.assertEqual(load_module(file_path).name, module_name)
+
+        parser = TreeParser()
+        parser.analyze_files([init_path, mod_path])
+        write_file(init_path, "from inner.sub.mod import Mod\n\n\ndef make():\n    return Mod()\n")
+        parser.update_file(init_path)
+        self.assertIn(("inner.sub.make", "inner.sub.mod.Mod.__init__"), parser.items.get_use_list())
@@ -0,0 +1,160 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import sys
+import signal
+import unittest
+
+import astroid
+import astroid.context as astroid_context
+from astroid.builder import AstroidBuilder
+
+from testastgraph.sample import get_data_root_path, get_code_files
+
+import astgraph
+
+from astgraph.treeparser import TreeParser
+from astgraph.inference import INFERENCE_CACHE, INFERENCE_BUDGET, BUILD_FUNCS, DEFAULT_MAX_INFERRED
+from astgraph.inference import InferenceCache, InferenceBudget, ProjectBoundary, infer_type
+
+
+class InferenceCacheTest(unittest.TestCase):
+    def test_get(self):
+        module_node = astroid.parse("value = 1\nunknown_name\n")
+        value_node = module_node.body[0].value
+        unknown_node = module_node.body[1].value
+
+        cache = InferenceCache()
+        self.assertEqual(cache.get("infer_type", value_node, infer_type).name, "int")
+        self.assertEqual(cache.get("infer_type", value_node, infer_type).name, "int")
+        # negative result is also stored
+        self.assertIsNone(cache.get("infer_type", unknown_node, infer_type))
+        self.assertIsNone(cache.get("infer_type", unknown_node, infer_type))
+        self.assertEqual(cache.get_stats(), {"hits": 2, "misses": 2, "evictions": 0, "size": 2})
+
+    def test_evict(self):
+        module_node = astroid.parse("value1 = 1\nvalue2 = 2\n")
+        value1_node = module_node.body[0].value
+        value2_node = module_node.body[1].value
+
+        cache = InferenceCache(max_size=1)
+        cache.get("infer_type", value1_node, infer_type)
+        cache.get("infer_type", value2_node, infer_type)
+        cache.get("infer_type", value1_node, infer_type)
+        self.assertEqual(cache.get_stats(), {"hits": 0, "misses": 3, "evictions": 2, "size": 1})
+
+    def test_analysis_clear(self):
+        parser = TreeParser()
+        parser.analyze_files(get_code_files("multifileimportfrom", ["modulea.py", "item.py"]))
+        # references keep ids of nodes unique
+        prev_nodes = [entry[0] for entry in INFERENCE_CACHE._entries.values()]  # pylint: disable=W0212
+        self.assertTrue(prev_nodes)
+
+        # results of previous analysis are not kept by next analysis
+        parser = TreeParser()
+        parser.analyze_files([os.path.join(get_data_root_path(), "code", "simple_runner.py")])
+        next_ids = {id(entry[0]) for entry in INFERENCE_CACHE._entries.values()}  # pylint: disable=W0212
+        self.assertFalse({id(node) for node in prev_nodes} & next_ids)
+
+
+# timer of budget expires during inference (signal is delivered without waiting for timer)
+def expired_infer(_astroid_node):
+    signal.raise_signal(signal.SIGALRM)
+    return 1
+
+
+def recursive_infer(astroid_node):
+    return recursive_infer(astroid_node)
+
+
+class InferenceBudgetTest(unittest.TestCase):
+    def test_timeout(self):
+        module_node = astroid.parse("value = 1\n")
+        budget = InferenceBudget()
+        # timer does not expire by itself during test
+        budget.configure(timeout=60000)
+        prev_handler = signal.getsignal(signal.SIGALRM)
+        self.assertEqual(budget.run(lambda _node: 1, module_node.body[0].value), 1)
+        self.assertEqual(budget.get_stats(), {"exceeded": 0})
+
+        self.assertIsNone(budget.run(expired_infer, module_node.body[0].value))
+        self.assertEqual(budget.get_stats(), {"exceeded": 1})
+        # timer is stopped and handler restored
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+        self.assertIs(signal.getsignal(signal.SIGALRM), prev_handler)
+
+    def test_unraisable_hook(self):
+        prev_hook = sys.unraisablehook
+        budget = InferenceBudget()
+        budget.configure(timeout=60000)
+        self.assertIsNot(sys.unraisablehook, prev_hook)
+        budget.configure(timeout=60000, max_inferred=10)
+        budget.configure()
+        self.assertIs(sys.unraisablehook, prev_hook)
+
+    def test_recursion(self):
+        module_node = astroid.parse("value = 1\n")
+        budget = InferenceBudget()
+        self.assertIsNone(budget.run(recursive_infer, module_node.body[0].value))
+        self.assertEqual(budget.get_stats(), {"exceeded": 1})
+
+    def test_max_inferred(self):
+        # astroid fails on uninferable values returned when limit is exceeded while module is built or inferred
+        package_dir = os.path.dirname(astgraph.__file__)
+        files_list = [os.path.join(package_dir, file_name) for file_name in ["__init__.py", "pyanwrap.py"]]
+        prev_exceeded = INFERENCE_BUDGET.exceeded
+        INFERENCE_BUDGET.configure(max_inferred=1)
+        try:
+            parser = TreeParser()
+            parser.analyze_files(files_list)
+            self.assertEqual(astroid_context.InferenceContext.max_inferred, DEFAULT_MAX_INFERRED)
+        finally:
+            INFERENCE_BUDGET.configure()
+        self.assertGreater(INFERENCE_BUDGET.exceeded, prev_exceeded)
+        use_list = parser.items.get_use_list()
+        self.assertIn(("astgraph.pyanwrap.draw_full_graph", "astgraph.pyanwrap.convert_to_pyan_graph"), use_list)
+        for func_name, build_func in BUILD_FUNCS.items():
+            self.assertIs(getattr(AstroidBuilder, func_name), build_func)
+
+
+class ProjectBoundaryTest(unittest.TestCase):
+    def test_external(self):
+        files_list = get_code_files("multifileimportfrom", ["modulea.py", "item.py"])
+        boundary = ProjectBoundary()
+        boundary.configure(files_list)
+        try:
+            self.assertTrue(boundary.is_external("json"))
+            self.assertFalse(boundary.is_external("multifileimportfrom"))
+            self.assertFalse(boundary.is_external("multifileimportfrom.item"))
+            self.assertFalse(boundary.is_external("builtins"))
+
+            # external module is replaced by empty module
+            json_node = astroid.MANAGER.ast_from_module_name("json")
+            self.assertEqual(json_node.locals, {})
+            self.assertIsNot(astroid.MANAGER.astroid_cache.get("json"), json_node)
+            self.assertEqual(boundary.get_stats(), {"external": 1})
+        finally:
+            boundary.configure(None)
+
+        json_node = astroid.MANAGER.ast_from_module_name("json")
+        self.assertIn("loads", json_node.locals)
+
+    def test_analyze(self):
+        files_list = get_code_files("multifileimportfrom", ["modulea.py", "item.py"])
+        expected = TreeParser()
+        expected.analyze_files(files_list)
+
+        boundary = ProjectBoundary()
+        boundary.configure(files_list)
+        try:
+            parser = TreeParser()
+            parser.analyze_files(files_list)
+        finally:
+            boundary.configure(None)
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
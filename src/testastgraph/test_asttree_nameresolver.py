@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+import astroid
+
+from astgraph.treeparser import ItemContainer
+from astgraph.nameresolver import get_import_table
+
+
+ITEM_CODE = """\
+class Item:
+    pass
+"""
+
+USER_CODE = """\
+import itemmod
+from itemmod import Item
+from other import Helper as Tool
+
+
+def func():
+    def inner():
+        return Item()
+    return inner
+"""
+
+
+class NameResolverTest(unittest.TestCase):
+    def test_import_table(self):
+        user_node = astroid.parse(USER_CODE, module_name="usermod")
+        self.assertEqual(get_import_table(user_node), {"itemmod": "itemmod", "Item": "itemmod", "Tool": "other"})
+
+    def test_find(self):
+        item_node = astroid.parse(ITEM_CODE, module_name="itemmod")
+        user_node = astroid.parse(USER_CODE, module_name="usermod")
+        items = ItemContainer()
+        items.add_mod(user_node)
+        items.add_mod(item_node)
+
+        inner_node = user_node.locals["func"][0].locals["inner"][0]
+        class_node = item_node.locals["Item"][0]
+        self.assertIs(items.find_in_scope(inner_node, "Item"), class_node)
+        # scopes passed by lookup are cached
+        self.assertIs(items.names.names_dict[(user_node, "Item")], class_node)
+        hits = items.names.hits
+        self.assertIs(items.find_in_scope(inner_node.parent, "Item"), class_node)
+        self.assertEqual(items.names.hits, hits + 1)
+
+        self.assertIs(items.find_in_scope(inner_node, "itemmod"), item_node)
+        self.assertIsNone(items.find_in_scope(inner_node, "Tool"))
+        self.assertIsNone(items.find_in_scope(inner_node, "missing"))
+        self.assertIsNone(items.find_in_scope(None, "Item"))
+
+    def test_invalidate(self):
+        user_node = astroid.parse(USER_CODE, module_name="usermod")
+        items = ItemContainer()
+        items.add_mod(user_node)
+        self.assertIsNone(items.find_in_scope(user_node, "Item"))
+
+        # module added after lookup
+        item_node = astroid.parse(ITEM_CODE, module_name="itemmod")
+        items.add_mod(item_node)
+        self.assertIs(items.find_in_scope(user_node, "Item"), item_node.locals["Item"][0])
+
+        # module replaced by new tree
+        new_node = astroid.parse(ITEM_CODE, module_name="itemmod")
+        items.set_mod(new_node)
+        self.assertEqual(list(items.mod_dict), ["usermod", "itemmod"])
+        self.assertIs(items.find_in_scope(user_node, "Item"), new_node.locals["Item"][0])
+
+        items.remove_mod("itemmod")
+        self.assertIsNone(items.find_in_scope(user_node, "Item"))
+
+        items.release_nodes()
+        self.assertEqual(items.names.names_dict, {})
@@ -0,0 +1,47 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import glob
+import unittest
+
+from testastgraph.sample import get_data_root_path
+
+from astgraph.treeparser import TreeParser
+from astgraph.parallel import split_range
+
+
+def get_code_files():
+    data_root_path = get_data_root_path()
+    code_path = os.path.join(data_root_path, "code")
+    return sorted(glob.glob(f"{code_path}/**/*.py", recursive=True))
+
+
+class SplitRangeTest(unittest.TestCase):
+    def test_split_range(self):
+        self.assertEqual(split_range(5, 2), [(0, 3), (3, 5)])
+        self.assertEqual(split_range(2, 4), [(0, 1), (1, 2)])
+        self.assertEqual(split_range(0, 4), [(0, 0)])
+
+
+class TreeParserParallelTest(unittest.TestCase):
+    def test_analyze_files_parallel(self):
+        files_list = get_code_files()
+
+        serial_parser = TreeParser()
+        serial_parser.analyze_files(files_list)
+
+        parallel_parser = TreeParser()
+        parallel_parser.analyze_files(files_list, jobs=2)
+
+        serial_items = serial_parser.items
+        parallel_items = parallel_parser.items
+        self.assertEqual(parallel_items.get_def_list_info(), serial_items.get_def_list_info())
+        self.assertEqual(parallel_items.get_use_list(), serial_items.get_use_list())
+        # counters of workers are included
+        self.assertEqual(parallel_items.resolve_stats, serial_items.resolve_stats)
@@ -0,0 +1,59 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import tempfile
+import unittest
+
+import astroid
+
+from testastgraph.sample import get_code_files
+
+from astgraph.treeparser import TreeParser
+from astgraph.prefetch import SourcePrefetcher
+
+
+class SourcePrefetcherTest(unittest.TestCase):
+    def test_iter_sources(self):
+        files_list = get_code_files("multifileimportfrom", ["modulea.py", "item.py", "missing.py"])
+        prefetcher = SourcePrefetcher(2, ahead=1)
+        sources_list = list(prefetcher.iter_sources(iter(files_list)))
+        self.assertEqual([file_path for file_path, _ in sources_list], files_list)
+        with open(files_list[0], "rb") as src_file:
+            self.assertEqual(sources_list[0][1], src_file.read())
+        self.assertIsNone(sources_list[2][1])
+        self.assertEqual(prefetcher.get_stats()["files"], 3)
+
+    def test_analyze(self):
+        files_list = get_code_files("multifileimportfrom", ["modulea.py", "item.py"])
+        expected = TreeParser()
+        expected.analyze_files(files_list)
+        for astroid_tree in expected.items.mod_dict.values():
+            astroid.MANAGER.astroid_cache.pop(astroid_tree.name, None)
+
+        parser = TreeParser()
+        parser.prefetcher = SourcePrefetcher(2)
+        parser.analyze_files(files_list)
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
+        self.assertEqual(
+            [astroid_tree.file for astroid_tree in parser.items.mod_dict.values()],
+            [astroid_tree.file for astroid_tree in expected.items.mod_dict.values()],
+        )
+
+    def test_encoding(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "latinmod.py")
+            with open(file_path, "wb") as src_file:
+                src_file.write('# -*- coding: latin-1 -*-\r\nTEXT = "\xe9t\xe9"\r\n'.encode("latin-1"))
+
+            parser = TreeParser()
+            parser.prefetcher = SourcePrefetcher(1)
+            astroid_tree = parser.load_files([file_path])[0]
+            astroid.MANAGER.astroid_cache.pop(astroid_tree.name, None)
+        self.assertEqual(astroid_tree.file_encoding, "iso-8859-1")
+        self.assertEqual(astroid_tree.body[0].value.value, "\xe9t\xe9")
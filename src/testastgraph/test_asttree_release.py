@@ -0,0 +1,49 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import gc
+import weakref
+import unittest
+
+from testastgraph.sample import get_code_files
+
+from astgraph.treeparser import TreeParser
+
+
+class TreeParserReleaseTest(unittest.TestCase):
+    def test_release_trees(self):
+        files_list = get_code_files("multifileimportfrom", ["modulea.py", "item.py"])
+
+        parser = TreeParser()
+        parser.analyze_files(files_list)
+        defs_info = parser.items.get_def_list_info()
+        uses_list = parser.items.get_use_list()
+        modules_refs = [weakref.ref(mod_node) for mod_node in parser.items.mod_dict.values()]
+        self.assertEqual(len(modules_refs), 2)
+
+        parser.release_trees()
+        gc.collect()
+
+        # results are kept, astroid trees are released
+        self.assertEqual(parser.items.get_def_list_info(), defs_info)
+        self.assertEqual(parser.items.get_use_list(), uses_list)
+        self.assertEqual(parser.items.mod_dict, {})
+        self.assertEqual(parser.items.astroid_node_dict, {})
+        self.assertEqual([mod_ref() for mod_ref in modules_refs], [None, None])
+
+    def test_analyze_after_release(self):
+        files_list = get_code_files("multifileimportfrom", ["modulea.py", "item.py"])
+
+        expected = TreeParser()
+        expected.analyze_files(files_list)
+        expected.release_trees()
+
+        # trees are loaded again
+        parser = TreeParser()
+        parser.analyze_files(files_list)
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
@@ -0,0 +1,103 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+
+import astroid
+
+from testastgraph.sample import TempDirTestCase, write_file, write_package
+
+from astgraph.treeparser import TreeParser
+from astgraph.cache import AnalysisCache
+from astgraph.returntypes import is_site_independent
+
+
+FACTORY_CODE = """\
+class Item:
+    def work(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+def make():
+    return Item()
+
+
+def ident(arg):
+    return arg
+"""
+
+USER_CODE = """\
+from retpkg.factory import make, ident, Item
+
+
+def first():
+    make().work()
+
+
+def second():
+    make().stop()
+    ident(Item()).work()
+"""
+
+
+def analyze(files_list, cache=None):
+    parser = TreeParser()
+    parser.analyze_files(files_list, cache=cache)
+    return parser
+
+
+class ReturnTableTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        files = [("__init__.py", ""), ("factory.py", FACTORY_CODE), ("user.py", USER_CODE)]
+        self.files_list = write_package(os.path.join(self.temp_dir.name, "code"), "retpkg", files)
+
+    def test_site_independent(self):
+        module_node = astroid.parse(FACTORY_CODE + "\ndef gen():\n    yield Item()\n", module_name="testmod")
+        self.assertTrue(is_site_independent(module_node.locals["make"][0]))
+        self.assertFalse(is_site_independent(module_node.locals["ident"][0]))
+        self.assertFalse(is_site_independent(module_node.locals["gen"][0]))
+        self.assertFalse(is_site_independent(module_node.locals["Item"][0]))
+        # returns 'self'
+        func_node = astroid.extract_node("class ABC:\n    def get(self):\n        return self\n").locals["get"][0]
+        self.assertFalse(is_site_independent(func_node))
+
+    def test_table(self):
+        parser = analyze(self.files_list)
+        use_list = parser.items.get_use_list()
+        self.assertIn(("retpkg.user.first", "retpkg.factory.Item.work"), use_list)
+        self.assertIn(("retpkg.user.second", "retpkg.factory.Item.stop"), use_list)
+
+        returns = parser.items.returns
+        type_dict = {func_def.get_full_name(): type_node for func_def, type_node in returns.types_dict.items()}
+        self.assertEqual(type_dict["retpkg.factory.make"].name, "Item")
+        self.assertIsNone(type_dict["retpkg.factory.Item.work"])
+        # 'make()' and 'work()' inferred once
+        self.assertEqual(returns.get_stats(), {"hits": 2, "misses": 3, "size": 3})
+        self.assertEqual([func_def.get_full_name() for func_def in returns.dependent], ["retpkg.factory.ident"])
+
+    def test_cache(self):
+        analyze(self.files_list, AnalysisCache(self.cache_dir))
+
+        user_path = self.files_list[2]
+        write_file(user_path, USER_CODE + "\n\ndef third():\n    make().work()\n")
+        astroid.MANAGER.clear_cache()
+        expected = analyze(self.files_list)
+
+        cache = AnalysisCache(self.cache_dir)
+        parser = analyze(self.files_list, cache)
+        self.assertEqual(cache.get_stats(), {"hits": 2, "misses": 1, "evictions": 0})
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
+        # returned types restored from entry of 'factory' module
+        returns = parser.items.returns
+        self.assertEqual(returns.get_stats(), {"hits": 7, "misses": 0, "size": 3})
+        self.assertEqual(len(returns.computed), 0)
@@ -0,0 +1,116 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+import astroid
+
+from astgraph.treeparser import TreeParser, DefItemType
+
+
+NESTED_CODE = """\
+class Outer:
+    def method(self):
+        for index in range(3):
+            if index:
+                def inner():
+                    with open("file") as file_obj:
+                        while file_obj:
+                            value = [lambda arg: arg + index for _ in range(2)]
+                            self.field = value
+                    return helper()
+                inner()
+
+
+def helper():
+    return Outer()
+"""
+
+
+# returns def item of nearest ancestor having def item (walk without maps)
+def find_scope_walk(items, astroid_node):
+    parent_node = astroid_node.parent
+    while parent_node:
+        parent_def = items.find_def_item(parent_node)
+        if parent_def:
+            return parent_def
+        parent_node = parent_node.parent
+    return None
+
+
+def find_parent_scope_walk(items, astroid_node):
+    scope_node = astroid_node
+    while scope_node.parent is not None:
+        scope_node = scope_node.parent.scope()
+        scope_def = items.find_def_item(scope_node)
+        if scope_def is not None:
+            return scope_def
+    return None
+
+
+def get_all_nodes(astroid_node):
+    nodes_list = [astroid_node]
+    for child in astroid_node.get_children():
+        nodes_list.extend(get_all_nodes(child))
+    return nodes_list
+
+
+class ScopeMapTest(unittest.TestCase):
+    def test_nested(self):
+        astroid_node = astroid.parse(NESTED_CODE, module_name="testmod")
+        parser = TreeParser()
+        parser.analyze(astroid_node)
+        items = parser.items
+
+        # uses analysis already filled maps
+        self.assertTrue(items.scopes.parent_scope_dict)
+        for node in get_all_nodes(astroid_node):
+            self.assertIs(items.find_scope(node), find_scope_walk(items, node))
+            self.assertIs(items.find_parent_scope_def(node), find_parent_scope_walk(items, node))
+
+        # body of lambda inside comprehension
+        binop_node = next(astroid_node.nodes_of_class(astroid.nodes.BinOp))
+        self.assertEqual(items.find_parent_scope_def(binop_node).get_full_name(), "testmod.Outer.method.inner")
+        self.assertEqual(items.find_scope_class(binop_node).get_full_name(), "testmod.Outer")
+        self.assertIsNone(items.find_scope_class(astroid_node.body[1].body[0]))
+        self.assertIn(("testmod.Outer.method.inner", "testmod.helper"), items.get_use_list())
+
+    def test_register(self):
+        astroid_node = astroid.parse(NESTED_CODE, module_name="testmod")
+        parser = TreeParser()
+        items = parser.items
+        module_def = items.create_module_def("testmod", astroid_node)
+        items.append_def(module_def)
+        method_node = astroid_node.body[0].body[0]
+        call_node = next(method_node.nodes_of_class(astroid.nodes.Call))
+        self.assertIs(items.find_scope(call_node), module_def)
+        self.assertIs(items.find_parent_scope_def(call_node), module_def)
+
+        # item created for node already stored in maps (e.g. "forward declaration")
+        method_def = items.create_def("method", DefItemType.DEF_METHOD, method_node)
+        self.assertIs(items.find_scope(call_node), method_def)
+        self.assertIs(items.find_parent_scope_def(call_node), method_def)
+
+        items.remove_defs({method_def})
+        self.assertEqual(items.scopes.scope_dict, {})
+        self.assertIs(items.find_scope(call_node), module_def)
+
+    def test_member(self):
+        astroid_node = astroid.parse("class ABC:\n    pass\n\nABC.field.sub = 1\n", module_name="testmod")
+        parser = TreeParser()
+        items = parser.items
+        module_def = items.create_module_def("testmod", astroid_node)
+        items.append_def(module_def)
+        attr_node = next(astroid_node.nodes_of_class(astroid.nodes.AssignAttr))
+        name_node = attr_node.expr.expr
+        self.assertIs(items.find_scope(name_node), module_def)
+
+        # members are created during uses analysis
+        member_def = items.create_def("field", DefItemType.MEMBER, attr_node)
+        self.assertIs(items.find_scope(name_node), member_def)
+        self.assertIs(items.find_parent_scope_def(name_node), module_def)
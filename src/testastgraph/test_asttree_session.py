@@ -0,0 +1,131 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import sys
+
+import astroid
+from astroid import context as astroid_context
+
+from testastgraph.sample import TempDirTestCase, write_file, write_package
+
+from astgraph.treeparser import TreeParser
+from astgraph.session import AnalysisSession
+from astgraph.modpath import PACKAGE_ROOTS
+from astgraph.inference import INFERENCE_BUDGET, PROJECT_BOUNDARY, DEFAULT_MAX_INFERRED
+
+
+ITEM_CODE = """
+class Item:
+    def do_work(self):
+        pass
+
+    def do_more(self):
+        pass
+"""
+
+USER_CODE = """
+import json
+
+from sesspkg.item import Item
+
+
+def main():
+    itemobj = Item()
+    itemobj.do_work()
+    return json.dumps({})
+"""
+
+
+class AnalysisSessionTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        files = [("__init__.py", ""), ("item.py", ITEM_CODE), ("user.py", USER_CODE)]
+        self.files_list = write_package(self.temp_dir.name, "sesspkg", files)
+
+    def test_isolation(self):
+        prev_path = list(sys.path)
+        session = AnalysisSession()
+        parser = session.analyze_files(self.files_list)
+
+        expected = TreeParser()
+        with AnalysisSession():
+            expected.analyze_files(self.files_list)
+        self.assertEqual(parser.items.get_use_list(), expected.items.get_use_list())
+        self.assertIn(("sesspkg.user.main", "sesspkg.item.Item.do_work"), parser.items.get_use_list())
+
+        # process state is not changed
+        self.assertEqual(sys.path, prev_path)
+        self.assertNotIn("sesspkg.user", astroid.MANAGER.astroid_cache)
+        self.assertIn("sesspkg.user", session.modules)
+        self.assertIn(self.temp_dir.name, session.search_paths)
+
+        # modules are reused by next analysis
+        user_node = session.modules["sesspkg.user"]
+        session.analyze_files(self.files_list)
+        self.assertIs(session.modules["sesspkg.user"], user_node)
+
+    def test_max_modules(self):
+        session = AnalysisSession(max_modules=2)
+        session.analyze_files(self.files_list)
+        self.assertEqual(len(session.modules), 2)
+        self.assertIn("builtins", session.modules)
+        self.assertGreater(session.evictions, 0)
+
+    def test_max_bytes(self):
+        session = AnalysisSession(max_bytes=0)
+        session.analyze_files(self.files_list)
+        self.assertEqual(session.get_stats()["bytes"], 0)
+
+    def test_changed_file(self):
+        session = AnalysisSession()
+        session.analyze_files(self.files_list)
+
+        item_path = self.files_list[1]
+        write_file(item_path, ITEM_CODE.replace("do_work", "do_other"))
+        stat = os.stat(item_path)
+        os.utime(item_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        parser = session.analyze_files(self.files_list)
+        self.assertNotIn(("sesspkg.user.main", "sesspkg.item.Item.do_work"), parser.items.get_use_list())
+
+    def test_nested(self):
+        session = AnalysisSession()
+        with session:
+            with self.assertRaises(RuntimeError):
+                with session:
+                    pass
+        self.assertFalse(session.is_active())
+
+    def test_consecutive_sessions(self):
+        other_root = os.path.join(self.temp_dir.name, "other")
+        files = [
+            ("__init__.py", ""),
+            ("item.py", ITEM_CODE.replace("do_work", "do_other")),
+            ("user.py", USER_CODE.replace("do_work", "do_other")),
+        ]
+        other_files = write_package(other_root, "sesspkg", files)
+        prev_roots = dict(PACKAGE_ROOTS)
+
+        first = AnalysisSession(infertimeout=10000)
+        first_parser = first.analyze_files(self.files_list)
+        self.assertIn(("sesspkg.user.main", "sesspkg.item.Item.do_work"), first_parser.items.get_use_list())
+        self.assertIn("json", first.modules)
+        self.assertEqual(INFERENCE_BUDGET.get_config(), (None, None))
+
+        second = AnalysisSession(infermax=100, noexternal=True)
+        second_parser = second.analyze_files(other_files)
+        use_list = second_parser.items.get_use_list()
+        self.assertIn(("sesspkg.user.main", "sesspkg.item.Item.do_other"), use_list)
+        self.assertNotIn(("sesspkg.user.main", "sesspkg.item.Item.do_work"), use_list)
+        self.assertNotIn("json", second.modules)
+
+        # global state of analysis is restored
+        self.assertEqual(INFERENCE_BUDGET.get_config(), (None, None))
+        self.assertEqual(astroid_context.InferenceContext.max_inferred, DEFAULT_MAX_INFERRED)
+        self.assertFalse(PROJECT_BOUNDARY.is_enabled())
+        self.assertEqual(PACKAGE_ROOTS, prev_roots)
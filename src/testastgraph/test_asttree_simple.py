@@ -6,8 +6,11 @@
 # LICENSE file in the root directory of this source tree.
 #
 
+import sys
 import unittest
 
+import astroid
+
 from astgraph.pyanwrap import draw_full_graph
 from astgraph.treeparser import TreeParser, DefItemType
 
@@ -749,6 +752,49 @@ else:
         self.assertEqual(mod_uses[1].name, "FIELD_1")
         self.assertEqual(mod_uses[2].name, "FIELD_2")
 
+    def test_analyze_nested_blocks(self):
+        code = """\
+try:
+    def func1():
+        return 1
+except ImportError:
+    pass
+
+with open("file") as file_obj:
+    if file_obj:
+        class ABC:
+            def method(self):
+                return func1()
+"""
+        parser = TreeParser()
+        parser.analyze_code(module_name="testmod", code=code)
+
+        items_container = parser.items
+        def_list = items_container.get_def_list_info()
+        self.assertEqual(len(def_list), 4)
+        self.assertEqual(def_list[1], ("testmod.func1", DefItemType.DEF_METHOD))
+        self.assertEqual(def_list[2], ("testmod.ABC", DefItemType.CLASS))
+        self.assertEqual(def_list[3], ("testmod.ABC.method", DefItemType.DEF_METHOD))
+
+        use_list = items_container.get_use_list()
+        self.assertEqual(use_list, [("testmod.ABC.method", "testmod.func1")])
+
+    def test_analyze_deep_nesting(self):
+        # expression nested deeper than allowed by recursion limit
+        code = "def func():\n    return 1\n\nvalue = [" + "func() + " * 800 + "func()]\n"
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(20000)
+        try:
+            astroid_node = astroid.parse(code, module_name="testmod")
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        parser = TreeParser()
+        parser.analyze(astroid_node)
+
+        use_list = parser.items.get_use_list()
+        self.assertEqual(use_list, [("testmod", "testmod.func")])
+
     def test_analyze_listcompreh_call(self):
         code = """\
 class ABC:
@@ -835,3 +881,33 @@ thread = Thread(target=execute, args=[])
         self.assertEqual(len(use_list), 1)
 
         self.assertEqual(use_list[0], ("testmod", "testmod.execute"))
+
+    def test_analyze_self_hint(self):
+        code = """\
+class Worker:
+    def run(self):
+        pass
+
+def make_worker():
+    return unknown_factory()
+
+class Item:
+    def __init__(self):
+        self.worker: Worker = make_worker()
+
+    def execute(self):
+        self.worker.run()
+        self.other.run()
+
+    def set_other(self):
+        self.other = Worker()
+"""
+        parser = TreeParser()
+        parser.analyze_code(module_name="testmod", code=code)
+
+        # 'worker' resolved by type hint, type of 'other' inferred
+        self.assertEqual(parser.items.resolve_stats, {"tree": 2, "astroid": 1})
+
+        use_list = parser.items.get_use_list()
+        self.assertIn(("testmod.Item.execute", "testmod.Item.worker"), use_list)
+        self.assertIn(("testmod.Item.execute", "testmod.Worker.run"), use_list)
@@ -0,0 +1,53 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from astgraph.defitem import DefItemType, DefItem, ClassItem, ModuleItem
+from astgraph.objtodict import obj_to_dict
+
+
+class DefItemTest(unittest.TestCase):
+    def test_slots(self):
+        module_item = ModuleItem("mod", None)
+        class_item = ClassItem("Item", None)
+        self.assertFalse(hasattr(module_item, "__dict__"))
+        self.assertFalse(hasattr(class_item, "__dict__"))
+        with self.assertRaises(AttributeError):
+            setattr(class_item, "unknown", 1)
+
+        # names are interned
+        name = "".join(["val", "ue"])
+        self.assertIs(DefItem(name, DefItemType.MEMBER, None).name, DefItem("value", DefItemType.MEMBER, None).name)
+
+    def test_children(self):
+        module_item = ModuleItem("mod", None)
+        class_item = ClassItem("Item", None)
+        self.assertEqual(list(module_item.get_items()), [])
+        self.assertEqual(list(class_item.get_items()), [])
+
+        module_item.append(class_item)
+        self.assertEqual(module_item.get_items(), [class_item])
+        self.assertEqual(list(class_item.get_items()), [])
+        self.assertIs(module_item.get_child("Item"), class_item)
+        module_item.remove(class_item)
+        self.assertEqual(module_item.get_items(), [])
+        self.assertIsNone(class_item.parent)
+
+    def test_obj_to_dict(self):
+        module_item = ModuleItem("mod", None, namespace="pkg")
+        class_item = ClassItem("Item", None)
+        module_item.append(class_item)
+        data_dict = obj_to_dict(module_item, skip_meta_data=True, ignore_fields=["node_id", "type"])
+        self.assertEqual(data_dict["name"], "mod")
+        self.assertEqual(data_dict["namespace"], "pkg")
+        # slots of base class are included
+        item_dict = data_dict["_items"][0]
+        self.assertEqual(item_dict["name"], "Item")
+        self.assertEqual(item_dict["bases"], [])
+        self.assertFalse(item_dict["explicit_ctor"])
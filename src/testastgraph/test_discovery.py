@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import glob
+import tempfile
+import unittest
+
+from testastgraph.sample import get_data_root_path, write_file
+
+from astgraph.discovery import GitIgnore, iter_files
+from astgraph.modpath import PACKAGE_ROOTS, clear_package_roots, get_package_root
+
+
+class GitIgnoreTest(unittest.TestCase):
+    def test_match(self):
+        rules = GitIgnore()
+        for line in ["# comment", "*.log", "!keep.log", "build/", "/top.py", "docs/**/gen", ""]:
+            rules.add_rule(line)
+        self.assertTrue(rules.match("a/b/out.log", False))
+        self.assertFalse(rules.match("a/keep.log", False))
+        self.assertTrue(rules.match("a/build", True))
+        self.assertIsNone(rules.match("a/build", False))
+        self.assertTrue(rules.match("top.py", False))
+        self.assertIsNone(rules.match("a/top.py", False))
+        self.assertTrue(rules.match("docs/gen", True))
+        self.assertTrue(rules.match("docs/x/y/gen", True))
+        self.assertIsNone(rules.match("main.py", False))
+
+    def test_base_dir(self):
+        rules = GitIgnore("sub")
+        rules.add_rule("/gen.py")
+        self.assertTrue(rules.match("sub/gen.py", False))
+        self.assertIsNone(rules.match("gen.py", False))
+
+
+class IterFilesTest(unittest.TestCase):
+    def setUp(self):
+        # pylint: disable=R1732
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_found(self, **kwargs):
+        found_list = iter_files(self.temp_dir.name, **kwargs)
+        return [os.path.relpath(file_path, self.temp_dir.name) for file_path in found_list]
+
+    def test_excludes(self):
+        for rel_path in ["main.py", "pkg/mod.py", "pkg/gen.py", "venv/lib.py", ".tox/lib.py", "build/out.py"]:
+            write_file(os.path.join(self.temp_dir.name, rel_path))
+        write_file(os.path.join(self.temp_dir.name, "pkg", "notes.txt"))
+        write_file(os.path.join(self.temp_dir.name, "pkg", ".gitignore"), "gen.py\n")
+
+        self.assertEqual(sorted(self.get_found()), ["main.py", "pkg/mod.py"])
+        self.assertEqual(sorted(self.get_found(gitignore=False)), ["main.py", "pkg/gen.py", "pkg/mod.py"])
+        # given patterns replace default ones
+        self.assertEqual(
+            sorted(self.get_found(exclude=["pkg"])), [".tox/lib.py", "build/out.py", "main.py", "venv/lib.py"]
+        )
+        self.assertEqual(self.get_found(include=["*.txt"]), ["pkg/notes.txt"])
+
+    def test_glob_order(self):
+        code_path = os.path.join(get_data_root_path(), "code")
+        expected = glob.glob(f"{code_path}/**/*.py", recursive=True)
+        self.assertEqual(list(iter_files(code_path)), expected)
+
+
+class PackageRootTest(unittest.TestCase):
+    def test_memoized(self):
+        code_path = os.path.join(get_data_root_path(), "code")
+        file_path = os.path.join(code_path, "multifileimport", "item.py")
+        clear_package_roots()
+        self.assertEqual(get_package_root(file_path), code_path)
+        self.assertEqual(PACKAGE_ROOTS[os.path.dirname(file_path)], code_path)
+        self.assertEqual(get_package_root(os.path.join(code_path, "multifileimport", "modulea.py")), code_path)
+        clear_package_roots()
+        self.assertEqual(PACKAGE_ROOTS, {})
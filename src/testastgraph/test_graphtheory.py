@@ -43,3 +43,16 @@ class GraphTheoryTest(unittest.TestCase):
         nodes_list = []
         visit_graph(edges_dict, 3, nodes_list.append)
         self.assertEqual(nodes_list, [3, 4])
+
+    def test_visit_graph_long_chain(self):
+        # chain longer than recursion limit
+        edges_dict = {index: [index + 1] for index in range(5000)}
+        nodes_list = []
+        visit_graph(edges_dict, 0, nodes_list.append)
+        self.assertEqual(nodes_list, list(range(5001)))
+
+    def test_visit_graph_order(self):
+        edges_dict = {1: [2, 3], 2: [4, 3], 3: [5]}
+        nodes_list = []
+        visit_graph(edges_dict, 1, nodes_list.append)
+        self.assertEqual(nodes_list, [1, 2, 4, 3, 5])
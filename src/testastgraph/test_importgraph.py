@@ -0,0 +1,40 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import re
+import unittest
+
+from testastgraph.sample import get_code_files
+
+from astgraph.graphtheory import Filter
+from astgraph.importgraph import get_imports, prune_files
+
+
+class GetImportsTest(unittest.TestCase):
+    def test_get_imports(self):
+        code = b"import os.path\nfrom . import item\nfrom ..base import Base\n"
+        imports = get_imports(code, "pkg.sub.mod", "pkg/sub/mod.py")
+        self.assertEqual(imports, ["os.path", "pkg.base", "pkg.base.Base", "pkg.sub", "pkg.sub.item"])
+
+
+class PruneFilesTest(unittest.TestCase):
+    def test_prune_down(self):
+        files_list = get_code_files("multifileimportfrom", ["__main__.py", "modulea.py", "item.py"])
+        filter_obj = Filter([re.compile(r"multifileimportfrom\.modulea\.main")])
+        pruned_list = prune_files(files_list, filter_down_obj=filter_obj)
+        self.assertEqual(pruned_list, files_list[1:])
+
+    def test_prune_up(self):
+        files_list = get_code_files("multifileimportfrom", ["__main__.py", "modulea.py", "item.py"])
+        filter_obj = Filter([re.compile(r"multifileimportfrom\.modulea\.main")])
+        pruned_list = prune_files(files_list, filter_up_obj=filter_obj)
+        self.assertEqual(pruned_list, files_list[:2])
+
+    def test_prune_none(self):
+        files_list = get_code_files("multifileimportfrom", ["modulea.py", "item.py"])
+        self.assertEqual(prune_files(files_list), files_list)
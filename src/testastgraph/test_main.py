@@ -9,10 +9,37 @@
 import os
 import unittest
 
-from testastgraph.sample import get_data_root_path
+from testastgraph.sample import get_data_root_path, TempDirTestCase, write_file, write_package
 
-from astgraph.main import analyze_files, process_files
+from astgraph.main import analyze_files, process_files, parse_files, reparse_files, draw_changed, get_graph_title
 from astgraph.graphtheory import flatten_to_list
+from astgraph.defitem import DefItemType
+
+
+ITEM_CODE = """
+class Item:
+    def work(self):
+        pass
+
+    def stop(self):
+        pass
+"""
+
+USER_CODE = """
+from watchpkg.item import Item
+
+
+def main():
+    item = Item()
+    item.work()
+"""
+
+USER_STOP_CODE = USER_CODE + "    item.stop()\n"
+
+OTHER_CODE = """
+def other():
+    return 1
+"""
 
 
 class MainTest(unittest.TestCase):
@@ -63,3 +90,79 @@ class MainTest(unittest.TestCase):
 
         # self.assertEqual(names_defs, ['Runner', 'execute', 'simple_runner'])
         self.assertEqual(names_uses, ["STATIC_FIELD", "execute", "instance_field"])
+
+    def test_draw_changed(self):
+        data_root_path = get_data_root_path()
+        files_list = []
+        files_list.append(os.path.join(data_root_path, "code", "simple_runner.py"))
+
+        analyzer = parse_files(files_list)
+        signatures = draw_changed(analyzer.items, None, {}, False, {})
+        self.assertEqual(signatures["pyan"], signatures["plantuml"])
+
+        analyzer = parse_files(files_list)
+        next_signatures = draw_changed(analyzer.items, None, {}, False, signatures)
+        self.assertEqual(next_signatures, signatures)
+
+        filters = {"filterdown": [".*Runner.execute.*"]}
+        filtered_signatures = draw_changed(analyzer.items, filters, {}, False, signatures)
+        self.assertNotEqual(filtered_signatures, signatures)
+
+    def test_graph_title_fast(self):
+        data_root_path = get_data_root_path()
+        files_list = [os.path.join(data_root_path, "code", "simple_runner.py")]
+
+        analyzer = parse_files(files_list)
+        self.assertIsNone(get_graph_title(analyzer.items))
+
+        analyzer = parse_files(files_list, {"engine": "fast"})
+        self.assertEqual(get_graph_title(analyzer.items), "approximate graph: analyzed by fast engine")
+
+
+# analyses repeated in the same process (e.g. by watch mode)
+class ReparseTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        files = [("__init__.py", ""), ("item.py", ITEM_CODE), ("user.py", USER_CODE), ("other.py", OTHER_CODE)]
+        self.files_list = write_package(self.temp_dir.name, "watchpkg", files)
+        self.stop_use = ("watchpkg.user.main", "watchpkg.item.Item.stop")
+
+    def test_reparse(self):
+        self.check_reparse({})
+
+    def test_reparse_recover(self):
+        analyzer = parse_files(self.files_list)
+        self.assertIn(("watchpkg.user.main", "watchpkg.item.Item.work"), analyzer.items.get_use_list())
+
+        # failed update of file with syntax error
+        user_path = self.files_list[2]
+        write_file(user_path, USER_CODE + "    item.stop(\n")
+        with self.assertRaises(Exception):
+            analyzer.update_file(user_path)
+
+        # error fixed
+        write_file(user_path, USER_STOP_CODE)
+        analyzer = reparse_files(self.files_list)
+        self.assertIn(self.stop_use, analyzer.items.get_use_list())
+
+    def check_reparse(self, parser_options, filters=None):
+        analyzer = parse_files(self.files_list, parser_options, filters)
+        self.assertNotIn(self.stop_use, analyzer.items.get_use_list())
+
+        write_file(self.files_list[2], USER_STOP_CODE)
+        analyzer = reparse_files(self.files_list, parser_options, filters)
+        self.assertIn(self.stop_use, analyzer.items.get_use_list())
+        return analyzer
+
+    def test_reparse_pruneimports(self):
+        analyzer = self.check_reparse({"pruneimports": True}, {"filterdown": ["watchpkg.user.main"]})
+        # module 'other' is not imported by 'user'
+        def_items = analyzer.items.def_items
+        modules_list = sorted(item.get_full_name() for item in def_items if item.type == DefItemType.MODULE)
+        self.assertEqual(modules_list, ["watchpkg", "watchpkg.item", "watchpkg.user"])
+
+    def test_reparse_demand(self):
+        self.check_reparse({"demand": True})
+
+    def test_reparse_deadline(self):
+        self.check_reparse({"deadline": 60})
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Script compares analysis engines ('astroid' and 'fast') on given directories: wall time of analysis,
+# number of found uses (edges of graph) and recall and precision of 'fast' engine against 'astroid'.
+#
+# Example: PYTHONPATH=src python3 tools/enginebench.py examples src/astgraph
+#
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+import astroid
+
+from astgraph.main import find_files
+from astgraph.inference import INFERENCE_CACHE
+from astgraph.treeparser import TreeParser
+
+
+def run_engine(engine, files_list):
+    # each run starts with empty caches
+    astroid.MANAGER.clear_cache()
+    INFERENCE_CACHE.clear()
+    parser = TreeParser()
+    start_time = time.time()
+    try:
+        if engine == "fast":
+            parser.analyze_fast(files_list)
+        else:
+            parser.analyze_files(files_list)
+    except Exception as exc:  # pylint: disable=W0703
+        print(f"{engine} engine failed: {exc}")
+        return None, None
+    return time.time() - start_time, set(parser.items.get_use_list())
+
+
+def compare_engines(search_dir, repeats):
+    files_list = sorted(find_files(search_dir, ".py"))
+    results = {}
+    for engine in ("astroid", "fast"):
+        times_list = []
+        uses_set = None
+        for _ in range(repeats):
+            run_time, uses_set = run_engine(engine, files_list)
+            if run_time is None:
+                break
+            times_list.append(run_time)
+        results[engine] = (min(times_list) if times_list else None, uses_set)
+
+    print(f"{search_dir}: {len(files_list)} files")
+    for engine, (run_time, uses_set) in results.items():
+        if run_time is not None:
+            print(f"    {engine:8} time: {run_time:8.3f}s uses: {len(uses_set)}")
+    astroid_time, astroid_uses = results["astroid"]
+    fast_time, fast_uses = results["fast"]
+    if astroid_time is None or fast_time is None:
+        return
+    common_uses = astroid_uses & fast_uses
+    recall = len(common_uses) / len(astroid_uses) if astroid_uses else 1.0
+    precision = len(common_uses) / len(fast_uses) if fast_uses else 1.0
+    print(f"    speedup: {astroid_time / fast_time:.2f}x recall: {recall:.3f} precision: {precision:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare analysis engines")
+    parser.add_argument("dirs", nargs="+", help="Directories with .py files to analyze")
+    parser.add_argument("-r", "--repeats", type=int, default=3, help="Number of runs, best time is reported")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    sys.setrecursionlimit(10000)
+
+    for search_dir in args.dirs:
+        compare_engines(os.path.abspath(search_dir), args.repeats)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
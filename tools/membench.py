@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Script measures memory held by def items (modules, classes, methods and members) created by analysis
+# of generated modules: size of item objects, their attribute dicts, lists of children and distinct name
+# strings. Run it on two revisions to compare item models. With '--cache' items are measured after
+# restoring definitions from analysis cache (names are read from cache entries).
+#
+# Example: PYTHONPATH=src python3 tools/membench.py --modules 200 --cache
+#
+
+import os
+import sys
+import logging
+import argparse
+import tempfile
+
+from astgraph.treeparser import TreeParser
+from astgraph.cache import AnalysisCache
+from astgraph.graphtheory import convert_to_list
+
+
+# generate module with classes containing methods and members, names repeat between classes
+def generate_code(index, classes):
+    lines_list = []
+    for class_index in range(classes):
+        lines_list.append(f"class Class{index}x{class_index}:")
+        lines_list.append("    def __init__(self):")
+        lines_list.append("        self.value = 0")
+        lines_list.append("        self.data = []")
+        lines_list.append("        self.owner = None")
+        lines_list.append("")
+        lines_list.append("    def run(self):")
+        lines_list.append("        self.value += 1")
+        lines_list.append("")
+        lines_list.append("    def stop(self):")
+        lines_list.append("        self.data = None")
+        lines_list.append("")
+        lines_list.append("")
+    lines_list.append("def main():")
+    lines_list.append("    result = 1")
+    lines_list.append("    return result")
+    return "\n".join(lines_list) + "\n"
+
+
+def generate_files(code_dir, modules, classes):
+    pkg_dir = os.path.join(code_dir, "benchpkg")
+    os.makedirs(pkg_dir)
+    files_list = []
+    for index in range(modules):
+        file_path = os.path.join(pkg_dir, f"mod{index}.py")
+        with open(file_path, "w", encoding="utf-8") as out_file:
+            out_file.write(generate_code(index, classes))
+        files_list.append(file_path)
+    return files_list
+
+
+# returns sizes of parts of def items in bytes
+def measure_items(items):
+    all_items = convert_to_list(items.def_items, lambda item: item.get_items())
+    objects_size = 0
+    dicts_size = 0
+    lists_size = 0
+    names_dict = {}
+    for def_item in all_items:
+        objects_size += sys.getsizeof(def_item)
+        if hasattr(def_item, "__dict__"):
+            dicts_size += sys.getsizeof(def_item.__dict__)
+        children = def_item.get_items()
+        if isinstance(children, list):
+            lists_size += sys.getsizeof(children)
+        names_dict[id(def_item.name)] = sys.getsizeof(def_item.name)
+    names_size = sum(names_dict.values())
+    return {
+        "items": len(all_items),
+        "objects": objects_size,
+        "dicts": dicts_size,
+        "lists": lists_size,
+        "names": names_size,
+        "total": objects_size + dicts_size + lists_size + names_size,
+    }
+
+
+def print_sizes(label, sizes_dict):
+    items_num = sizes_dict["items"]
+    print(
+        f"{label:8} items: {items_num:8} objects: {sizes_dict['objects']:10} dicts: {sizes_dict['dicts']:10}"
+        f" lists: {sizes_dict['lists']:10} names: {sizes_dict['names']:10} total: {sizes_dict['total']:10}"
+        f" per item: {sizes_dict['total'] / items_num:7.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory held by def items")
+    parser.add_argument("--modules", type=int, default=100, help="Number of generated modules")
+    parser.add_argument("--classes", type=int, default=20, help="Number of classes in each module")
+    parser.add_argument("--cache", action="store_true", help="Measure items restored from analysis cache")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files_list = generate_files(os.path.join(temp_dir, "code"), args.modules, args.classes)
+        cache = None
+        if args.cache:
+            cache = AnalysisCache(os.path.join(temp_dir, "cache"))
+        tree_parser = TreeParser()
+        tree_parser.analyze_files(files_list, cache=cache)
+        print_sizes("analyzed", measure_items(tree_parser.items))
+
+        if args.cache:
+            tree_parser = TreeParser()
+            tree_parser.analyze_files(files_list, cache=AnalysisCache(os.path.join(temp_dir, "cache")))
+            print_sizes("restored", measure_items(tree_parser.items))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the GNU GENERAL PUBLIC LICENSE, Version 2, June 1991, found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Script measures lookups of scopes of nodes ('find_scope()' and 'find_parent_scope_def()') on generated
+# deeply nested modules: lookups using scope maps filled by analysis compared to walking up the tree
+# (empty maps before each lookup) and wall time of whole analysis.
+#
+# Example: PYTHONPATH=src python3 tools/scopebench.py --depth 10 20 40
+#
+
+import sys
+import time
+import logging
+import argparse
+
+import astroid
+from astroid.nodes import NodeNG
+
+from astgraph.treeparser import TreeParser
+
+
+# generate module with functions, classes and blocks nested 'depth' times, each level uses names
+def generate_code(depth, uses):
+    lines_list = ["def helper(value):", "    return value", ""]
+    indent = ""
+    for level in range(depth):
+        kind = level % 4
+        if kind == 0:
+            lines_list.append(f"{indent}def func{level}(arg{level}):")
+        elif kind == 1:
+            lines_list.append(f"{indent}class Class{level}:")
+            indent += "    "
+            lines_list.append(f"{indent}def method{level}(self, arg{level}):")
+        elif kind == 2:
+            lines_list.append(f"{indent}for item{level} in range(3):")
+        else:
+            lines_list.append(f"{indent}if arg{level - 3}:")
+        indent += "    "
+        for index in range(uses):
+            lines_list.append(f"{indent}helper(helper({index}).real).imag")
+    lines_list.append(f"{indent}pass")
+    return "\n".join(lines_list) + "\n"
+
+
+def measure_lookups(parser, nodes_list, cold):
+    items = parser.items
+    start_time = time.perf_counter()
+    for node in nodes_list:
+        if cold:
+            items.scopes.clear()
+        items.find_scope(node)
+        if cold:
+            items.scopes.clear()
+        items.find_parent_scope_def(node)
+    return time.perf_counter() - start_time
+
+
+def run_bench(depth, uses):
+    code = generate_code(depth, uses)
+    start_time = time.perf_counter()
+    astroid_node = astroid.parse(code, module_name=f"nested{depth}")
+    parser = TreeParser()
+    parser.analyze(astroid_node)
+    analyze_time = time.perf_counter() - start_time
+
+    nodes_list = list(astroid_node.nodes_of_class(NodeNG))
+    walk_time = measure_lookups(parser, nodes_list, True)
+    parser.items.scopes.clear()
+    map_time = measure_lookups(parser, nodes_list, False)
+    print(
+        f"depth: {depth:4} nodes: {len(nodes_list):6} analysis: {analyze_time:7.3f}s"
+        f" lookups walk: {walk_time:7.3f}s map: {map_time:7.3f}s speedup: {walk_time / map_time:6.2f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure scope lookups on deeply nested modules")
+    parser.add_argument("--depth", nargs="+", type=int, default=[10, 20, 40, 60], help="Levels of nesting (up to 75)")
+    parser.add_argument("--uses", type=int, default=5, help="Number of calls on each level")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    sys.setrecursionlimit(10000)
+
+    for depth in args.depth:
+        run_bench(depth, args.uses)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())